@@ -0,0 +1,37 @@
+# -*- coding: utf-8
+
+from __future__ import unicode_literals
+
+import asyncio
+import timeit
+
+from django_dandelion.aio import aclose_async_client
+from django_dandelion.datatxt import EntityExtraction
+
+_clock = timeit.default_timer
+
+
+def run_async(count, concurrency, offset=0):
+    """
+    The coroutine half of ``suite.bench_async``, apart because it only compiles on Python 3.7+.
+
+    :return: The latency of each call and the total time.
+    """
+    async def run():
+        semaphore = asyncio.Semaphore(concurrency)
+        latencies = []
+
+        async def one(i):
+            async with semaphore:
+                started = _clock()
+                await EntityExtraction(text='async text %d' % (offset + i)).aanalyze()
+                latencies.append(_clock() - started)
+
+        started = _clock()
+        try:
+            await asyncio.gather(*[one(i) for i in range(count)])
+        finally:
+            await aclose_async_client()
+        return latencies, _clock() - started
+
+    return asyncio.run(run())
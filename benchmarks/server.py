@@ -0,0 +1,164 @@
+# -*- coding: utf-8
+
+from __future__ import unicode_literals
+
+import json
+import threading
+import time
+
+try:
+    from http.server import BaseHTTPRequestHandler, HTTPServer
+    from socketserver import ThreadingMixIn
+    from urllib.parse import urlsplit, parse_qs
+except ImportError:
+    from BaseHTTPServer import BaseHTTPRequestHandler, HTTPServer
+    from SocketServer import ThreadingMixIn
+    from urlparse import urlsplit, parse_qs
+
+
+def _annotation(i):
+    return {
+        'id': 1000 + i,
+        'title': 'Entity %d' % i,
+        'uri': 'http://en.wikipedia.org/wiki/Entity_%d' % i,
+        'label': 'Entity %d' % i,
+        'confidence': 0.5 + (i % 50) / 100.0,
+        'spot': 'entity%d' % i,
+        'start': i * 10,
+        'end': i * 10 + 7,
+        'types': ['http://dbpedia.org/ontology/Thing'],
+        'categories': ['Category %d' % (i % 7)],
+    }
+
+
+def _nex(params, size):
+    return {
+        'timestamp': '2017-01-01T00:00:00',
+        'time': 1,
+        'lang': params.get('lang', 'en'),
+        'annotations': [_annotation(i) for i in range(size)],
+    }
+
+
+def _sim(params, size):
+    return {'timestamp': '2017-01-01T00:00:00', 'time': 1, 'lang': 'en', 'similarity': 0.5}
+
+
+def _cl(params, size):
+    return {
+        'timestamp': '2017-01-01T00:00:00',
+        'time': 1,
+        'categories': [{'name': 'Category %d' % i, 'score': 1.0 / (i + 1)} for i in range(size)],
+    }
+
+
+def _li(params, size):
+    return {'timestamp': '2017-01-01T00:00:00', 'time': 1, 'detectedLangs': [{'lang': 'en', 'confidence': 0.99}]}
+
+
+def _sent(params, size):
+    return {'timestamp': '2017-01-01T00:00:00', 'time': 1, 'lang': 'en', 'sentiment': {'score': 0.5,
+                                                                                       'type': 'positive'}}
+
+
+def _wikisearch(params, size):
+    offset = int(params.get('offset', 0))
+    limit = int(params.get('limit', 10))
+    return {
+        'timestamp': '2017-01-01T00:00:00',
+        'time': 1,
+        'lang': params.get('lang', 'en'),
+        'entities': [_annotation(i) for i in range(offset, min(offset + limit, size))],
+    }
+
+
+ENDPOINTS = {
+    '/datatxt/nex/v1': _nex,
+    '/datatxt/sim/v1': _sim,
+    '/datatxt/cl/v1': _cl,
+    '/datatxt/li/v1': _li,
+    '/datatxt/sent/v1': _sent,
+    '/datagraph/wikisearch/v1': _wikisearch,
+}
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    # Headers and body are written separately; without this, delayed ACKs add ~40ms to every response.
+    disable_nagle_algorithm = True
+
+    def do_GET(self):
+        url = urlsplit(self.path)
+        self._respond(url.path, parse_qs(url.query))
+
+    def do_POST(self):
+        url = urlsplit(self.path)
+        body = self.rfile.read(int(self.headers.get('Content-Length') or 0)).decode('utf-8')
+        self._respond(url.path, parse_qs(body))
+
+    def _respond(self, path, query):
+        params = {k: v[0] for k, v in query.items()}
+        endpoint = ENDPOINTS.get(path)
+        if endpoint is None:
+            status, payload = 404, {'error': True, 'code': 'error.notFound', 'message': path, 'data': {}}
+        else:
+            status, payload = 200, endpoint(params, self.server.payload_size)
+
+        if self.server.latency:
+            time.sleep(self.server.latency)
+
+        body = json.dumps(payload).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.send_header('X-DL-units', '1')
+        self.send_header('X-DL-units-left', '1000000')
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class _Server(ThreadingMixIn, HTTPServer):
+    daemon_threads = True
+
+
+class FakeDandelionServer(object):
+    """
+    Local stand-in for the Dandelion API, answering ``datatxt/nex``, ``sim``, ``cl``, ``li``, ``sent`` and
+    ``datagraph/wikisearch`` with synthetic results, on a thread of the current process.
+    """
+
+    def __init__(self, latency=0, payload_size=10, host='127.0.0.1', port=0):
+        """
+        :param latency: The number of seconds each response is delayed by.
+        :param payload_size: The number of annotations, categories or entities in each response.
+        :param port: The port to listen on; 0 picks a free one.
+        """
+        self._server = _Server((host, port), _Handler)
+        self._server.latency = latency
+        self._server.payload_size = payload_size
+        self._thread = None
+
+    @property
+    def url(self):
+        host, port = self._server.server_address[:2]
+        return 'http://{}:{}'.format(host, port)
+
+    def start(self):
+        self._thread = threading.Thread(target=self._server.serve_forever)
+        self._thread.daemon = True
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+        self._thread.join()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
@@ -0,0 +1,178 @@
+# -*- coding: utf-8
+
+from __future__ import unicode_literals, division
+
+import gc
+import json
+import math
+import sys
+import timeit
+
+import requests
+
+from django_dandelion.base import BaseDandelionRequest
+from django_dandelion.caching import local_cache
+from django_dandelion.decoding import orjson
+from django_dandelion.results import EntityExtractionResult
+from django_dandelion.datagraph import Wikisearch
+from django_dandelion.datatxt import EntityExtraction, TextSimilarity, TextClassification, LanguageDetection, \
+    SentimentAnalysis
+
+try:
+    import tracemalloc
+except ImportError:
+    tracemalloc = None
+
+_clock = timeit.default_timer
+
+ENDPOINTS = {
+    'datatxt/nex/v1': lambda i: EntityExtraction(text='text %d' % i),
+    'datatxt/sim/v1': lambda i: TextSimilarity(text1='text %d' % i, text2='other text'),
+    'datatxt/cl/v1': lambda i: TextClassification(text='text %d' % i, model='model-id'),
+    'datatxt/li/v1': lambda i: LanguageDetection(text='text %d' % i),
+    'datatxt/sent/v1': lambda i: SentimentAnalysis(text='text %d' % i),
+    'datagraph/wikisearch/v1': lambda i: Wikisearch(text='text %d' % i),
+}
+
+
+def percentile(values, p):
+    """:return: The nearest-rank ``p``-th percentile of ``values``."""
+    values = sorted(values)
+    if not values:
+        return None
+    return values[max(int(math.ceil(p / 100 * len(values))) - 1, 0)]
+
+
+def summarize(latencies, total=None):
+    """
+    :param latencies: The duration of each call, in seconds.
+    :param total: The wall time of all the calls, if they overlapped; defaults to the sum of the latencies.
+    """
+    total = sum(latencies) if total is None else total
+    return {
+        'calls': len(latencies),
+        'calls_per_second': len(latencies) / total if total else None,
+        'p50': percentile(latencies, 50),
+        'p99': percentile(latencies, 99),
+        'mean': total / len(latencies) if latencies else None,
+    }
+
+
+def _timed(fn):
+    started = _clock()
+    fn()
+    return _clock() - started
+
+
+def bench_sync(count, offset=0):
+    """Cache misses, one request at a time, on every emulated endpoint."""
+    results = {}
+    for endpoint, factory in sorted(ENDPOINTS.items()):
+        results[endpoint] = summarize([_timed(factory(offset + i).analyze) for i in range(count)])
+    return results
+
+
+def bench_cache_hit(count):
+    """Results served by the in-process cache, and by the Django cache behind it."""
+    request = EntityExtraction(text='cached text')
+    request.analyze()
+
+    local = [_timed(request.analyze) for _ in range(count)]
+
+    shared = []
+    for _ in range(count):
+        local_cache.clear()
+        shared.append(_timed(request.analyze))
+    return {'local': summarize(local), 'cache': summarize(shared)}
+
+
+def bench_batch(count, max_workers, offset=0):
+    """``analyze_many()`` over distinct texts."""
+    items = ['batch text %d' % (offset + i) for i in range(count)]
+    total = _timed(lambda: list(EntityExtraction().analyze_many(items, max_workers=max_workers)))
+    return {
+        'calls': count,
+        'max_workers': max_workers,
+        'calls_per_second': count / total,
+        'total': total,
+    }
+
+
+def bench_async(count, concurrency, offset=0):
+    """``aanalyze()`` over distinct texts, ``concurrency`` at a time; None when asyncio or httpx are unavailable."""
+    if sys.version_info < (3, 7):
+        return None
+    try:
+        import httpx  # noqa: F401
+    except ImportError:
+        return None
+
+    from .aio import run_async
+
+    latencies, total = run_async(count, concurrency, offset)
+    result = summarize(latencies, total)
+    result['concurrency'] = concurrency
+    return result
+
+
+def _read_all(result):
+    for annotation in result.annotations:
+        annotation.uri, annotation.types, annotation.categories
+
+
+class _EagerAttributeDict(dict):
+    # The result class of previous versions, kept as a baseline.
+    def __getattr__(self, name):
+        return self[name]
+
+
+def _object_hook_loads(content):
+    # The decoding of previous versions: every JSON object wrapped while parsing.
+    return json.loads(content.decode('utf-8'), object_hook=_EagerAttributeDict)
+
+
+def bench_decode(url, count):
+    """
+    Decoding of a ``datatxt/nex`` response body into a result, alone and followed by reading every annotation, for
+    the current decoder and for the eager ``object_hook`` decoding of previous versions.
+    """
+    content = requests.post(url + '/datatxt/nex/v1', data={'text': 'decode'}).content
+    results = {'bytes': len(content), 'orjson': orjson is not None}
+    for name, fn in [
+        ('decode', lambda: BaseDandelionRequest._parse_response(200, content)),
+        ('decode_and_read', lambda: _read_all(BaseDandelionRequest._parse_response(200, content))),
+        ('object_hook', lambda: _object_hook_loads(content)),
+        ('object_hook_and_read', lambda: _read_all(_object_hook_loads(content))),
+    ]:
+        result = results[name] = summarize([_timed(fn) for _ in range(count)])
+        result['megabytes_per_second'] = len(content) / result['mean'] / 1e6 if result['mean'] else None
+    return results
+
+
+def bench_memory(url, count):
+    """
+    Memory held by decoded ``datatxt/nex`` results, as dicts and as typed results, once every annotation has been
+    read; None when tracemalloc is unavailable.
+    """
+    if tracemalloc is None:
+        return None
+
+    content = requests.post(url + '/datatxt/nex/v1', data={'text': 'memory'}).content
+    results = {'response_bytes': len(content), 'results': count}
+    for name, parse in [
+        ('dict', lambda: BaseDandelionRequest._parse_response(200, content)),
+        ('typed', lambda: EntityExtractionResult.from_dict(BaseDandelionRequest._parse_response(200, content))),
+    ]:
+        gc.collect()
+        tracemalloc.start()
+        try:
+            before = tracemalloc.get_traced_memory()[0]
+            held = [parse() for _ in range(count)]
+            for result in held:
+                _read_all(result)
+            after = tracemalloc.get_traced_memory()[0]
+        finally:
+            tracemalloc.stop()
+        results[name + '_bytes_per_result'] = (after - before) / count
+        del held
+    return results
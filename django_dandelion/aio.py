@@ -0,0 +1,290 @@
+# -*- coding: utf-8
+
+from __future__ import unicode_literals
+
+import asyncio
+import logging
+import os
+import weakref
+
+from django.core.cache import cache
+from django.core.cache.backends.base import DEFAULT_TIMEOUT
+
+from . import __version__, store
+from .caching import make_entry, load_entry, is_stale, is_expired, local_cache
+from .conf import dandelion_settings
+from .connection import is_transient
+from .exceptions import DandelionSettingsException
+from .metrics import RequestTrace, request_started, request_finished
+from .usage import UNITS_LEFT_HEADER, get_units, usage
+
+logger = logging.getLogger(__name__)
+
+_clients = weakref.WeakKeyDictionary()
+_in_flight = weakref.WeakKeyDictionary()
+# The number of coroutines awaiting each shared task, and the tasks refreshing a stale entry, which nobody awaits.
+_waiters = {}
+_background = weakref.WeakSet()
+
+
+def get_async_client():
+    """
+    Return the ``httpx.AsyncClient`` shared by every coroutine running on the current event loop.
+
+    A client is bound to the loop it was created in, so one pool is kept per running loop.
+    """
+    loop = asyncio.get_running_loop()
+    client = _clients.get(loop)
+    if client is None:
+        client = _build_async_client()
+        _clients[loop] = client
+    return client
+
+
+async def aclose_async_client():
+    """Close the client bound to the current event loop, if any."""
+    client = _clients.pop(asyncio.get_running_loop(), None)
+    if client is not None:
+        await client.aclose()
+
+
+def _build_async_client():
+    try:
+        import httpx
+    except ImportError:
+        raise DandelionSettingsException('You must install httpx to use the asyncio client: '
+                                         'pip install django-dandelion[async]')
+
+    maxsize = dandelion_settings.DANDELION_POOL_MAXSIZE
+    limits = httpx.Limits(
+        max_connections=maxsize,
+        max_keepalive_connections=maxsize if dandelion_settings.DANDELION_KEEP_ALIVE else 0
+    )
+    return httpx.AsyncClient(limits=limits, headers={'User-Agent': 'django-dandelion/' + __version__})
+
+
+async def _cache_get(key):
+    """
+    :return: The entry stored at ``key`` and the tier it was found in: "local", "cache", "db" or None. As with
+        ``caching.lookup_entry``, a stale entry is only returned when the next tiers have no fresh one.
+    """
+    found = None, None
+    entry = local_cache.get(key)
+    if entry is not None and not is_expired(entry):
+        if not is_stale(entry):
+            return entry, 'local'
+        found = entry, 'local'
+
+    if hasattr(cache, 'aget'):
+        entry = await cache.aget(key)
+    else:
+        entry = await asyncio.get_running_loop().run_in_executor(None, cache.get, key)
+    if entry is not None and not is_expired(entry) and (found[0] is None or not is_stale(entry)):
+        local_cache.set(key, entry)
+        if not is_stale(entry):
+            return entry, 'cache'
+        found = entry, 'cache'
+
+    if not dandelion_settings.DANDELION_DB_STORE:
+        return found
+    # The ORM is synchronous.
+    entry = await asyncio.get_running_loop().run_in_executor(None, store.get_entry, key)
+    if entry is None or is_expired(entry) or (found[0] is not None and is_stale(entry)):
+        return found
+    await _cache_set(key, entry, DEFAULT_TIMEOUT)
+    return entry, 'db'
+
+
+async def _cache_set(key, entry, timeout, endpoint=None):
+    local_cache.set(key, entry)
+    if hasattr(cache, 'aset'):
+        await cache.aset(key, entry, timeout)
+    else:
+        await asyncio.get_running_loop().run_in_executor(None, cache.set, key, entry, timeout)
+    if dandelion_settings.DANDELION_DB_STORE and endpoint is not None:
+        await asyncio.get_running_loop().run_in_executor(None, store.save_entry, key, endpoint, entry)
+
+
+def _in_flight_task(key, coroutine_factory):
+    # Coroutines of the same loop asking for the same key share one task.
+    calls = _in_flight.setdefault(asyncio.get_running_loop(), {})
+    task = calls.get(key)
+    if task is None:
+        task = calls[key] = asyncio.ensure_future(coroutine_factory())
+
+        def done(_):
+            calls.pop(key, None)
+            if not task.cancelled() and task.exception() is not None:
+                logger.debug('Request for %s failed', key, exc_info=task.exception())
+
+        task.add_done_callback(done)
+    return task
+
+
+async def _coalesce(key, coroutine_factory):
+    task = _in_flight_task(key, coroutine_factory)
+    _waiters[task] = _waiters.get(task, 0) + 1
+    try:
+        # shield() keeps a cancelled caller from cancelling the shared task for the others.
+        return await asyncio.shield(task)
+    finally:
+        _waiters[task] -= 1
+        if not _waiters[task]:
+            del _waiters[task]
+            # The last caller was cancelled: nobody wants the response any more, so the request is cancelled too.
+            if not task.done() and task not in _background:
+                task.cancel()
+
+
+class AsyncRequestMixin(object):
+    """Coroutine counterpart of ``BaseDandelionRequest._do_request``."""
+
+    async def _ado_request(self, extra_url='', method='post', extra_dict=None, use_cache=False, idempotent=None,
+                           typed=False):
+        trace = RequestTrace('/'.join(extra_url), method)
+        request_started(type(self), trace)
+        try:
+            result = await self._ado_traced_request(trace, extra_url, method, extra_dict, use_cache, idempotent)
+            return self._make_typed_result(result) if typed else result
+        finally:
+            request_finished(type(self), trace)
+
+    async def _ado_traced_request(self, trace, extra_url, method, extra_dict, use_cache, idempotent):
+        url, params, cache_key = self._prepare_request(extra_url, method, extra_dict)
+
+        if not use_cache:
+            if idempotent is None:
+                idempotent = method != 'post'
+            response = await self._ado_raw_request(trace, url, params, idempotent)
+            return self._make_result(trace, False, response.status_code, response.content,
+                                     get_units(response.headers), get_units(response.headers, UNITS_LEFT_HEADER))
+
+        entry, trace.cache_tier = await _cache_get(cache_key)
+        cached = load_entry(entry)
+        if cached is not None and not is_stale(entry):
+            return self._make_result(trace, True, *cached)
+
+        def fetch():
+            return self._ado_fetch(trace, url, params, cache_key, stale=cached)
+
+        if cached is not None and dandelion_settings.DANDELION_CACHE_STALE_WHILE_REVALIDATE:
+            _background.add(_in_flight_task(cache_key, fetch))
+            return self._make_result(trace, True, *cached)
+
+        trace.cache_tier = None
+        return self._make_result(trace, False, *await _coalesce(cache_key, fetch))
+
+    async def _ado_fetch(self, trace, url, params, cache_key, stale=None):
+        import httpx
+
+        try:
+            response = await self._ado_raw_request(trace, url, params, idempotent=True)
+        except httpx.TransportError:
+            if stale is None:
+                raise
+            return stale
+
+        if stale is not None and is_transient(response.status_code):
+            return stale
+
+        units = get_units(response.headers)
+        entry = make_entry(trace.endpoint, response.status_code, response.content, units)
+        if entry is not None:
+            await _cache_set(cache_key, *entry, endpoint=trace.endpoint)
+        return response.status_code, response.content, units, get_units(response.headers, UNITS_LEFT_HEADER)
+
+    async def _ado_raw_request(self, trace, url, params, idempotent):
+        import httpx
+
+        kwargs = {
+            'data' if trace.method in ('post', 'put') else 'params': params,
+        }
+
+        retry = self.retry_policy.start()
+        while True:
+            delay = self.rate_limiter.reserve(trace.endpoint, retry.remaining() if self.rate_limit_block else 0)
+            if delay:
+                await asyncio.sleep(delay)
+
+            try:
+                response = await get_async_client().request(
+                    trace.method.upper(), url, timeout=retry.next_timeout(), **kwargs)
+            except httpx.TransportError:
+                trace.retries = retry.attempts - 1
+                delay = retry.retry_delay(idempotent)
+                if delay is None:
+                    raise
+            else:
+                trace.record_attempt(retry.attempts, response.status_code, len(response.request.content),
+                                     len(response.content))
+                usage.record_call(trace.endpoint, get_units(response.headers),
+                                  get_units(response.headers, UNITS_LEFT_HEADER))
+                delay = retry.retry_delay(idempotent, response.status_code, response.headers.get('Retry-After'))
+                if delay is None:
+                    return response
+            await asyncio.sleep(delay)
+
+    async def aanalyze_chunked(self, max_size=None, overlap=None, max_workers=None, typed=False):
+        """Coroutine version of ``BaseDandelionParamsRequest.analyze_chunked``."""
+        chunks, request = self._prepare_chunks(max_size, overlap)
+        semaphore = asyncio.Semaphore(max_workers or dandelion_settings.DANDELION_BATCH_MAX_WORKERS)
+
+        async def analyze(chunk):
+            async with semaphore:
+                return await request._copy_with({'text': chunk}).aanalyze()
+
+        results = await asyncio.gather(*(analyze(chunk) for _, chunk in chunks))
+        return self._merge_chunk_results(chunks, results, typed)
+
+
+class AsyncAutocompleteMixin(object):
+    """Coroutine counterpart of ``Autocomplete.complete``."""
+
+    async def acomplete(self, text):
+        """
+        Coroutine version of :meth:`complete`, waiting ``debounce`` seconds before calling the API.
+
+        :return: The suggestions, or None if a later call superseded this one. The request of a superseded call, if
+            in flight, is cancelled, unless another coroutine waits for the same response.
+        """
+        self._generation += 1
+        generation = self._generation
+        if self._in_flight is not None:
+            self._in_flight.cancel()
+            self._in_flight = None
+
+        hits = self.lookup(text)
+        if hits is not None:
+            return hits
+        if self.debounce:
+            await asyncio.sleep(self.debounce)
+            if generation != self._generation:
+                return None
+            # Answered meanwhile by the lookup of another field.
+            hits = self.lookup(text)
+            if hits is not None:
+                return hits
+
+        task = self._in_flight = asyncio.ensure_future(
+            self.request._copy_with({'text': text.strip()}).aanalyze(typed=True))
+        try:
+            result = await task
+        except asyncio.CancelledError:
+            if generation != self._generation:
+                return None
+            raise
+        finally:
+            if self._in_flight is task:
+                self._in_flight = None
+        return self._store(text, result)
+
+
+def _after_fork_in_child():
+    _clients.clear()
+    _in_flight.clear()
+    _waiters.clear()
+    _background.clear()
+
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_after_fork_in_child)
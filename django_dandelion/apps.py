@@ -4,7 +4,7 @@ from __future__ import unicode_literals
 
 from django.apps import AppConfig
 
-from .conf import DANDELION_HOST, DANDELION_TOKEN
+from .conf import dandelion_settings
 from .exceptions import DandelionSettingsException
 
 
@@ -14,7 +14,10 @@ class DandelionConfig(AppConfig):
     verbose_name = 'Django Dandelion'
 
     def ready(self):
-        if not DANDELION_HOST:
+        if not dandelion_settings.DANDELION_HOST:
             raise DandelionSettingsException('You must set DANDELION_HOST in settings.py.')
-        if not DANDELION_TOKEN:
+        if not dandelion_settings.DANDELION_TOKEN:
             raise DandelionSettingsException('You must set DANDELION_TOKEN in settings.py.')
+
+        from .metrics import connect_backend
+        connect_backend()
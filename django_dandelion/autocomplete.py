@@ -0,0 +1,200 @@
+# -*- coding: utf-8
+
+from __future__ import unicode_literals
+
+import collections
+import re
+import sys
+import threading
+import unicodedata
+
+import six
+
+from .conf import SETTING, SettingAttribute
+from .datagraph import Wikisearch
+
+if sys.version_info >= (3, 7):
+    from .aio import AsyncAutocompleteMixin
+else:
+    AsyncAutocompleteMixin = object
+
+_WHITESPACE = re.compile(r'\s+', re.UNICODE)
+
+
+def normalize_query(text):
+    """Fold case and accents and collapse whitespace, so "Élysée " and "elysee" are the same query."""
+    text = unicodedata.normalize('NFKD', six.text_type(text))
+    text = ''.join(c for c in text if not unicodedata.combining(c))
+    # str.casefold() is Python 3 only; unlike it, lower() leaves "ß" alone.
+    text = text.casefold() if hasattr(text, 'casefold') else text.lower().replace('ß', 'ss')
+    return _WHITESPACE.sub(' ', text).strip()
+
+
+def matches(hit, query):
+    """Whether a word of the title, label or alternate labels of ``hit`` starts with the normalized ``query``."""
+    names = [hit.title, hit.label]
+    names.extend(hit.alternateLabels or ())
+    for name in names:
+        if name:
+            name = normalize_query(name)
+            if name.startswith(query) or ' ' + query in name:
+                return True
+    return False
+
+
+class _Node(object):
+    __slots__ = ('parent', 'char', 'children', 'hits', 'complete')
+
+    def __init__(self, parent=None, char=None):
+        self.parent = parent
+        self.char = char
+        self.children = {}
+        # The hits of the prefix ending at this node, if it was looked up; complete when the API returned fewer hits
+        # than the limit, so they include every page starting with the prefix.
+        self.hits = None
+        self.complete = False
+
+
+class PrefixIndex(object):
+    """
+    A thread-safe trie of the results of previous prefix searches, one per language and set of params, holding at
+    most ``max_entries`` results; the least recently used are evicted.
+
+    A query is answered from the results of the query itself or, when the API returned all the pages starting with
+    it, of its longest shorter prefix, filtered: looking it up costs one step per character.
+    """
+
+    max_entries = SettingAttribute('DANDELION_AUTOCOMPLETE_MAX_ENTRIES')
+
+    def __init__(self, max_entries=SETTING):
+        """:param max_entries: The number of results kept; by default DANDELION_AUTOCOMPLETE_MAX_ENTRIES."""
+        self.max_entries = max_entries
+        self._roots = {}
+        self._entries = collections.OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, scope, query):
+        """
+        :param scope: The language and the other params the results depend on, as a hashable value.
+        :param query: A normalized query.
+        :return: The hits for ``query``, as a list, or None if they cannot be answered locally.
+        """
+        with self._lock:
+            node = self._roots.get(scope)
+            ancestor = None
+            for char in query:
+                if node is None:
+                    break
+                if node.complete:
+                    ancestor = node
+                node = node.children.get(char)
+            else:
+                if node is not None and node.hits is not None:
+                    self._touch(node)
+                    return list(node.hits)
+            if ancestor is None:
+                return None
+            self._touch(ancestor)
+            hits = ancestor.hits
+        return [hit for hit in hits if matches(hit, query)]
+
+    def set(self, scope, query, hits, complete):
+        """
+        :param hits: The hits returned by the API for ``query``.
+        :param complete: Whether they are all the pages starting with ``query``.
+        """
+        max_entries = self.max_entries
+        if max_entries <= 0:
+            return
+        with self._lock:
+            node = self._roots.get(scope)
+            if node is None:
+                node = self._roots[scope] = _Node()
+            for char in query:
+                child = node.children.get(char)
+                if child is None:
+                    child = node.children[char] = _Node(node, char)
+                node = child
+            node.hits = tuple(hits)
+            node.complete = complete
+            self._entries.pop(node, None)
+            self._entries[node] = scope
+            while len(self._entries) > max_entries:
+                evicted, evicted_scope = self._entries.popitem(last=False)
+                self._remove(evicted_scope, evicted)
+
+    def _touch(self, node):
+        # OrderedDict.move_to_end() is Python 3 only.
+        self._entries[node] = self._entries.pop(node)
+
+    def _remove(self, scope, node):
+        node.hits = None
+        node.complete = False
+        # Drop the branch up to the first node still in use.
+        while node.parent is not None and not node.children and node.hits is None:
+            del node.parent.children[node.char]
+            node = node.parent
+        if node.parent is None and not node.children and node.hits is None:
+            del self._roots[scope]
+
+    def clear(self):
+        with self._lock:
+            self._roots.clear()
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+
+prefix_index = PrefixIndex()
+
+
+class Autocomplete(AsyncAutocompleteMixin):
+    """
+    Suggestions of Wikipedia pages for what a user is typing, from Wikisearch with ``query=prefix``.
+
+    Most keystrokes are answered by :data:`prefix_index` without calling the API: once a prefix returned fewer pages
+    than ``limit``, the pages of every longer prefix are among them. Use one instance per input field: with
+    :meth:`acomplete` (Python 3.7+), a lookup superseded by a newer one is abandoned.
+    """
+
+    debounce = SettingAttribute('DANDELION_AUTOCOMPLETE_DEBOUNCE')
+
+    def __init__(self, lang='en', limit=10, include=None, debounce=SETTING, index=None):
+        """
+        :param lang: The language of the pages.
+        :param limit: The number of suggestions.
+        :param include: The extra information of the pages, as with Wikisearch.
+        :param debounce: The number of seconds :meth:`acomplete` waits for the user to stop typing before calling the
+            API; by default DANDELION_AUTOCOMPLETE_DEBOUNCE.
+        :param index: The :class:`PrefixIndex` of the results; by default the one shared by the process.
+        """
+        params = {'lang': lang, 'limit': limit, 'query': 'prefix'}
+        if include:
+            params['include'] = include
+        self.request = Wikisearch(**params)
+        self.limit = limit
+        self.debounce = debounce
+        self.index = prefix_index if index is None else index
+        self._scope = (lang, limit, include)
+        self._generation = 0
+        self._in_flight = None
+
+    def lookup(self, text):
+        """:return: The suggestions for ``text`` known without calling the API, or None."""
+        query = normalize_query(text)
+        if not query:
+            return []
+        return self.index.get(self._scope, query)
+
+    def complete(self, text):
+        """:return: The suggestions for ``text``, a list of :class:`~.results.WikisearchHit`."""
+        hits = self.lookup(text)
+        if hits is None:
+            hits = self._store(text, self.request._copy_with({'text': text.strip()}).analyze(typed=True))
+        return hits
+
+    def _store(self, text, result):
+        hits = result.entities or []
+        self.index.set(self._scope, normalize_query(text), hits, len(hits) < self.limit)
+        return list(hits)
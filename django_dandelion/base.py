@@ -2,111 +2,258 @@
 
 from __future__ import unicode_literals
 
-import requests
-import hashlib
+import collections
+import copy
+import itertools
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
 
-from django.core.cache import cache
-
-from . import __version__
-from .conf import DANDELION_HOST, DANDELION_TOKEN, DANDELION_USE_CACHE
+from .caching import make_entry, load_entry, is_stale, get_cache_key, lookup_entry, get_entry, set_entry, \
+    normalize_params, prefetch_entries
+from .chunking import split_text
+from .coalescing import requests_in_flight, refresh_in_background, acquire_lock, release_lock, wait_for_entry
+from .conf import SettingAttribute, dandelion_settings
+from .connection import is_transient
+from .decoding import AttributeDict, loads  # noqa: F401
 from .exceptions import DandelionException
+from .executor import get_executor
+from .metrics import RequestTrace, request_started, request_finished
+from .ratelimit import rate_limiter
+from .retry import default_retry_policy
+from .schema import Schema
+from .store import WriteBuffer
+from .transport import get_transport
+from .usage import UNITS_LEFT_HEADER, ResultMeta, get_units, usage
+
+if sys.version_info >= (3, 7):
+    from .aio import AsyncRequestMixin
+else:
+    AsyncRequestMixin = object
+
+
+class BaseDandelionRequest(AsyncRequestMixin):
+    retry_policy = default_retry_policy
+    rate_limiter = rate_limiter
+    rate_limit_block = SettingAttribute('DANDELION_RATE_LIMIT_BLOCK')
+    # The typed model of the results, a subclass of results.Result.
+    result_model = None
+    # None for the transport of DANDELION_TRANSPORT.
+    transport = None
 
+    def _do_request(self, extra_url='', method='post', extra_dict=None, use_cache=False, idempotent=None,
+                    typed=False):
+        """
+        :param idempotent: Whether the request can be retried safely; by default every method but POST is. Cached
+            requests are always considered idempotent.
+        :param typed: Whether to return an instance of ``result_model`` instead of an :class:`AttributeDict`.
+        """
+        trace = RequestTrace('/'.join(extra_url), method)
+        request_started(type(self), trace)
+        try:
+            result = self.__do_traced_request(trace, extra_url, method, extra_dict, use_cache, idempotent)
+            return self._make_typed_result(result) if typed else result
+        finally:
+            request_finished(type(self), trace)
 
-class AttributeDict(dict):
-    def __getattr__(self, name):
-        return self[name]
+    def __do_traced_request(self, trace, extra_url, method, extra_dict, use_cache, idempotent):
+        url, params, cache_key = self._prepare_request(extra_url, method, extra_dict)
 
-    def __setattr__(self, name, value):
-        self[name] = value
+        if not use_cache:
+            if idempotent is None:
+                idempotent = method != 'post'
+            response = self.__do_raw_request(trace, url, params, idempotent)
+            return self._make_result(trace, False, response.status_code, response.content,
+                                     get_units(response.headers), get_units(response.headers, UNITS_LEFT_HEADER))
 
-    def __delattr__(self, name):
-        del self[name]
+        entry, trace.cache_tier = lookup_entry(cache_key)
+        cached = load_entry(entry)
+        if cached is not None and not is_stale(entry):
+            return self._make_result(trace, True, *cached)
 
+        def fetch():
+            return self.__fetch(trace, url, params, cache_key, stale=cached)
 
-class BaseDandelionRequest(object):
-    def __init__(self):
-        self.__requests = requests.session()
-        self.__uri = DANDELION_HOST if DANDELION_HOST.startswith('http') else 'https://' + DANDELION_HOST
+        if cached is not None and dandelion_settings.DANDELION_CACHE_STALE_WHILE_REVALIDATE:
+            refresh_in_background(cache_key, fetch)
+            return self._make_result(trace, True, *cached)
 
-    def _do_request(self, extra_url='', method='post', extra_dict=None, use_cache=False):
+        trace.cache_tier = None
+        return self._make_result(trace, False, *requests_in_flight.do(cache_key, fetch))
+
+    def _prepare_request(self, extra_url, method, extra_dict):
         if extra_dict is None:
             params = {}
         else:
             params = extra_dict.copy()
-        params['token'] = DANDELION_TOKEN
+        if dandelion_settings.DANDELION_CACHE_NORMALIZE_TEXT:
+            normalize_params(params)
+        params['token'] = dandelion_settings.DANDELION_TOKEN
 
-        url = self.__uri + ''.join('/' + x for x in extra_url)
+        host = dandelion_settings.DANDELION_HOST
+        url = (host if host.startswith('http') else 'https://' + host) + ''.join('/' + x for x in extra_url)
 
-        cache_key = self.__cache_get_key_for(url=url, params=params, method=method)
-        if cache.get(cache_key) and use_cache:
-            response = cache.get(cache_key)
-        else:
-            response = self.__do_raw_request(url, params, method)
-            if response.ok and use_cache:
-                cache.set(cache_key, response)
+        cache_key = get_cache_key(method=method, url=url, params=params)
+        return url, params, cache_key
 
-        obj = response.json(object_hook=AttributeDict)
-        if not response.ok:
+    @staticmethod
+    def _parse_response(status_code, content):
+        obj = loads(content)
+        if not 200 <= status_code < 400:
             raise DandelionException(message=obj.message, code=obj.code, data=obj.data)
 
         return obj
 
-    def __do_raw_request(self, url, params, method):
-        kwargs = {
-            'data' if method in ('post', 'put') else 'params': params,
-            'url': url,
-            'headers': {
-                'User-Agent': 'django-dandelion/' + __version__
-            }
-        }
+    def _make_result(self, trace, cache_hit, status_code, content, units, units_left=None):
+        """:param units_left: The units left sent with the response; by default the last ones seen by the process."""
+        trace.status_code = status_code
+        if cache_hit:
+            usage.record_cache_hit(trace.endpoint, units)
+        if units_left is None:
+            units_left = usage.units_left
 
-        return getattr(self.__requests, method)(**kwargs)
+        obj = self._parse_response(status_code, content)
+        # Stored outside of the dict, so the result still holds exactly the JSON returned by the API.
+        obj.__dict__['meta'] = ResultMeta(trace.endpoint, trace.latency, cache_hit, units, units_left)
+        return obj
 
-    @staticmethod
-    def __cache_get_key_for(**kwargs):
-        input_s = ''
-        for key in sorted(kwargs):
-            input_s += u'{}={},'.format(key, kwargs[key])
-        input_s = input_s.encode('utf-8')
-        return 'dandelion_' + hashlib.sha1(input_s).hexdigest()
+    def _make_typed_result(self, result):
+        obj = self.result_model.from_dict(result)
+        obj.meta = result.meta
+        return obj
+
+    def __fetch(self, trace, url, params, cache_key, stale=None):
+        # Imported on the first request, not with the package: requests takes longer to import than the rest of it.
+        import requests
+
+        locked = acquire_lock(cache_key)
+        if not locked:
+            cached = load_entry(wait_for_entry(cache_key))
+            if cached is not None:
+                return cached
+
+        try:
+            # A call for the same key may have completed between the cache lookup and taking the lock, in this process
+            # or in another one.
+            entry = get_entry(cache_key)
+            if entry is not None and not is_stale(entry):
+                return load_entry(entry)
+
+            try:
+                response = self.__do_raw_request(trace, url, params, idempotent=True)
+            except requests.RequestException:
+                if stale is None:
+                    raise
+                return stale
+
+            if stale is not None and is_transient(response.status_code):
+                return stale
+
+            units = get_units(response.headers)
+            entry = make_entry(trace.endpoint, response.status_code, response.content, units)
+            if entry is not None:
+                set_entry(cache_key, *entry, endpoint=trace.endpoint)
+            return response.status_code, response.content, units, get_units(response.headers, UNITS_LEFT_HEADER)
+        finally:
+            if locked:
+                release_lock(cache_key)
+
+    def __do_raw_request(self, trace, url, params, idempotent):
+        import requests
+
+        transport = self.transport or get_transport()
+        retry = self.retry_policy.start()
+        while True:
+            delay = self.rate_limiter.reserve(trace.endpoint, retry.remaining() if self.rate_limit_block else 0)
+            if delay:
+                time.sleep(delay)
+
+            try:
+                response = transport.send(trace.method, url, params, retry.next_timeout())
+            except (requests.ConnectionError, requests.Timeout):
+                trace.retries = retry.attempts - 1
+                delay = retry.retry_delay(idempotent)
+                if delay is None:
+                    raise
+            else:
+                trace.record_attempt(retry.attempts, response.status_code, response.bytes_sent, len(response.content))
+                usage.record_call(trace.endpoint, get_units(response.headers),
+                                  get_units(response.headers, UNITS_LEFT_HEADER))
+                delay = retry.retry_delay(idempotent, response.status_code, response.headers.get('Retry-After'))
+                if delay is None:
+                    return response
+            time.sleep(delay)
 
 
 class BaseDandelionParamsRequest(BaseDandelionRequest):
-    def __init__(self, keys_allowed, keys_unique, **params):
-        self.__keys_allowed = keys_allowed
-        self.__keys_unique = keys_unique
+    # The path of the endpoint of analyze().
+    extra_url = None
+    # Texts longer than this are analyzed in chunks, for the endpoints that can merge their results.
+    chunk_size = SettingAttribute('DANDELION_CHUNK_SIZE')
+    # Merges the results of the chunks of a text, one of the merge functions of the chunking module; None for the
+    # endpoints whose results cannot be merged.
+    merge_chunks = None
+    # The params accepted by the endpoint, a :class:`~.schema.Schema` checking their values before they are sent.
+    schema = None
 
-        self.__params = params
-        for key in params:
-            self.__validate_param(key)
+    def __init__(self, keys_allowed=None, keys_unique=None, **params):
+        """
+        :param keys_allowed: The keys accepted, for the subclasses without a ``schema``; their values are not checked.
+        :param keys_unique: The groups of ``keys_allowed`` that cannot be used together.
+        """
+        if keys_allowed is not None:
+            self.schema = Schema.from_keys(keys_allowed, keys_unique or [])
+
+        self.__params = {}
+        for key, value in params.items():
+            self.__validate_param(key, value)
+            self.__params[key] = value
 
         super(BaseDandelionParamsRequest, self).__init__()
 
-    def _do_request(self, extra_url='', method='post', extra_dict=None, use_cache=DANDELION_USE_CACHE):
-        if extra_dict is None:
-            params = self.__params
-        else:
-            params = extra_dict.copy()
-            params.update(self.__params)
+    def _do_request(self, extra_url='', method='post', extra_dict=None, use_cache=None, idempotent=True,
+                    typed=False):
+        if self.__is_long_text():
+            return self.analyze_chunked(typed=typed)
         return super(BaseDandelionParamsRequest, self)._do_request(
             extra_url=extra_url,
             method=method,
-            extra_dict=params,
-            use_cache=use_cache
+            extra_dict=self.__merge_params(extra_dict),
+            use_cache=dandelion_settings.DANDELION_USE_CACHE if use_cache is None else use_cache,
+            idempotent=idempotent,
+            typed=typed
         )
 
-    def __validate_param(self, key):
-        if key not in self.__keys_allowed:
-            raise DandelionException(message='Key not allowed; you can use the following keys: {}'.format(
-                ', '.join(self.__keys_allowed)))
+    def _ado_request(self, extra_url='', method='post', extra_dict=None, use_cache=None, idempotent=True,
+                     typed=False):
+        if self.__is_long_text():
+            return self.aanalyze_chunked(typed=typed)
+        return super(BaseDandelionParamsRequest, self)._ado_request(
+            extra_url=extra_url,
+            method=method,
+            extra_dict=self.__merge_params(extra_dict),
+            use_cache=dandelion_settings.DANDELION_USE_CACHE if use_cache is None else use_cache,
+            idempotent=idempotent,
+            typed=typed
+        )
+
+    def __is_long_text(self):
+        return self.merge_chunks is not None and bool(self.chunk_size) and \
+            len(self.__params.get('text') or '') > self.chunk_size
 
-        for keys in self.__keys_unique:
-            if key in keys:
-                temp = set(keys)
-                temp.discard(key)
-                intersection = list(set(self.__params.keys()) & temp)
-                if len(intersection) > 0:
-                    self.__params_remove_key(intersection[0])
+    def __merge_params(self, extra_dict):
+        if extra_dict is None:
+            return self.__params
+        params = extra_dict.copy()
+        params.update(self.__params)
+        return params
+
+    def __validate_param(self, key, value):
+        self.schema.validate(key, value)
+
+        for replaced in self.schema.replaced.get(key, ()):
+            if replaced in self.__params:
+                self.__params_remove_key(replaced)
 
     @property
     def params(self):
@@ -117,7 +264,7 @@ class BaseDandelionParamsRequest(BaseDandelionRequest):
         if not isinstance(value, (list, set, tuple)) or len(value) != 2:
             raise DandelionException(message='Two inputs are required: key and value')
 
-        self.__validate_param(value[0])
+        self.__validate_param(value[0], value[1])
         self.__params[value[0]] = value[1]
 
     @params.deleter
@@ -127,5 +274,160 @@ class BaseDandelionParamsRequest(BaseDandelionRequest):
     def __params_remove_key(self, key):
         del self.__params[key]
 
-    def analyze(self):
+    def analyze(self, typed=False):
+        raise NotImplementedError
+
+    def aanalyze(self, typed=False):
         raise NotImplementedError
+
+    def analyze_many(self, items, max_workers=None, typed=False):
+        """
+        Run analyze() over many inputs concurrently, on top of the params already set on this request.
+
+        Identical items that are in flight at the same time are sent only once; the others are served by the cache.
+
+        :param items: An iterable of dicts of params overriding the current ones for each request; any other value
+            is a shorthand for {'text': value}.
+        :param max_workers: The maximum number of concurrent requests; by default DANDELION_BATCH_MAX_WORKERS.
+        :param typed: Whether to yield typed results, as with analyze().
+        :return: A generator yielding, in input order, the result of each item or the exception it raised: a
+            DandelionException, or a ``requests.RequestException`` when the API could not be reached.
+        """
+        max_workers = max_workers or dandelion_settings.DANDELION_BATCH_MAX_WORKERS
+        executor = ThreadPoolExecutor(max_workers=max_workers)
+        buffer = WriteBuffer()
+        window = collections.deque()
+        in_flight = {}
+        items = iter(items)
+        try:
+            while True:
+                group = [item if isinstance(item, dict) else {'text': item}
+                         for item in itertools.islice(items, max_workers)]
+                if not group:
+                    break
+                self.__prefetch(group)
+
+                for overrides in group:
+                    key = tuple(sorted((k, repr(v)) for k, v in overrides.items()))
+                    if key in in_flight:
+                        in_flight[key][1] += 1
+                    else:
+                        in_flight[key] = [executor.submit(self.__analyze_with, overrides, typed, buffer), 1]
+                    window.append(key)
+
+                    if len(window) >= 2 * max_workers:
+                        yield self.__pop_batch_result(window, in_flight)
+
+            while window:
+                yield self.__pop_batch_result(window, in_flight)
+        finally:
+            for future, _ in in_flight.values():
+                future.cancel()
+            executor.shutdown(wait=False)
+            buffer.flush()
+
+    def __prefetch(self, group):
+        # One query to the database store for the whole group: the workers then find their entries in the cache.
+        if not (dandelion_settings.DANDELION_DB_STORE and dandelion_settings.DANDELION_USE_CACHE and self.extra_url):
+            return
+        keys = []
+        for overrides in group:
+            try:
+                clone = self._copy_with(overrides)
+            except DandelionException:
+                # Raised again by the worker of the item.
+                continue
+            keys.append(clone._prepare_request(self.extra_url, 'post', clone.params)[2])
+        prefetch_entries(keys)
+
+    def __analyze_with(self, overrides, typed, buffer):
+        with buffer.use():
+            return self._copy_with(overrides).analyze(typed=typed)
+
+    def _copy_with(self, overrides):
+        clone = copy.copy(self)
+        clone.__params = self.__params.copy()
+        for key, value in overrides.items():
+            clone.params = key, value
+        return clone
+
+    def submit(self, typed=False):
+        """
+        Run analyze() on the process-wide bounded executor, to overlap it with other work, such as queries, and
+        collect the result later.
+
+        The params are copied: changing them afterwards does not change the request submitted.
+
+        :param typed: Whether the future returns a typed result, as with analyze().
+        :return: A ``concurrent.futures.Future`` of the result; ``result()`` raises the exception of the call, if any.
+        :raise DandelionQueueFullException: If the executor is full and ``DANDELION_EXECUTOR_BLOCK`` is False.
+        """
+        return get_executor().submit(self._copy_with({}).analyze, typed=typed)
+
+    def analyze_chunked(self, max_size=None, overlap=None, max_workers=None, typed=False):
+        """
+        Run analyze() over a long text split in chunks, concurrently, and merge their results into one for the text.
+
+        Every chunk is cached on its own, so analyzing an edited text again only pays for the chunks that changed.
+        analyze() does the same by itself for the texts longer than DANDELION_CHUNK_SIZE.
+
+        :param max_size: The maximum number of characters of a chunk; by default DANDELION_CHUNK_SIZE.
+        :param overlap: The number of characters repeated at the start of a chunk from the end of the previous one;
+            by default DANDELION_CHUNK_OVERLAP.
+        :param max_workers: The maximum number of concurrent requests; by default DANDELION_BATCH_MAX_WORKERS.
+        :param typed: Whether to return a typed result, as with analyze().
+        """
+        chunks, request = self._prepare_chunks(max_size, overlap)
+        results = list(request.analyze_many([chunk for _, chunk in chunks], max_workers=max_workers))
+        return self._merge_chunk_results(chunks, results, typed)
+
+    def _prepare_chunks(self, max_size, overlap):
+        text = self.__params.get('text')
+        if self.merge_chunks is None or text is None:
+            raise DandelionException(message='Only the text of {} can be analyzed in chunks'.format(
+                type(self).__name__))
+        max_size = max_size or self.chunk_size
+        if not max_size:
+            raise DandelionException(message='A chunk size is required, either max_size or DANDELION_CHUNK_SIZE')
+
+        # The chunks are analyzed by a copy of this request, that does not try to split them again.
+        request = self._copy_with({})
+        request.chunk_size = None
+        if overlap is None:
+            overlap = dandelion_settings.DANDELION_CHUNK_OVERLAP
+        return split_text(text, max_size, overlap) or [(0, text)], request
+
+    def _merge_chunk_results(self, chunks, results, typed):
+        for result in results:
+            if isinstance(result, Exception):
+                raise result
+
+        merged = self.merge_chunks(chunks, results, self.__params)
+        units = [result.meta.units for result in results]
+        units_left = [result.meta.units_left for result in results if result.meta.units_left is not None]
+        merged.__dict__['meta'] = ResultMeta(
+            results[0].meta.endpoint,
+            # The chunks are analyzed concurrently.
+            max(result.meta.elapsed for result in results),
+            all(result.meta.cache_hit for result in results),
+            None if None in units else sum(units),
+            # As of the last chunk answered: units are only ever spent.
+            min(units_left) if units_left else usage.units_left,
+        )
+        return self._make_typed_result(merged) if typed else merged
+
+    @staticmethod
+    def __pop_batch_result(window, in_flight):
+        import requests
+
+        key = window.popleft()
+        future = in_flight[key][0]
+        in_flight[key][1] -= 1
+        if not in_flight[key][1]:
+            del in_flight[key]
+
+        try:
+            return future.result()
+        # A network failure fails its item only, not the rest of the batch.
+        except (DandelionException, requests.RequestException) as e:
+            return e
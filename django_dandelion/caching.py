@@ -0,0 +1,299 @@
+# -*- coding: utf-8
+
+from __future__ import unicode_literals
+
+import collections
+import hashlib
+import re
+import threading
+import time
+import unicodedata
+import zlib
+
+import six
+from django.core.cache import cache
+from django.core.cache.backends.base import DEFAULT_TIMEOUT
+
+from .conf import SETTING, SettingAttribute, dandelion_settings
+from .connection import is_deterministic_error
+from . import store
+
+# Bump whenever the layout of a cache entry changes: old entries then simply stop being found.
+CACHE_FORMAT_VERSION = 3
+CACHE_KEY_PREFIX = 'dandelion_v{}_'.format(CACHE_FORMAT_VERSION)
+
+_RAW = 0
+_ZLIB = 1
+
+# Params that never change the result of a request, such as the credentials.
+_IGNORED_PARAMS = frozenset(['token', '$app_id', '$app_key'])
+_TEXT_PARAMS = frozenset(['text', 'text1', 'text2'])
+_WHITESPACE = re.compile(r'\s+', re.UNICODE)
+
+# Rough per-entry bookkeeping cost (key, tuple, list) counted on top of the body size.
+_ENTRY_OVERHEAD = 200
+
+_now = getattr(time, 'monotonic', time.time)
+
+
+def get_cache_key(method, url, params):
+    """
+    Build the cache key of a request.
+
+    The key does not depend on the order of ``params`` nor on the credentials, and the values are fed to the hash one
+    at a time instead of being formatted into a single string first.
+    """
+    digest = hashlib.sha1()
+    _update(digest, method)
+    _update(digest, url)
+    for key in sorted(params):
+        if key not in _IGNORED_PARAMS:
+            _update(digest, key)
+            _update(digest, params[key])
+    return CACHE_KEY_PREFIX + digest.hexdigest()
+
+
+def _update(digest, value):
+    if not isinstance(value, six.text_type):
+        value = six.text_type(value)
+    digest.update(value.encode('utf-8'))
+    digest.update(b'\x00')
+
+
+def normalize_params(params):
+    """
+    Normalize the texts in ``params`` in place: Unicode NFC, whitespace runs collapsed to a single space and stripped.
+
+    Near-identical inputs are then sent, and cached, as the same request; note that the offsets in the results refer to
+    the normalized text.
+    """
+    for key in _TEXT_PARAMS.intersection(params):
+        if isinstance(params[key], six.string_types):
+            params[key] = _WHITESPACE.sub(' ', unicodedata.normalize('NFC', six.text_type(params[key]))).strip()
+    return params
+
+
+def get_timeouts(endpoint):
+    """
+    :param endpoint: The path of the endpoint, such as "datatxt/nex/v1".
+    :return: A ``(fresh, stored)`` tuple: the seconds an entry of ``endpoint`` is fresh for, from
+        ``DANDELION_CACHE_TIMEOUTS``, and the seconds it is kept in the cache for, which include
+        ``DANDELION_CACHE_STALE_TIMEOUT``. Endpoints without a timeout use the default one of the cache backend and
+        never become stale.
+    """
+    fresh = dandelion_settings.DANDELION_CACHE_TIMEOUTS.get(endpoint, DEFAULT_TIMEOUT)
+    stale = dandelion_settings.DANDELION_CACHE_STALE_TIMEOUT
+    if fresh is DEFAULT_TIMEOUT or fresh is None or stale is None:
+        return fresh, fresh
+    return fresh, fresh + stale
+
+
+def dump_entry(status_code, content, timeout=None, units=None):
+    """
+    Serialize a response into a compact cache entry.
+
+    :param status_code: The HTTP status of the response.
+    :param content: The raw body of the response, as bytes.
+    :param timeout: The number of seconds the entry is fresh for; None keeps it fresh forever.
+    :param units: The units the response cost, if known.
+    :return: A ``(status_code, encoding, body, fresh_until, units)`` tuple; bodies of at least
+        ``DANDELION_CACHE_COMPRESS_MIN_SIZE`` bytes are zlib-compressed.
+    """
+    fresh_until = time.time() + timeout if isinstance(timeout, (int, float)) else None
+    min_size = dandelion_settings.DANDELION_CACHE_COMPRESS_MIN_SIZE
+    if min_size is not None and len(content) >= min_size:
+        return status_code, _ZLIB, zlib.compress(content), fresh_until, units
+    return status_code, _RAW, content, fresh_until, units
+
+
+def make_entry(endpoint, status_code, content, units=None):
+    """
+    Build the cache entry of a response of ``endpoint``: successful responses are cached with the timeouts of the
+    endpoint, deterministic errors for ``DANDELION_CACHE_ERROR_TIMEOUT`` seconds.
+
+    :return: An ``(entry, timeout)`` tuple to store, or None if the response must not be cached.
+    """
+    if 200 <= status_code < 400:
+        fresh, stored = get_timeouts(endpoint)
+        return dump_entry(status_code, content, fresh, units), stored
+    error_timeout = dandelion_settings.DANDELION_CACHE_ERROR_TIMEOUT
+    if error_timeout and is_deterministic_error(status_code):
+        return dump_entry(status_code, content, error_timeout, units), error_timeout
+    return None
+
+
+def load_entry(entry):
+    """
+    Deserialize a cache entry built by :func:`dump_entry`.
+
+    :return: A ``(status_code, content, units)`` tuple, or None if the entry is not in a known format.
+    """
+    try:
+        status_code, encoding, body, _, units = entry
+    except (TypeError, ValueError):
+        return None
+
+    if encoding == _ZLIB:
+        return status_code, zlib.decompress(body), units
+    if encoding == _RAW:
+        return status_code, body, units
+    return None
+
+
+def is_stale(entry):
+    """Whether ``entry`` is past its fresh timeout, and only kept to be served stale."""
+    return entry[3] is not None and entry[3] <= time.time()
+
+
+def is_expired(entry):
+    """
+    Whether ``entry`` can no longer be served, even stale: it is past its fresh timeout and either an error, or past
+    ``DANDELION_CACHE_STALE_TIMEOUT`` too, or that setting is None.
+
+    A tier may keep an entry longer than the cache timeout it was stored with, as the in-process cache does for
+    ``DANDELION_LOCAL_CACHE_TIMEOUT`` seconds, so lookups check it rather than rely on the tier to drop the entry.
+    """
+    try:
+        status_code, _, _, fresh_until, _ = entry
+    except (TypeError, ValueError):
+        return False
+    now = time.time()
+    if fresh_until is None or fresh_until > now:
+        return False
+    stale = dandelion_settings.DANDELION_CACHE_STALE_TIMEOUT
+    return stale is None or not 200 <= status_code < 400 or fresh_until + stale <= now
+
+
+class LocalCache(object):
+    """
+    Thread-safe in-process LRU cache of entries, bounded by the total size in bytes of the bodies it holds.
+    """
+
+    max_size = SettingAttribute('DANDELION_LOCAL_CACHE_MAX_SIZE')
+    timeout = SettingAttribute('DANDELION_LOCAL_CACHE_TIMEOUT')
+
+    def __init__(self, max_size=SETTING, timeout=SETTING):
+        """
+        :param max_size: The maximum number of bytes held; 0 disables the cache. By default
+            DANDELION_LOCAL_CACHE_MAX_SIZE.
+        :param timeout: The number of seconds an entry is kept for; None keeps entries until they are evicted. By
+            default DANDELION_LOCAL_CACHE_TIMEOUT.
+        """
+        self.max_size = max_size
+        self.timeout = timeout
+        self.size = 0
+        self._entries = collections.OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            item = self._entries.pop(key, None)
+            if item is None:
+                return None
+            expires, size, entry = item
+            if expires is not None and expires <= _now():
+                self.size -= size
+                return None
+            self._entries[key] = item
+            return entry
+
+    def set(self, key, entry):
+        size = len(entry[2]) + _ENTRY_OVERHEAD
+        max_size, timeout = self.max_size, self.timeout
+        expires = _now() + timeout if timeout is not None else None
+
+        with self._lock:
+            # Dropped even when the new entry is too large to be kept, so the outdated one is not served.
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self.size -= old[1]
+            if size > max_size:
+                return
+            self._entries[key] = (expires, size, entry)
+            self.size += size
+            while self.size > max_size:
+                _, (_, evicted, _) = self._entries.popitem(last=False)
+                self.size -= evicted
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.size = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+
+local_cache = LocalCache()
+
+
+def lookup_entry(key):
+    """
+    Look an entry up in the in-process cache first, then in the Django cache, then in the database store if
+    ``DANDELION_DB_STORE`` is set; entries found in a tier are promoted to the ones before it. Expired entries, see
+    :func:`is_expired`, are skipped, and a stale one is only returned when the next tiers have no fresh entry: another
+    process may have refreshed it meanwhile.
+
+    :return: An ``(entry, tier)`` tuple, where tier is "local", "cache", "db" or None if the entry was not found.
+    """
+    found = None, None
+    entry = local_cache.get(key)
+    if entry is not None and not is_expired(entry):
+        if not is_stale(entry):
+            return entry, 'local'
+        found = entry, 'local'
+
+    entry = cache.get(key)
+    if entry is not None and not is_expired(entry) and (found[0] is None or not is_stale(entry)):
+        local_cache.set(key, entry)
+        if not is_stale(entry):
+            return entry, 'cache'
+        found = entry, 'cache'
+
+    if not dandelion_settings.DANDELION_DB_STORE:
+        return found
+    entry = store.get_entry(key)
+    if entry is None or is_expired(entry) or (found[0] is not None and is_stale(entry)):
+        return found
+    local_cache.set(key, entry)
+    cache.set(key, entry)
+    return entry, 'db'
+
+
+def get_entry(key):
+    """Like :func:`lookup_entry`, but only return the entry."""
+    return lookup_entry(key)[0]
+
+
+def prefetch_entries(keys):
+    """
+    Promote to the caches the entries of ``keys`` that are only in the database store, or fresh only there, with one
+    query for all of them, so that the requests of a batch find their entries in the cache.
+    """
+    if not dandelion_settings.DANDELION_DB_STORE:
+        return
+    keys = [key for key in keys if not _is_fresh(local_cache.get(key))]
+    cached = cache.get_many(keys)
+    entries = store.get_entries([key for key in keys if not _is_fresh(cached.get(key))])
+    entries = dict((key, entry) for key, entry in entries.items() if key not in cached or _is_fresh(entry))
+    for key, entry in entries.items():
+        local_cache.set(key, entry)
+    if entries:
+        cache.set_many(entries)
+
+
+def _is_fresh(entry):
+    return entry is not None and not is_stale(entry)
+
+
+def set_entry(key, entry, timeout=DEFAULT_TIMEOUT, endpoint=None):
+    """
+    Store an entry in both the in-process cache and the Django cache, and in the database store if
+    ``DANDELION_DB_STORE`` is set.
+
+    :param endpoint: The path of the endpoint of the entry, such as "datatxt/nex/v1"; required by the database store.
+    """
+    local_cache.set(key, entry)
+    cache.set(key, entry, timeout)
+    if dandelion_settings.DANDELION_DB_STORE and endpoint is not None:
+        store.save_entry(key, endpoint, entry)
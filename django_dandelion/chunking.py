@@ -0,0 +1,183 @@
+# -*- coding: utf-8
+
+from __future__ import unicode_literals, division
+
+import collections
+import re
+import zlib
+
+from .decoding import AttributeDict, AttributeList
+
+# Paragraph breaks, and the whitespace after the end of a sentence.
+_BOUNDARY = re.compile(r'\s*\n\s*\n\s*|(?<=[.!?;])\s+', re.UNICODE)
+_WHITESPACE = re.compile(r'\s+', re.UNICODE)
+
+_Segment = collections.namedtuple('_Segment', 'start end paragraph')
+
+
+def split_text(text, max_size, overlap=0):
+    """
+    Split a text into chunks of at most ``max_size`` characters, on paragraph and sentence boundaries when possible.
+
+    Chunks end where the content says so (a paragraph break, or a sentence whose checksum matches) once they are half
+    full, rather than wherever they are full, so editing a text moves the boundaries of the edited chunks only and the
+    others are still found in the cache.
+
+    :param overlap: The number of characters, in whole sentences, repeated from the end of a chunk at the start of the
+        next one, to give context to the entities near the seams.
+    :return: A list of ``(offset, chunk)`` tuples, where offset is the position of the chunk in the text.
+    """
+    chunks = []
+    current = []
+    new = 0
+    for segment in _get_segments(text, max_size):
+        if new and segment.end - current[0].start > max_size:
+            chunks.append(_make_chunk(text, current))
+            current, new = _get_overlap(current, overlap), 0
+        # Only the overlap is left: drop its first sentences until the new one fits.
+        while current and segment.end - current[0].start > max_size:
+            current.pop(0)
+
+        current.append(segment)
+        new += 1
+        if segment.end - current[0].start >= max_size // 2 and (
+                segment.paragraph or zlib.crc32(text[segment.start:segment.end].encode('utf-8')) % 4 == 0):
+            chunks.append(_make_chunk(text, current))
+            current, new = _get_overlap(current, overlap), 0
+
+    if new:
+        chunks.append(_make_chunk(text, current))
+    return chunks
+
+
+def _get_segments(text, max_size):
+    start = 0
+    for match in _BOUNDARY.finditer(text):
+        if match.end() > start:
+            for segment in _split_segment(text, start, match.end(), '\n' in match.group(), max_size):
+                yield segment
+            start = match.end()
+    if start < len(text):
+        for segment in _split_segment(text, start, len(text), True, max_size):
+            yield segment
+
+
+def _split_segment(text, start, end, paragraph, max_size):
+    # Sentences longer than a chunk are split on whitespace, or anywhere as a last resort.
+    while end - start > max_size:
+        cut = start + max_size
+        for match in _WHITESPACE.finditer(text, start + 1, start + max_size):
+            cut = match.end()
+        yield _Segment(start, cut, False)
+        start = cut
+    yield _Segment(start, end, paragraph)
+
+
+def _get_overlap(segments, overlap):
+    tail = []
+    size = 0
+    for segment in reversed(segments):
+        size += segment.end - segment.start
+        if size > overlap:
+            break
+        tail.insert(0, segment)
+    return tail
+
+
+def _make_chunk(text, segments):
+    return segments[0].start, text[segments[0].start:segments[-1].end]
+
+
+def _get_weights(chunks):
+    # The number of characters each chunk adds to the previous ones, so the overlaps are not counted twice.
+    weights = []
+    covered = 0
+    for offset, chunk in chunks:
+        end = offset + len(chunk)
+        weights.append(max(end - max(offset, covered), 0))
+        covered = max(covered, end)
+    return weights
+
+
+def _merge_top_level(results):
+    merged = AttributeDict(results[0])
+    times = [result.get('time') for result in results]
+    if all(isinstance(time, (int, float)) for time in times):
+        merged['time'] = sum(times)
+    return merged
+
+
+def merge_entities(chunks, results, params):
+    """
+    Merge the ``datatxt/nex`` results of the chunks of a text: the offsets of the annotations are moved to the whole
+    text, and annotations overlapping at the seams are replaced by the most confident one.
+    """
+    annotations = []
+    for (offset, _), result in zip(chunks, results):
+        for annotation in result.get('annotations', ()):
+            annotation = AttributeDict(annotation)
+            annotation['start'] += offset
+            annotation['end'] += offset
+            annotations.append(annotation)
+    annotations.sort(key=lambda a: (a['start'], -a.get('confidence', 0)))
+
+    kept = AttributeList()
+    for annotation in annotations:
+        if kept and annotation['start'] < kept[-1]['end']:
+            if annotation.get('confidence', 0) > kept[-1].get('confidence', 0):
+                kept[-1] = annotation
+        else:
+            kept.append(annotation)
+
+    merged = _merge_top_level(results)
+    merged['annotations'] = kept
+    if any('topEntities' in result for result in results):
+        top = {}
+        for result in results:
+            for entity in result.get('topEntities', ()):
+                if entity['uri'] not in top or entity['score'] > top[entity['uri']]['score']:
+                    top[entity['uri']] = entity
+        limit = int(params.get('top_entities') or len(top))
+        merged['topEntities'] = AttributeList(sorted(top.values(), key=lambda e: -e['score'])[:limit])
+    return merged
+
+
+def merge_sentiment(chunks, results, params):
+    """
+    Merge the ``datatxt/sent`` results of the chunks of a text: the score is the mean of the scores weighted by the
+    length of the chunks, and the type the one covering most of the text.
+    """
+    weights = _get_weights(chunks)
+    total = sum(weights) or 1
+    score = 0
+    types = collections.Counter()
+    for weight, result in zip(weights, results):
+        score += result.sentiment.score * weight
+        types[result.sentiment.type] += weight
+
+    merged = _merge_top_level(results)
+    merged['sentiment'] = AttributeDict(score=score / total, type=types.most_common(1)[0][0])
+    return merged
+
+
+def merge_categories(chunks, results, params):
+    """
+    Merge the ``datatxt/cl`` results of the chunks of a text: the score of a category is the mean of its scores
+    weighted by the length of the chunks, counting 0 where it was not returned.
+    """
+    weights = _get_weights(chunks)
+    total = sum(weights) or 1
+    categories = collections.OrderedDict()
+    scores = collections.defaultdict(float)
+    for weight, result in zip(weights, results):
+        for category in result.get('categories', ()):
+            categories.setdefault(category['name'], category)
+            scores[category['name']] += category['score'] * weight
+
+    min_score = float(params.get('min_score') or 0)
+    merged = _merge_top_level(results)
+    merged['categories'] = AttributeList(sorted(
+        (AttributeDict(categories[name], score=score / total) for name, score in scores.items()
+         if score / total >= min_score),
+        key=lambda category: -category['score']))
+    return merged
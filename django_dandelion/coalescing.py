@@ -0,0 +1,123 @@
+# -*- coding: utf-8
+
+from __future__ import unicode_literals
+
+import logging
+import threading
+import time
+
+from django.core.cache import cache
+
+from .caching import get_entry, is_stale
+from .conf import dandelion_settings
+
+logger = logging.getLogger(__name__)
+
+_now = getattr(time, 'monotonic', time.time)
+
+
+class _Call(object):
+    def __init__(self):
+        self.event = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight(object):
+    """
+    Coalesce concurrent calls sharing the same key: the first caller runs the function, the others wait for it and
+    get the same result (or exception).
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls = {}
+
+    def do(self, key, fn):
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+
+        if not leader:
+            call.event.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn()
+        except Exception as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.event.set()
+        return call.result
+
+
+requests_in_flight = SingleFlight()
+
+_refreshing = set()
+_refreshing_lock = threading.Lock()
+
+
+def refresh_in_background(key, fn):
+    """Run ``fn`` in a daemon thread, coalesced with the calls in flight for ``key``, unless one is already running."""
+    with _refreshing_lock:
+        if key in _refreshing:
+            return
+        _refreshing.add(key)
+
+    def run():
+        try:
+            requests_in_flight.do(key, fn)
+        except Exception:
+            logger.exception('Background refresh of %s failed', key)
+        finally:
+            with _refreshing_lock:
+                _refreshing.discard(key)
+
+    thread = threading.Thread(target=run)
+    thread.daemon = True
+    thread.start()
+
+
+def acquire_lock(key):
+    """
+    Try to take the cluster-wide lock guarding the computation of the cache entry ``key``.
+
+    :return: True if the lock was taken, or if cross-process locking is disabled (``DANDELION_CACHE_LOCK_TIMEOUT`` is
+        None); False if another process holds it.
+    """
+    if dandelion_settings.DANDELION_CACHE_LOCK_TIMEOUT is None:
+        return True
+    return cache.add(_lock_key(key), 1, dandelion_settings.DANDELION_CACHE_LOCK_TIMEOUT)
+
+
+def release_lock(key):
+    if dandelion_settings.DANDELION_CACHE_LOCK_TIMEOUT is not None:
+        cache.delete(_lock_key(key))
+
+
+def wait_for_entry(key):
+    """
+    Poll the cache while another process holds the lock of ``key``.
+
+    :return: The cache entry, or None if the holder released the lock without storing one or did not do it in time.
+    """
+    deadline = _now() + dandelion_settings.DANDELION_CACHE_LOCK_TIMEOUT
+    while _now() < deadline:
+        time.sleep(dandelion_settings.DANDELION_CACHE_LOCK_POLL_INTERVAL)
+        entry = get_entry(key)
+        if entry is not None and not is_stale(entry):
+            return entry
+        if cache.get(_lock_key(key)) is None:
+            return None
+    return None
+
+
+def _lock_key(key):
+    return key + '_lock'
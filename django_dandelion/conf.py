@@ -2,8 +2,128 @@
 
 from __future__ import unicode_literals
 
+import sys
+
 from django.conf import settings
+from django.core.signals import setting_changed
+
+DEFAULTS = {
+    'DANDELION_HOST': 'api.dandelion.eu',
+    'DANDELION_TOKEN': None,
+    'DANDELION_USE_CACHE': True,
+    'DANDELION_POOL_CONNECTIONS': 10,
+    'DANDELION_POOL_MAXSIZE': 10,
+    'DANDELION_POOL_BLOCK': False,
+    'DANDELION_KEEP_ALIVE': True,
+    'DANDELION_BATCH_MAX_WORKERS': 8,
+    'DANDELION_EXECUTOR_MAX_WORKERS': 4,
+    'DANDELION_EXECUTOR_MAX_QUEUE': 100,
+    'DANDELION_EXECUTOR_BLOCK': True,
+    'DANDELION_CHUNK_SIZE': None,
+    'DANDELION_CHUNK_OVERLAP': 0,
+    'DANDELION_CACHE_COMPRESS_MIN_SIZE': 1024,
+    'DANDELION_CACHE_NORMALIZE_TEXT': False,
+    'DANDELION_LOCAL_CACHE_MAX_SIZE': 8 * 1024 * 1024,
+    'DANDELION_LOCAL_CACHE_TIMEOUT': 300,
+    'DANDELION_CACHE_LOCK_TIMEOUT': None,
+    'DANDELION_CACHE_LOCK_POLL_INTERVAL': 0.05,
+    'DANDELION_CACHE_TIMEOUTS': {},
+    'DANDELION_CACHE_STALE_TIMEOUT': None,
+    'DANDELION_CACHE_STALE_WHILE_REVALIDATE': True,
+    'DANDELION_CACHE_ERROR_TIMEOUT': 60,
+    'DANDELION_DB_STORE': False,
+    'DANDELION_DB_STORE_TIMEOUT': 30 * 24 * 3600,
+    'DANDELION_DB_STORE_BATCH_SIZE': 100,
+    'DANDELION_TIMEOUT': None,
+    'DANDELION_RETRY_MAX_ATTEMPTS': 3,
+    'DANDELION_RETRY_BACKOFF': 0.5,
+    'DANDELION_RETRY_MAX_BACKOFF': 10,
+    'DANDELION_RETRY_DEADLINE': None,
+    'DANDELION_RATE_LIMITS': {},
+    'DANDELION_RATE_LIMIT_SHARED': False,
+    'DANDELION_RATE_LIMIT_BLOCK': True,
+    'DANDELION_METRICS_BACKEND': None,
+    'DANDELION_SLOW_REQUEST_THRESHOLD': None,
+    'DANDELION_TRANSPORT': 'django_dandelion.transport.RequestsTransport',
+    'DANDELION_TRANSPORT_OPTIONS': {},
+    'DANDELION_AUTOCOMPLETE_MAX_ENTRIES': 10000,
+    'DANDELION_AUTOCOMPLETE_DEBOUNCE': 0.15,
+}
+
+
+# The default of the arguments standing for a setting whose own value may be None, such as a timeout: the setting is
+# read when the argument is used, not when the function is defined.
+SETTING = object()
+
+
+class DandelionSettings(object):
+    """
+    The ``DANDELION_*`` settings, each read from ``django.conf.settings`` when first accessed rather than at import,
+    and read again once changed, such as by ``override_settings``.
+    """
+
+    def __getattr__(self, name):
+        try:
+            default = DEFAULTS[name]
+        except KeyError:
+            raise AttributeError(name)
+        value = getattr(settings, name, default)
+        # Cached as an instance attribute, so the next accesses do not reach __getattr__.
+        setattr(self, name, value)
+        return value
+
+    def get(self, name, value=SETTING):
+        """:return: ``value``, or the setting ``name`` if it is :data:`SETTING`."""
+        return getattr(self, name) if value is SETTING else value
+
+    def reload(self, name=None):
+        """Forget the value of the setting ``name``, or of all of them, so it is read again on the next access."""
+        if name is None:
+            self.__dict__.clear()
+        else:
+            self.__dict__.pop(name, None)
+
+
+dandelion_settings = DandelionSettings()
+
+
+class SettingAttribute(object):
+    """
+    An attribute holding the value assigned to it, or reading the setting ``name`` on every access when it was
+    assigned :data:`SETTING` or nothing at all; so class defaults and module-level objects follow the settings.
+    """
+
+    def __init__(self, name):
+        self.name = name
+        # Named after the setting rather than the attribute, which the descriptor only learns on Python 3.6+: the
+        # attributes of a class read different settings.
+        self.attribute = '_' + name.lower()
+
+    def __get__(self, instance, owner=None):
+        if instance is None:
+            return self
+        return dandelion_settings.get(self.name, instance.__dict__.get(self.attribute, SETTING))
+
+    def __set__(self, instance, value):
+        instance.__dict__[self.attribute] = value
+
+
+if sys.version_info >= (3, 7):
+    def __getattr__(name):
+        # "from django_dandelion.conf import DANDELION_HOST" still works, but reads the setting once.
+        if name in DEFAULTS:
+            return getattr(dandelion_settings, name)
+        raise AttributeError('module {!r} has no attribute {!r}'.format(__name__, name))
+else:
+    # Without module __getattr__ (PEP 562), the settings that were module attributes stay so, read at import.
+    DANDELION_HOST = dandelion_settings.DANDELION_HOST
+    DANDELION_TOKEN = dandelion_settings.DANDELION_TOKEN
+    DANDELION_USE_CACHE = dandelion_settings.DANDELION_USE_CACHE
+
+
+def _reload_setting(setting, **kwargs):
+    if setting in DEFAULTS:
+        dandelion_settings.reload(setting)
+
 
-DANDELION_HOST = getattr(settings, 'DANDELION_HOST', 'api.dandelion.eu')
-DANDELION_TOKEN = getattr(settings, 'DANDELION_TOKEN', None)
-DANDELION_USE_CACHE = getattr(settings, 'DANDELION_USE_CACHE', True)
+setting_changed.connect(_reload_setting, dispatch_uid='django_dandelion.conf')
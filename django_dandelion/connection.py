@@ -0,0 +1,97 @@
+# -*- coding: utf-8
+
+from __future__ import unicode_literals
+
+import os
+import threading
+
+from django.core.signals import setting_changed
+
+from . import __version__
+from .conf import dandelion_settings
+
+_lock = threading.Lock()
+_session = None
+_session_pid = None
+
+
+def get_session():
+    """
+    Return the process-wide ``requests.Session`` shared by every request object.
+
+    The session is created lazily and rebuilt whenever the current process id differs from the one that created it,
+    so children forked by gunicorn/uWSGI never reuse sockets inherited from the master.
+    """
+    global _session, _session_pid
+
+    pid = os.getpid()
+    if _session is None or _session_pid != pid:
+        with _lock:
+            if _session is None or _session_pid != pid:
+                _session = _build_session()
+                _session_pid = pid
+    return _session
+
+
+def is_transient(status_code):
+    """Whether an error response is worth retrying, or replacing with a stale result: throttling and server errors."""
+    return status_code == 429 or status_code >= 500
+
+
+def is_deterministic_error(status_code):
+    """
+    Whether an error response would be returned again for the same request: client errors, except the ones depending
+    on the credentials, on timing or on throttling.
+    """
+    return 400 <= status_code < 500 and status_code not in (401, 403, 408, 429)
+
+
+def close_session():
+    """Close the shared session, if any; a new one is built on the next request."""
+    global _session, _session_pid
+
+    with _lock:
+        if _session is not None and _session_pid == os.getpid():
+            _session.close()
+        _session = None
+        _session_pid = None
+
+
+def _build_session():
+    # Imported on the first request, not with the package: requests takes longer to import than the rest of it.
+    import requests
+    from requests.adapters import HTTPAdapter
+
+    session = requests.Session()
+    adapter = HTTPAdapter(
+        pool_connections=dandelion_settings.DANDELION_POOL_CONNECTIONS,
+        pool_maxsize=dandelion_settings.DANDELION_POOL_MAXSIZE,
+        pool_block=dandelion_settings.DANDELION_POOL_BLOCK
+    )
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    session.headers['User-Agent'] = 'django-dandelion/' + __version__
+    if not dandelion_settings.DANDELION_KEEP_ALIVE:
+        session.headers['Connection'] = 'close'
+    return session
+
+
+def _after_fork_in_child():
+    global _lock, _session, _session_pid
+
+    # Sockets and the lock state belong to the parent: drop them without closing.
+    _lock = threading.Lock()
+    _session = None
+    _session_pid = None
+
+
+def _reset_session(setting, **kwargs):
+    if setting in ('DANDELION_POOL_CONNECTIONS', 'DANDELION_POOL_MAXSIZE', 'DANDELION_POOL_BLOCK',
+                   'DANDELION_KEEP_ALIVE'):
+        close_session()
+
+
+setting_changed.connect(_reset_session, dispatch_uid='django_dandelion.connection')
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_after_fork_in_child)
@@ -3,6 +3,9 @@
 from __future__ import unicode_literals
 
 from .base import BaseDandelionParamsRequest
+from .exceptions import DandelionQueueFullException
+from .results import WikisearchResult
+from .schema import LANGUAGES, INCLUDE, Schema, String, Number, Choice, CommaList
 
 
 class Wikisearch(BaseDandelionParamsRequest):
@@ -13,6 +16,17 @@ class Wikisearch(BaseDandelionParamsRequest):
     https://dandelion.eu/docs/api/datagraph/wikisearch/
     """
 
+    result_model = WikisearchResult
+    extra_url = ('datagraph', 'wikisearch', 'v1')
+    schema = Schema({
+        'text': String(),
+        'lang': Choice(*LANGUAGES),
+        'limit': Number(1, 50, integer=True),
+        'offset': Number(0, integer=True),
+        'query': Choice('full', 'prefix'),
+        'include': CommaList(*INCLUDE),
+    })
+
     def __init__(self, **params):
         """
         :param params:
@@ -64,19 +78,66 @@ class Wikisearch(BaseDandelionParamsRequest):
                 | Example: include=types,lod
         """
 
-        keys_allowed = [
-            'text',
-            'lang',
-            'limit',
-            'offset',
-            'query',
-            'include',
-        ]
+        super(Wikisearch, self).__init__(**params)
 
-        super(Wikisearch, self).__init__(keys_allowed=keys_allowed, keys_unique=[[]], **params)
+    def analyze(self, typed=False):
+        """
+        :param typed: Whether to return a :class:`~.results.WikisearchResult` instead of a dict.
+        """
 
-    def analyze(self):
         return self._do_request(
-            extra_url=('datagraph', 'wikisearch', 'v1'),
-            method='post'
+            extra_url=self.extra_url,
+            method='post',
+            typed=typed
+        )
+
+    def aanalyze(self, typed=False):
+        """Coroutine version of :meth:`analyze`."""
+
+        return self._ado_request(
+            extra_url=self.extra_url,
+            method='post',
+            typed=typed
         )
+
+    def iter_hits(self, max_hits=None, typed=False):
+        """
+        Yield the hits of every page, from ``offset`` on, in pages of ``limit`` hits (10 by default).
+
+        While the hits of a page are consumed, the next one is fetched by the executor of :meth:`submit`, so a scan
+        of many pages mostly waits for the first one. Pages are cached each on their own, as separate calls of
+        analyze(); the scan stops at the first page shorter than ``limit``.
+
+        :param max_hits: The maximum number of hits to yield; by default all of them.
+        :param typed: Whether to yield :class:`~.results.WikisearchHit` objects instead of dicts.
+        """
+        limit = int(self.params.get('limit') or 10)
+        offset = int(self.params.get('offset') or 0)
+        page = self._copy_with({'limit': limit, 'offset': offset}).analyze(typed=typed)
+        future = None
+        try:
+            while True:
+                hits = page.entities or []
+                full = len(hits) == limit
+                if max_hits is not None:
+                    hits = hits[:max_hits]
+                    max_hits -= len(hits)
+                if not full or max_hits == 0:
+                    for hit in hits:
+                        yield hit
+                    return
+
+                offset += limit
+                request = self._copy_with({'limit': limit, 'offset': offset})
+                try:
+                    future = request.submit(typed=typed)
+                except DandelionQueueFullException:
+                    # Fetched once the hits of this page are consumed instead.
+                    future = None
+                for hit in hits:
+                    yield hit
+                page = request.analyze(typed=typed) if future is None else future.result()
+                future = None
+        finally:
+            if future is not None:
+                future.cancel()
@@ -3,6 +3,39 @@
 from __future__ import unicode_literals
 
 from .base import BaseDandelionRequest, BaseDandelionParamsRequest
+from .chunking import merge_entities, merge_categories, merge_sentiment
+from .results import EntityExtractionResult, TextSimilarityResult, TextClassificationResult, \
+    LanguageDetectionResult, SentimentResult
+from .schema import LANGUAGES, INCLUDE, Schema, String, Boolean, Number, Choice, CommaList
+
+COUNTRIES = (
+    'AD', 'AE', 'AM', 'AO', 'AQ', 'AR', 'AU', 'BB', 'BR', 'BS', 'BY', 'CA', 'CH', 'CL', 'CN', 'CX', 'DE', 'FR', 'GB',
+    'HU', 'IT', 'JP', 'KR', 'MX', 'NZ', 'PG', 'PL', 'RE', 'SE', 'SG', 'US', 'YT', 'ZW',
+)
+
+
+def _input_params(suffix=''):
+    return dict((key + suffix, String()) for key in ('text', 'url', 'html', 'html_fragment'))
+
+
+def _input_keys(suffix=''):
+    return [key + suffix for key in ('text', 'url', 'html', 'html_fragment')]
+
+
+def _nex_params(prefix=''):
+    params = {
+        'top_entities': Number(0, integer=True),
+        'min_confidence': Number(0, 1),
+        'min_length': Number(2, integer=True),
+        'social.hashtag': Boolean(),
+        'social.mention': Boolean(),
+        'include': CommaList(*INCLUDE),
+        'extra_types': CommaList('phone', 'vat'),
+        'country': Choice('', *COUNTRIES),
+        'custom_spots': String(),
+        'epsilon': Number(0, 0.5),
+    }
+    return dict((prefix + key, validator) for key, validator in params.items())
 
 
 class EntityExtraction(BaseDandelionParamsRequest):
@@ -15,6 +48,16 @@ class EntityExtraction(BaseDandelionParamsRequest):
     https://dandelion.eu/docs/api/datatxt/nex/v1/
     """
 
+    result_model = EntityExtractionResult
+    extra_url = ('datatxt', 'nex', 'v1')
+    merge_chunks = staticmethod(merge_entities)
+    schema = Schema(
+        _input_params(),
+        _nex_params(),
+        {'lang': Choice('auto', *LANGUAGES)},
+        unique=[_input_keys()],
+    )
+
     def __init__(self, **params):
         """
         :param params:
@@ -124,30 +167,26 @@ class EntityExtraction(BaseDandelionParamsRequest):
                 | Accepted values: 0.0 .. 0.5
         """
 
-        keys_allowed = [
-            'text', 'url', 'html', 'html_fragment',
-            'lang',
-            'top_entities',
-            'min_confidence',
-            'min_length',
-            'social.hashtag',
-            'social.mention',
-            'include',
-            'extra_types',
-            'country',
-            'custom_spots',
-            'epsilon',
-        ]
-        keys_unique = [
-            ['text', 'url', 'html', 'html_fragment'],
-        ]
-
-        super(EntityExtraction, self).__init__(keys_allowed=keys_allowed, keys_unique=keys_unique, **params)
-
-    def analyze(self):
+        super(EntityExtraction, self).__init__(**params)
+
+    def analyze(self, typed=False):
+        """
+        :param typed: Whether to return a :class:`~.results.EntityExtractionResult` instead of a dict.
+        """
+
         return self._do_request(
-            extra_url=('datatxt', 'nex', 'v1'),
-            method='post'
+            extra_url=self.extra_url,
+            method='post',
+            typed=typed
+        )
+
+    def aanalyze(self, typed=False):
+        """Coroutine version of :meth:`analyze`."""
+
+        return self._ado_request(
+            extra_url=self.extra_url,
+            method='post',
+            typed=typed
         )
 
     class UserDefinedSpots(BaseDandelionRequest):
@@ -195,6 +234,15 @@ class EntityExtraction(BaseDandelionParamsRequest):
                 extra_dict={'data': data}
             )
 
+        def acreate(self, data):
+            """Coroutine version of :meth:`create`."""
+
+            return self._ado_request(
+                extra_url=('datatxt', 'custom-spots', 'v1'),
+                method='post',
+                extra_dict={'data': data}
+            )
+
         def read(self, id):
             """
             :param id: The id of the spots you want to fetch.
@@ -207,6 +255,15 @@ class EntityExtraction(BaseDandelionParamsRequest):
                 extra_dict={'id': id}
             )
 
+        def aread(self, id):
+            """Coroutine version of :meth:`read`."""
+
+            return self._ado_request(
+                extra_url=('datatxt', 'custom-spots', 'v1'),
+                method='get',
+                extra_dict={'id': id}
+            )
+
         def update(self, id, data):
             """
             :param id: The id of the spots you want to update.
@@ -220,6 +277,15 @@ class EntityExtraction(BaseDandelionParamsRequest):
                 extra_dict={'id': id, 'data': data}
             )
 
+        def aupdate(self, id, data):
+            """Coroutine version of :meth:`update`."""
+
+            return self._ado_request(
+                extra_url=('datatxt', 'custom-spots', 'v1'),
+                method='put',
+                extra_dict={'id': id, 'data': data}
+            )
+
         def delete(self, id):
             """
             :param id: The id of the spots you want to delete.
@@ -232,6 +298,15 @@ class EntityExtraction(BaseDandelionParamsRequest):
                 extra_dict={'id': id}
             )
 
+        def adelete(self, id):
+            """Coroutine version of :meth:`delete`."""
+
+            return self._ado_request(
+                extra_url=('datatxt', 'custom-spots', 'v1'),
+                method='delete',
+                extra_dict={'id': id}
+            )
+
         def list(self):
             """
             :return: A list of personal spots.
@@ -242,6 +317,14 @@ class EntityExtraction(BaseDandelionParamsRequest):
                 method='get'
             )
 
+        def alist(self):
+            """Coroutine version of :meth:`list`."""
+
+            return self._ado_request(
+                extra_url=('datatxt', 'custom-spots', 'v1'),
+                method='get'
+            )
+
 
 class TextSimilarity(BaseDandelionParamsRequest):
     """
@@ -252,6 +335,19 @@ class TextSimilarity(BaseDandelionParamsRequest):
     https://dandelion.eu/docs/api/datatxt/sim/v1/
     """
 
+    result_model = TextSimilarityResult
+    extra_url = ('datatxt', 'sim', 'v1')
+    schema = Schema(
+        _input_params('1'),
+        _input_params('2'),
+        _nex_params('nex.'),
+        {
+            'lang': Choice('auto', *LANGUAGES),
+            'bow': Choice('always', 'one_empty', 'both_empty', 'never'),
+        },
+        unique=[_input_keys('1'), _input_keys('2')],
+    )
+
     def __init__(self, **params):
         """
         :param params:
@@ -380,33 +476,26 @@ class TextSimilarity(BaseDandelionParamsRequest):
                 | Accepted values: 0.0 .. 0.5
         """
 
-        keys_allowed = [
-            'text1', 'url1', 'html1', 'html_fragment1',
-            'text2', 'url2', 'html2', 'html_fragment2',
-            'lang',
-            'bow',
-            'nex.top_entities',
-            'nex.min_confidence',
-            'nex.min_length',
-            'nex.social.hashtag',
-            'nex.social.mention',
-            'nex.include',
-            'nex.extra_types',
-            'nex.country',
-            'nex.custom_spots',
-            'nex.epsilon',
-        ]
-        keys_unique = [
-            ['text1', 'url1', 'html1', 'html_fragment1'],
-            ['text2', 'url2', 'html2', 'html_fragment2'],
-        ]
-
-        super(TextSimilarity, self).__init__(keys_allowed=keys_allowed, keys_unique=keys_unique, **params)
-
-    def analyze(self):
+        super(TextSimilarity, self).__init__(**params)
+
+    def analyze(self, typed=False):
+        """
+        :param typed: Whether to return a :class:`~.results.TextSimilarityResult` instead of a dict.
+        """
+
         return self._do_request(
-            extra_url=('datatxt', 'sim', 'v1'),
-            method='post'
+            extra_url=self.extra_url,
+            method='post',
+            typed=typed
+        )
+
+    def aanalyze(self, typed=False):
+        """Coroutine version of :meth:`analyze`."""
+
+        return self._ado_request(
+            extra_url=self.extra_url,
+            method='post',
+            typed=typed
         )
 
 
@@ -419,6 +508,21 @@ class TextClassification(BaseDandelionParamsRequest):
     https://dandelion.eu/docs/api/datatxt/cl/v1/
     """
 
+    result_model = TextClassificationResult
+    extra_url = ('datatxt', 'cl', 'v1')
+    merge_chunks = staticmethod(merge_categories)
+    schema = Schema(
+        _input_params(),
+        _nex_params('nex.'),
+        {
+            'model': String(),
+            'min_score': Number(0, 1),
+            'max_annotations': Number(1, integer=True),
+            'include': CommaList('score_details'),
+        },
+        unique=[_input_keys()],
+    )
+
     def __init__(self, **params):
         """
         :param params:
@@ -552,33 +656,26 @@ class TextClassification(BaseDandelionParamsRequest):
                 | Accepted values: 0.0 .. 0.5
         """
 
-        keys_allowed = [
-            'text', 'url', 'html', 'html_fragment',
-            'model',
-            'min_score',
-            'max_annotations',
-            'include',
-            'nex.top_entities',
-            'nex.min_confidence',
-            'nex.min_length',
-            'nex.social.hashtag',
-            'nex.social.mention',
-            'nex.include',
-            'nex.extra_types',
-            'nex.country',
-            'nex.custom_spots',
-            'nex.epsilon',
-        ]
-        keys_unique = [
-            ['text', 'url', 'html', 'html_fragment'],
-        ]
-
-        super(TextClassification, self).__init__(keys_allowed=keys_allowed, keys_unique=keys_unique, **params)
-
-    def analyze(self):
+        super(TextClassification, self).__init__(**params)
+
+    def analyze(self, typed=False):
+        """
+        :param typed: Whether to return a :class:`~.results.TextClassificationResult` instead of a dict.
+        """
+
         return self._do_request(
-            extra_url=('datatxt', 'cl', 'v1'),
-            method='post'
+            extra_url=self.extra_url,
+            method='post',
+            typed=typed
+        )
+
+    def aanalyze(self, typed=False):
+        """Coroutine version of :meth:`analyze`."""
+
+        return self._ado_request(
+            extra_url=self.extra_url,
+            method='post',
+            typed=typed
         )
 
     class UserDefinedClassifiers(BaseDandelionRequest):
@@ -632,6 +729,15 @@ class TextClassification(BaseDandelionParamsRequest):
                 extra_dict={'data': data}
             )
 
+        def acreate(self, data):
+            """Coroutine version of :meth:`create`."""
+
+            return self._ado_request(
+                extra_url=('datatxt', 'cl', 'models', 'v1'),
+                method='post',
+                extra_dict={'data': data}
+            )
+
         def read(self, id):
             """
             :param id: The id of the model you want to fetch.
@@ -644,6 +750,15 @@ class TextClassification(BaseDandelionParamsRequest):
                 extra_dict={'id': id}
             )
 
+        def aread(self, id):
+            """Coroutine version of :meth:`read`."""
+
+            return self._ado_request(
+                extra_url=('datatxt', 'cl', 'models', 'v1'),
+                method='get',
+                extra_dict={'id': id}
+            )
+
         def update(self, id, data):
             """
             :param id: The id of the model you want to update.
@@ -657,6 +772,15 @@ class TextClassification(BaseDandelionParamsRequest):
                 extra_dict={'id': id, 'data': data}
             )
 
+        def aupdate(self, id, data):
+            """Coroutine version of :meth:`update`."""
+
+            return self._ado_request(
+                extra_url=('datatxt', 'cl', 'models', 'v1'),
+                method='put',
+                extra_dict={'id': id, 'data': data}
+            )
+
         def delete(self, id):
             """
             :param id: The id of the model you want to delete.
@@ -669,6 +793,15 @@ class TextClassification(BaseDandelionParamsRequest):
                 extra_dict={'id': id}
             )
 
+        def adelete(self, id):
+            """Coroutine version of :meth:`delete`."""
+
+            return self._ado_request(
+                extra_url=('datatxt', 'cl', 'models', 'v1'),
+                method='delete',
+                extra_dict={'id': id}
+            )
+
         def list(self):
             """
             :return: A list of personal models.
@@ -679,6 +812,14 @@ class TextClassification(BaseDandelionParamsRequest):
                 method='get'
             )
 
+        def alist(self):
+            """Coroutine version of :meth:`list`."""
+
+            return self._ado_request(
+                extra_url=('datatxt', 'cl', 'models', 'v1'),
+                method='get'
+            )
+
 
 class LanguageDetection(BaseDandelionParamsRequest):
     """
@@ -688,6 +829,14 @@ class LanguageDetection(BaseDandelionParamsRequest):
     https://dandelion.eu/docs/api/datatxt/li/v1/
     """
 
+    result_model = LanguageDetectionResult
+    extra_url = ('datatxt', 'li', 'v1')
+    schema = Schema(
+        _input_params(),
+        {'clean': Boolean()},
+        unique=[_input_keys()],
+    )
+
     def __init__(self, **params):
         """
         :param params:
@@ -714,20 +863,26 @@ class LanguageDetection(BaseDandelionParamsRequest):
 
         """
 
-        keys_allowed = [
-            'text', 'url', 'html', 'html_fragment',
-            'clean',
-        ]
-        keys_unique = [
-            ['text', 'url', 'html', 'html_fragment'],
-        ]
+        super(LanguageDetection, self).__init__(**params)
 
-        super(LanguageDetection, self).__init__(keys_allowed=keys_allowed, keys_unique=keys_unique, **params)
+    def analyze(self, typed=False):
+        """
+        :param typed: Whether to return a :class:`~.results.LanguageDetectionResult` instead of a dict.
+        """
 
-    def analyze(self):
         return self._do_request(
-            extra_url=('datatxt', 'li', 'v1'),
-            method='post'
+            extra_url=self.extra_url,
+            method='post',
+            typed=typed
+        )
+
+    def aanalyze(self, typed=False):
+        """Coroutine version of :meth:`analyze`."""
+
+        return self._ado_request(
+            extra_url=self.extra_url,
+            method='post',
+            typed=typed
         )
 
 
@@ -740,6 +895,15 @@ class SentimentAnalysis(BaseDandelionParamsRequest):
     https://dandelion.eu/docs/api/datatxt/sent/v1/
     """
 
+    result_model = SentimentResult
+    extra_url = ('datatxt', 'sent', 'v1')
+    merge_chunks = staticmethod(merge_sentiment)
+    schema = Schema(
+        _input_params(),
+        {'lang': Choice('en', 'it', 'auto')},
+        unique=[_input_keys()],
+    )
+
     def __init__(self, **params):
         """
         :param params:
@@ -763,18 +927,24 @@ class SentimentAnalysis(BaseDandelionParamsRequest):
                 | Accepted values: en | it | auto
         """
 
-        keys_allowed = [
-            'text', 'url', 'html', 'html_fragment',
-            'lang',
-        ]
-        keys_unique = [
-            ['text', 'url', 'html', 'html_fragment'],
-        ]
+        super(SentimentAnalysis, self).__init__(**params)
 
-        super(SentimentAnalysis, self).__init__(keys_allowed=keys_allowed, keys_unique=keys_unique, **params)
+    def analyze(self, typed=False):
+        """
+        :param typed: Whether to return a :class:`~.results.SentimentResult` instead of a dict.
+        """
 
-    def analyze(self):
         return self._do_request(
-            extra_url=('datatxt', 'sent', 'v1'),
-            method='post'
+            extra_url=self.extra_url,
+            method='post',
+            typed=typed
+        )
+
+    def aanalyze(self, typed=False):
+        """Coroutine version of :meth:`analyze`."""
+
+        return self._ado_request(
+            extra_url=self.extra_url,
+            method='post',
+            typed=typed
         )
@@ -0,0 +1,164 @@
+# -*- coding: utf-8
+
+from __future__ import unicode_literals
+
+import json
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+class AttributeDict(dict):
+    """
+    A dict whose keys can also be read and written as attributes.
+
+    Nested dicts and lists are wrapped on first access, and the wrapper is stored in place of the plain value, so
+    decoding a response does not allocate a wrapper for every JSON object of it, only for the ones actually read.
+    """
+
+    def __getitem__(self, key):
+        value = dict.__getitem__(self, key)
+        wrapper = _get_wrapper(value)
+        if wrapper is not None:
+            value = wrapper(value)
+            dict.__setitem__(self, key, value)
+        return value
+
+    def __getattr__(self, name):
+        # Same as __getitem__, inlined: attribute access is the hot path of most callers.
+        try:
+            value = dict.__getitem__(self, name)
+        except KeyError:
+            _raise_missing(name)
+        wrapper = _get_wrapper(value)
+        if wrapper is not None:
+            value = wrapper(value)
+            dict.__setitem__(self, name, value)
+        return value
+
+    def __setattr__(self, name, value):
+        self[name] = value
+
+    def __delattr__(self, name):
+        del self[name]
+
+    def get(self, key, default=None):
+        return self[key] if key in self else default
+
+    def pop(self, key, *default):
+        return _wrap(dict.pop(self, key, *default))
+
+    def values(self):
+        self._wrap_all()
+        return dict.values(self)
+
+    def items(self):
+        self._wrap_all()
+        return dict.items(self)
+
+    def _wrap_all(self):
+        # Replacing the value of an existing key does not invalidate the iteration.
+        for key in dict.keys(self):
+            self[key]
+
+
+class _DecodedDict(AttributeDict):
+    """
+    An :class:`AttributeDict` built by the ``object_hook`` of :func:`json.loads`: its nested dicts are decoded into
+    instances of it as well, so nothing is left to wrap and reading it skips the checks of the lazy wrapping.
+    """
+
+    __getitem__ = dict.__getitem__
+    get = dict.get
+    pop = dict.pop
+    values = dict.values
+    items = dict.items
+
+    def __getattr__(self, name):
+        try:
+            return dict.__getitem__(self, name)
+        except KeyError:
+            _raise_missing(name)
+
+
+def _raise_missing(name):
+    # A missing key raises KeyError, as item access does; but special names are not keys, and hasattr() and the
+    # lookups of pickle (__getstate__ before Python 3.11) or Django (__html__) only expect AttributeError.
+    if name.startswith('__'):
+        raise AttributeError(name)
+    raise KeyError(name)
+
+
+class AttributeList(list):
+    """A list wrapping its nested dicts and lists on first access, like :class:`AttributeDict`."""
+
+    def __getitem__(self, index):
+        value = list.__getitem__(self, index)
+        if isinstance(index, slice):
+            return AttributeList(value)
+
+        wrapper = _get_wrapper(value)
+        if wrapper is not None:
+            value = wrapper(value)
+            list.__setitem__(self, index, value)
+        return value
+
+    def __getslice__(self, i, j):
+        # Python 2 only: simple slices of list subclasses skip __getitem__.
+        return self[max(i, 0):max(j, 0):]
+
+    def __iter__(self):
+        self._wrap_all()
+        return list.__iter__(self)
+
+    def __reversed__(self):
+        self._wrap_all()
+        return list.__reversed__(self)
+
+    def pop(self, *index):
+        return _wrap(list.pop(self, *index))
+
+    def _wrap_all(self):
+        for i, value in enumerate(list.__iter__(self)):
+            wrapper = _get_wrapper(value)
+            if wrapper is not None:
+                list.__setitem__(self, i, wrapper(value))
+
+
+_CONTAINERS = frozenset([dict, list])
+
+
+def _get_wrapper(value):
+    cls = type(value)
+    if cls is dict:
+        return AttributeDict
+    # Lists of scalars, such as the types of an annotation, are left alone: there is nothing to wrap in them.
+    if cls is list and not _CONTAINERS.isdisjoint(map(type, value)):
+        return AttributeList
+    return None
+
+
+def _wrap(value):
+    wrapper = _get_wrapper(value)
+    return value if wrapper is None else wrapper(value)
+
+
+def loads(content):
+    """
+    Decode a JSON response body into an :class:`AttributeDict` (or a list).
+
+    When orjson is installed, the body is parsed into plain dicts and lists, and only the outer value is wrapped: the
+    nested ones are on first access. Otherwise the ``object_hook`` of :func:`json.loads` builds every dict as an
+    :class:`AttributeDict` while parsing, which is faster than wrapping them afterwards in Python.
+
+    :param content: The body, as bytes encoded in UTF-8.
+    """
+    if orjson is not None:
+        try:
+            return _wrap(orjson.loads(content))
+        except orjson.JSONDecodeError:
+            # orjson is stricter than the standard library, for instance about NaN and very large integers.
+            pass
+    return json.loads(content.decode('utf-8'), object_hook=_DecodedDict)
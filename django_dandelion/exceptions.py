@@ -14,3 +14,11 @@ class DandelionException(Exception):
 
 class DandelionSettingsException(Exception):
     """Raised when settings be bad."""
+
+
+class DandelionRateLimitException(DandelionException):
+    """Raised when a request would exceed the client-side rate limit and the caller chose not to wait."""
+
+
+class DandelionQueueFullException(DandelionException):
+    """Raised when a request is submitted to a full executor and the caller chose not to wait."""
@@ -0,0 +1,107 @@
+# -*- coding: utf-8
+
+from __future__ import unicode_literals
+
+import atexit
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from django.core.signals import setting_changed
+
+from .conf import dandelion_settings
+from .exceptions import DandelionQueueFullException
+
+_lock = threading.Lock()
+_executor = None
+_executor_pid = None
+
+
+class BoundedExecutor(object):
+    """
+    A thread pool accepting a bounded number of calls: ``max_workers`` running and ``max_queue`` waiting for a worker.
+
+    When it is full, :meth:`submit` either waits for a call to finish or raises :class:`DandelionQueueFullException`,
+    so a burst of calls cannot pile up in memory behind a slow API.
+    """
+
+    def __init__(self, max_workers, max_queue, block=True):
+        """
+        :param block: Whether submit() waits for room when the executor is full, instead of raising.
+        """
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self.block = block
+        self._executor = ThreadPoolExecutor(max_workers=max_workers)
+        self._slots = threading.BoundedSemaphore(max_workers + max_queue)
+
+    def submit(self, fn, *args, **kwargs):
+        """:return: A ``concurrent.futures.Future`` of ``fn(*args, **kwargs)``."""
+        if not self._slots.acquire(self.block):
+            raise DandelionQueueFullException(message='The executor is full: {} calls running and {} waiting'.format(
+                self.max_workers, self.max_queue))
+        try:
+            future = self._executor.submit(fn, *args, **kwargs)
+        except BaseException:
+            self._slots.release()
+            raise
+        future.add_done_callback(self._release)
+        return future
+
+    def _release(self, _):
+        self._slots.release()
+
+    def shutdown(self, wait=True):
+        """Stop accepting calls; with ``wait``, return once the calls already submitted are done."""
+        self._executor.shutdown(wait=wait)
+
+
+def get_executor():
+    """
+    Return the process-wide :class:`BoundedExecutor` of ``BaseDandelionParamsRequest.submit()``.
+
+    Like the HTTP session, it is created lazily and again in forked children, whose worker threads are gone.
+    """
+    global _executor, _executor_pid
+
+    pid = os.getpid()
+    if _executor is None or _executor_pid != pid:
+        with _lock:
+            if _executor is None or _executor_pid != pid:
+                _executor = BoundedExecutor(dandelion_settings.DANDELION_EXECUTOR_MAX_WORKERS,
+                                            dandelion_settings.DANDELION_EXECUTOR_MAX_QUEUE,
+                                            dandelion_settings.DANDELION_EXECUTOR_BLOCK)
+                _executor_pid = pid
+    return _executor
+
+
+def shutdown_executor(wait=True):
+    """Shut the shared executor down, if any; run at exit, so the calls submitted finish before the process does."""
+    global _executor, _executor_pid
+
+    with _lock:
+        if _executor is not None and _executor_pid == os.getpid():
+            _executor.shutdown(wait=wait)
+        _executor = None
+        _executor_pid = None
+
+
+def _after_fork_in_child():
+    global _lock, _executor, _executor_pid
+
+    _lock = threading.Lock()
+    _executor = None
+    _executor_pid = None
+
+
+def _reset_executor(setting, **kwargs):
+    # The calls already submitted finish on the previous executor.
+    if setting in ('DANDELION_EXECUTOR_MAX_WORKERS', 'DANDELION_EXECUTOR_MAX_QUEUE', 'DANDELION_EXECUTOR_BLOCK'):
+        shutdown_executor(wait=False)
+
+
+atexit.register(shutdown_executor)
+setting_changed.connect(_reset_executor, dispatch_uid='django_dandelion.executor')
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_after_fork_in_child)
@@ -0,0 +1,169 @@
+# -*- coding: utf-8
+
+from __future__ import unicode_literals
+
+import json
+import os
+import time
+
+import django
+import requests
+from django.apps import apps
+from django.core.exceptions import FieldDoesNotExist
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.db.models import Q
+
+from django_dandelion.conf import dandelion_settings
+from django_dandelion.datagraph import Wikisearch
+from django_dandelion.datatxt import EntityExtraction, SentimentAnalysis, TextClassification, LanguageDetection
+from django_dandelion.exceptions import DandelionException
+from django_dandelion.usage import usage
+
+ENDPOINTS = {
+    'nex': EntityExtraction,
+    'sent': SentimentAnalysis,
+    'cl': TextClassification,
+    'li': LanguageDetection,
+    'wikisearch': Wikisearch,
+}
+
+_now = getattr(time, 'monotonic', time.time)
+
+
+class Command(BaseCommand):
+    help = ('Analyze a text field of every row of a model and store the results in another field. The last primary '
+            'key written and the rows that failed are checkpointed to a file, so running the same command again '
+            'resumes where it stopped and retries them.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('model', help='The label of the model, such as "blog.Post".')
+        parser.add_argument('text_field', help='The field holding the text to analyze.')
+        parser.add_argument('result_field', help='The field to store the results in: a JSONField, or a text field '
+                                                 'that gets them as JSON.')
+        parser.add_argument('--endpoint', choices=sorted(ENDPOINTS), default='nex')
+        parser.add_argument('--param', action='append', default=[], metavar='KEY=VALUE',
+                            help='A param of the request, such as lang=en; can be repeated.')
+        parser.add_argument('--chunk-size', type=int, default=500,
+                            help='The number of rows read, analyzed and written at once.')
+        parser.add_argument('--workers', type=int, default=dandelion_settings.DANDELION_BATCH_MAX_WORKERS,
+                            help='The maximum number of concurrent requests.')
+        parser.add_argument('--checkpoint', help='The file storing the last primary key written and the rows that '
+                                                 'failed; by default .dandelion_annotate_<model>_<result field>.json')
+        parser.add_argument('--restart', action='store_true',
+                            help='Ignore the checkpoint and start from the first row.')
+
+    def handle(self, *args, **options):
+        try:
+            model = apps.get_model(options['model'])
+            text_field = model._meta.get_field(options['text_field'])
+            result_field = model._meta.get_field(options['result_field'])
+        except (LookupError, ValueError, FieldDoesNotExist) as e:
+            raise CommandError(e)
+        as_json = result_field.get_internal_type() != 'JSONField'
+
+        try:
+            request = ENDPOINTS[options['endpoint']](**self.parse_params(options['param']))
+        except DandelionException as e:
+            raise CommandError(e)
+        # Meta.label_lower only exists since Django 1.9.
+        checkpoint = options['checkpoint'] or '.dandelion_annotate_{}.{}_{}.json'.format(
+            model._meta.app_label, model._meta.model_name, result_field.name)
+        last_pk, failed = (None, []) if options['restart'] else self.read_checkpoint(checkpoint, model._meta.pk)
+
+        rows = model._default_manager.order_by('pk').only('pk', text_field.attname)
+        if last_pk is not None:
+            rows = rows.filter(Q(pk__gt=last_pk) | Q(pk__in=failed))
+            self.stdout.write('Resuming after primary key {}, and retrying {} rows that failed.'.format(
+                last_pk, len(failed)))
+
+        started = _now()
+        units = usage.units_spent
+        done = errors = 0
+        # chunk_size only exists since Django 2.0; before, the rows are fetched in chunks of 100.
+        rows = rows.iterator(chunk_size=options['chunk_size']) if django.VERSION >= (2, 0) else rows.iterator()
+        failed = set(failed)
+        for batch in self.iter_batches(rows, options['chunk_size']):
+            batch_failed = self.annotate(request, model, batch, text_field, result_field, as_json, options['workers'])
+            # The rows that failed before come first, and are behind the last primary key written.
+            if last_pk is None or batch[-1].pk > last_pk:
+                last_pk = batch[-1].pk
+            failed.difference_update(row.pk for row in batch)
+            failed.update(batch_failed)
+            errors += len(batch_failed)
+            done += len(batch)
+            self.write_checkpoint(checkpoint, last_pk, failed)
+            self.report(done, errors, started, units)
+        self.stdout.write('Done.')
+
+    @staticmethod
+    def iter_batches(rows, size):
+        batch = []
+        for row in rows:
+            batch.append(row)
+            if len(batch) == size:
+                yield batch
+                batch = []
+        if batch:
+            yield batch
+
+    @staticmethod
+    def parse_params(values):
+        params = {}
+        for value in values:
+            key, sep, value = value.partition('=')
+            if not sep:
+                raise CommandError('Params must be given as KEY=VALUE, not "{}"'.format(key))
+            params[key] = value
+        return params
+
+    def annotate(self, request, model, rows, text_field, result_field, as_json, workers):
+        """:return: The primary keys of the rows that could not be analyzed; they are left unchanged."""
+        rows = [row for row in rows if getattr(row, text_field.attname)]
+        results = list(request.analyze_many([getattr(row, text_field.attname) for row in rows], max_workers=workers))
+        annotated = []
+        failed = []
+        for row, result in zip(rows, results):
+            if isinstance(result, (DandelionException, requests.RequestException)):
+                failed.append(row.pk)
+                self.stderr.write('Row {}: {}'.format(row.pk, result))
+                continue
+            setattr(row, result_field.attname, json.dumps(result) if as_json else result)
+            annotated.append(row)
+
+        self.save(model, annotated, result_field)
+        return failed
+
+    @staticmethod
+    def save(model, rows, field):
+        if hasattr(model._default_manager, 'bulk_update'):
+            model._default_manager.bulk_update(rows, [field.name])
+            return
+        # Django < 2.2: one UPDATE per row, in a single transaction.
+        with transaction.atomic():
+            for row in rows:
+                row.save(update_fields=[field.name])
+
+    def report(self, done, errors, started, units):
+        elapsed = max(_now() - started, 1e-6)
+        self.stdout.write('{} rows ({} errors), {:.1f} rows/s, {:.1f} units/s'.format(
+            done, errors, done / elapsed, (usage.units_spent - units) / elapsed))
+
+    @staticmethod
+    def read_checkpoint(path, pk_field):
+        """:return: The last primary key written and the primary keys of the rows that failed, or None and []."""
+        try:
+            with open(path) as f:
+                checkpoint = json.load(f)
+            # Converted back from JSON, where a UUID for instance is a string, so they compare with the rows' keys.
+            return (pk_field.to_python(checkpoint['last_pk']),
+                    [pk_field.to_python(pk) for pk in checkpoint.get('failed', ())])
+        except (IOError, OSError, ValueError, KeyError, TypeError):
+            return None, []
+
+    @staticmethod
+    def write_checkpoint(path, last_pk, failed):
+        # Written aside and renamed, so a run killed while writing leaves the previous checkpoint intact.
+        with open(path + '.tmp', 'w') as f:
+            json.dump({'last_pk': last_pk, 'failed': sorted(failed)}, f, default=str)
+        getattr(os, 'replace', os.rename)(path + '.tmp', path)
@@ -0,0 +1,20 @@
+# -*- coding: utf-8
+
+from __future__ import unicode_literals
+
+from django.core.management.base import BaseCommand
+
+from django_dandelion.store import prune
+
+
+class Command(BaseCommand):
+    help = 'Delete the results of the database store older than DANDELION_DB_STORE_TIMEOUT seconds.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--max-age', type=int,
+                            help='Delete the results older than this, in seconds; default DANDELION_DB_STORE_TIMEOUT.')
+        parser.add_argument('--endpoint', help='Only delete the results of this endpoint, such as "datatxt/nex/v1".')
+
+    def handle(self, *args, **options):
+        deleted = prune(options['max_age'], options['endpoint'])
+        self.stdout.write('Deleted {} results from the database store.'.format(deleted))
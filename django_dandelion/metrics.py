@@ -0,0 +1,145 @@
+# -*- coding: utf-8
+
+from __future__ import unicode_literals
+
+import logging
+import time
+
+from django.core.signals import setting_changed
+from django.utils.module_loading import import_string
+
+from .conf import dandelion_settings
+from .signals import dandelion_request_started, dandelion_request_finished
+
+logger = logging.getLogger(__name__)
+
+_now = getattr(time, 'monotonic', time.time)
+
+
+class RequestTrace(object):
+    """What happened to one request, filled in as it goes through the cache tiers, the retries and the API."""
+
+    __slots__ = ('endpoint', 'method', 'started', 'cache_tier', 'retries', 'status_code', 'bytes_sent',
+                 'bytes_received')
+
+    def __init__(self, endpoint, method):
+        self.endpoint = endpoint
+        self.method = method
+        self.started = _now()
+        self.cache_tier = None
+        self.retries = 0
+        self.status_code = None
+        self.bytes_sent = 0
+        self.bytes_received = 0
+
+    @property
+    def latency(self):
+        return _now() - self.started
+
+    def record_attempt(self, attempt, status_code, bytes_sent, bytes_received):
+        self.retries = attempt - 1
+        self.status_code = status_code
+        self.bytes_sent += bytes_sent
+        self.bytes_received += bytes_received
+
+
+def request_started(sender, trace):
+    dandelion_request_started.send(sender=sender, endpoint=trace.endpoint, method=trace.method)
+
+
+def request_finished(sender, trace):
+    latency = trace.latency
+    threshold = dandelion_settings.DANDELION_SLOW_REQUEST_THRESHOLD
+    if threshold is not None and latency >= threshold:
+        logger.warning('Slow Dandelion request to %s: %.3fs (cache tier: %s, retries: %d, status: %s)',
+                       trace.endpoint, latency, trace.cache_tier, trace.retries, trace.status_code)
+
+    dandelion_request_finished.send(
+        sender=sender,
+        endpoint=trace.endpoint,
+        method=trace.method,
+        latency=latency,
+        bytes_sent=trace.bytes_sent,
+        bytes_received=trace.bytes_received,
+        cache_tier=trace.cache_tier,
+        retries=trace.retries,
+        status_code=trace.status_code
+    )
+
+
+class PrometheusMetrics(object):
+    """
+    Receiver of ``dandelion_request_finished`` recording latency histograms and counters with prometheus_client.
+    """
+
+    def __init__(self, registry=None, namespace='dandelion'):
+        from prometheus_client import REGISTRY, Counter, Histogram
+
+        registry = REGISTRY if registry is None else registry
+        labels = ['endpoint', 'cache_tier', 'status_code']
+        self.latency = Histogram('request_latency_seconds', 'Latency of the Dandelion requests', labels,
+                                 namespace=namespace, registry=registry)
+        self.retries = Counter('request_retries', 'Retries of the Dandelion requests', ['endpoint'],
+                               namespace=namespace, registry=registry)
+        self.bytes_sent = Counter('request_sent_bytes', 'Bytes sent to the Dandelion API', ['endpoint'],
+                                  namespace=namespace, registry=registry)
+        self.bytes_received = Counter('request_received_bytes', 'Bytes received from the Dandelion API', ['endpoint'],
+                                      namespace=namespace, registry=registry)
+
+    def __call__(self, sender, endpoint, latency, cache_tier, status_code, retries, bytes_sent, bytes_received,
+                 **kwargs):
+        self.latency.labels(endpoint, cache_tier or 'api', status_code or 'error').observe(latency)
+        self.retries.labels(endpoint).inc(retries)
+        self.bytes_sent.labels(endpoint).inc(bytes_sent)
+        self.bytes_received.labels(endpoint).inc(bytes_received)
+
+
+class StatsdMetrics(object):
+    """
+    Receiver of ``dandelion_request_finished`` sending timings and counters to a statsd client.
+    """
+
+    def __init__(self, client=None, prefix='dandelion'):
+        """
+        :param client: An object with the ``timing(name, milliseconds)`` and ``incr(name, count)`` methods of the
+            statsd clients; defaults to ``statsd.StatsClient()``.
+        """
+        if client is None:
+            from statsd import StatsClient
+            client = StatsClient()
+        self.client = client
+        self.prefix = prefix
+
+    def __call__(self, sender, endpoint, latency, cache_tier, status_code, retries, bytes_sent, bytes_received,
+                 **kwargs):
+        name = '{}.{}'.format(self.prefix, endpoint.replace('/', '.'))
+        self.client.timing(name + '.latency', latency * 1000)
+        self.client.incr('{}.{}'.format(name, cache_tier or 'api'))
+        if retries:
+            self.client.incr(name + '.retries', retries)
+        self.client.incr(name + '.bytes_sent', bytes_sent)
+        self.client.incr(name + '.bytes_received', bytes_received)
+
+
+def connect_backend():
+    """
+    Connect ``DANDELION_METRICS_BACKEND`` to ``dandelion_request_finished``: a dotted path to a receiver, or to a
+    class whose instances are receivers, such as :class:`PrometheusMetrics` or :class:`StatsdMetrics`.
+    """
+    if not dandelion_settings.DANDELION_METRICS_BACKEND:
+        return None
+
+    backend = import_string(dandelion_settings.DANDELION_METRICS_BACKEND)
+    if isinstance(backend, type):
+        backend = backend()
+    dandelion_request_finished.connect(backend, weak=False, dispatch_uid='dandelion_metrics_backend')
+    return backend
+
+
+def _reconnect_backend(setting, **kwargs):
+    if setting == 'DANDELION_METRICS_BACKEND':
+        dandelion_request_finished.disconnect(dispatch_uid='dandelion_metrics_backend')
+        connect_backend()
+
+
+setting_changed.connect(_reconnect_backend, dispatch_uid='django_dandelion.metrics')
@@ -0,0 +1,36 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+import django
+import django.utils.timezone
+from django.db import migrations, models
+
+if django.VERSION >= (5, 1):
+    options = {'indexes': [models.Index(fields=['endpoint', 'created'], name='dandelion_endpoint_created')]}
+else:
+    options = {'index_together': {('endpoint', 'created')}}
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='StoredResult',
+            fields=[
+                ('key', models.CharField(max_length=64, primary_key=True, serialize=False)),
+                ('endpoint', models.CharField(max_length=100)),
+                ('status_code', models.PositiveSmallIntegerField()),
+                ('encoding', models.PositiveSmallIntegerField()),
+                ('body', models.BinaryField()),
+                ('fresh_until', models.FloatField(null=True)),
+                ('units', models.FloatField(null=True)),
+                ('created', models.DateTimeField(db_index=True, default=django.utils.timezone.now)),
+            ],
+            options=options,
+        ),
+    ]
@@ -0,0 +1,40 @@
+# -*- coding: utf-8
+
+from __future__ import unicode_literals
+
+import django
+from django.db import models
+from django.utils import timezone
+
+
+class StoredResult(models.Model):
+    """
+    A response of the API kept in the database store (``DANDELION_DB_STORE``), in the same format as a cache entry.
+
+    Rows survive cache flushes and evictions; they are deleted by the ``dandelion_prune_store`` command.
+    """
+
+    key = models.CharField(max_length=64, primary_key=True)
+    endpoint = models.CharField(max_length=100)
+    status_code = models.PositiveSmallIntegerField()
+    encoding = models.PositiveSmallIntegerField()
+    body = models.BinaryField()
+    fresh_until = models.FloatField(null=True)
+    units = models.FloatField(null=True)
+    created = models.DateTimeField(default=timezone.now, db_index=True)
+
+    class Meta:
+        # For dandelion_prune_store. Meta.index_together was removed in Django 5.1; Meta.indexes needs Django 1.11.
+        if django.VERSION >= (5, 1):
+            indexes = [
+                models.Index(fields=['endpoint', 'created'], name='dandelion_endpoint_created'),
+            ]
+        else:
+            index_together = [('endpoint', 'created')]
+
+    def __str__(self):
+        return '{} {}'.format(self.endpoint, self.key)
+
+    def to_entry(self):
+        """:return: The cache entry of the row, as built by :func:`~django_dandelion.caching.dump_entry`."""
+        return self.status_code, self.encoding, bytes(self.body), self.fresh_until, self.units
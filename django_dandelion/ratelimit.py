@@ -0,0 +1,154 @@
+# -*- coding: utf-8
+
+from __future__ import unicode_literals
+
+import math
+import threading
+import time
+
+from django.core.cache import cache
+from django.core.signals import setting_changed
+
+from .conf import SETTING, SettingAttribute
+from .exceptions import DandelionRateLimitException, DandelionSettingsException
+
+_now = getattr(time, 'monotonic', time.time)
+
+
+class TokenBucket(object):
+    """
+    Thread-safe in-process token bucket. Tokens are reserved in advance, so concurrent callers queue up in order
+    instead of all waking up together.
+    """
+
+    def __init__(self, rate, burst=None):
+        """
+        :param rate: The number of requests per second.
+        :param burst: The maximum number of requests sent at once after an idle period; defaults to ``rate``.
+        """
+        self.rate = float(rate)
+        self.capacity = float(burst or max(rate, 1))
+        self._tokens = self.capacity
+        self._updated = _now()
+        self._lock = threading.Lock()
+
+    def reserve(self, max_wait=None):
+        """
+        Take a token.
+
+        :param max_wait: The maximum number of seconds the caller accepts to wait; None for no limit.
+        :return: The number of seconds to wait before sending the request, or None if that exceeds ``max_wait``, in
+            which case no token is taken.
+        """
+        with self._lock:
+            now = _now()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+
+            wait = 0 if self._tokens >= 1 else (1 - self._tokens) / self.rate
+            if max_wait is not None and wait > max_wait:
+                return None
+            self._tokens -= 1
+            return wait
+
+
+class CacheTokenBucket(object):
+    """
+    Token bucket shared by every process using the same Django cache, implemented as one atomic counter per window
+    of one second, or of ``ceil(1 / rate)`` seconds for rates below one request per second, such as daily quotas.
+    The cache backend must support atomic ``incr`` (memcached, Redis).
+    """
+
+    def __init__(self, name, rate):
+        """
+        :param name: The name of the bucket, used in the cache keys.
+        :param rate: The number of requests per second, across all processes.
+        :raise DandelionSettingsException: If ``rate`` is not positive.
+        """
+        if not rate > 0:
+            raise DandelionSettingsException('The rate limit of {} must be positive, not {!r}.'.format(name, rate))
+        self.name = name
+        self.rate = rate
+        self.window = max(1, int(math.ceil(1.0 / rate)))
+        self.capacity = max(1, int(round(rate * self.window)))
+
+    def reserve(self, max_wait=None):
+        # Windows are aligned on the wall clock, which is the only clock shared between processes.
+        now = time.time()
+        window = int(now // self.window) * self.window
+        while True:
+            wait = max(window - now, 0)
+            if max_wait is not None and wait > max_wait:
+                return None
+
+            key = 'dandelion_rate_{}_{}'.format(self.name, window)
+            cache.add(key, 0, 2 * self.window + int(wait))
+            if cache.incr(key) <= self.capacity:
+                return wait
+            window += self.window
+
+
+class RateLimiter(object):
+    """Paces outgoing requests, per endpoint, with the limits of ``DANDELION_RATE_LIMITS``."""
+
+    limits = SettingAttribute('DANDELION_RATE_LIMITS')
+    shared = SettingAttribute('DANDELION_RATE_LIMIT_SHARED')
+
+    def __init__(self, limits=None, shared=None):
+        """
+        :param limits: A dict mapping the path of an endpoint, such as "datatxt/nex/v1", to its maximum number of
+            requests per second; the "*" key applies to the endpoints not listed.
+        :param shared: Whether the limits apply to all processes together, through the Django cache, instead of to
+            each process.
+        """
+        self.limits = SETTING if limits is None else limits
+        self.shared = SETTING if shared is None else shared
+        self._buckets = {}
+        self._lock = threading.Lock()
+
+    def reserve(self, endpoint, max_wait=None):
+        """
+        :param endpoint: The path of the endpoint the request is sent to.
+        :param max_wait: The maximum number of seconds the caller accepts to wait; 0 to fail fast, None for no limit.
+        :return: The number of seconds to wait before sending the request.
+        :raise DandelionRateLimitException: If the request cannot be sent within ``max_wait``.
+        """
+        bucket = self._get_bucket(endpoint)
+        if bucket is None:
+            return 0
+
+        wait = bucket.reserve(max_wait)
+        if wait is None:
+            raise DandelionRateLimitException(message='Rate limit of {} exceeded'.format(endpoint))
+        return wait
+
+    def _get_bucket(self, endpoint):
+        name = endpoint if endpoint in self.limits else '*'
+        if name not in self.limits:
+            return None
+
+        with self._lock:
+            bucket = self._buckets.get(name)
+            if bucket is None:
+                if self.shared:
+                    bucket = CacheTokenBucket(name, self.limits[name])
+                else:
+                    bucket = TokenBucket(self.limits[name])
+                self._buckets[name] = bucket
+            return bucket
+
+    def reset(self):
+        """Forget the buckets, so they are built again with the current limits."""
+        with self._lock:
+            self._buckets.clear()
+
+
+rate_limiter = RateLimiter()
+
+
+def _reset_rate_limiter(setting, **kwargs):
+    if setting in ('DANDELION_RATE_LIMITS', 'DANDELION_RATE_LIMIT_SHARED'):
+        rate_limiter.reset()
+
+
+setting_changed.connect(_reset_rate_limiter, dispatch_uid='django_dandelion.ratelimit')
@@ -0,0 +1,238 @@
+# -*- coding: utf-8
+
+from __future__ import unicode_literals
+
+import sys
+
+from six import string_types
+
+from .decoding import AttributeDict
+
+try:
+    intern = sys.intern
+except AttributeError:
+    # The intern() of Python 2 only takes byte strings. The interned fields, such as types and categories, take their
+    # values from a small vocabulary, so the table stays small.
+    _interned = {}
+
+    def intern(value):
+        return _interned.setdefault(value, value)
+
+
+class ResultModel(object):
+    """
+    Base of the typed results: one slot per field of the JSON object, so an instance costs a fraction of a dict.
+
+    Fields missing from the response are None. Nested objects are typed too, lists of strings are stored as tuples of
+    interned strings (types and categories repeat across annotations), and the keys not described by the model are
+    kept in ``extra`` and still readable as attributes.
+    """
+
+    __slots__ = ('extra',)
+
+    #: The keys of the JSON object stored in slots.
+    fields = ()
+    #: Fields holding a nested object, mapped to its model; a list of nested objects maps to a one-item list.
+    nested = {}
+    #: Fields holding a string or a list of strings, stored interned.
+    interned = ()
+
+    def __init__(self, **kwargs):
+        for name in self.fields:
+            setattr(self, name, kwargs.pop(name, None))
+        self.extra = AttributeDict(kwargs) if kwargs else None
+
+    @classmethod
+    def from_dict(cls, data, memo=None):
+        """
+        :param data: A decoded JSON object, such as the result returned by ``analyze()``.
+        :param memo: A dict used to store equal strings once, shared by the nested objects; entities mentioned many
+            times in a text repeat their title, URI, abstract and so on.
+        """
+        if memo is None:
+            memo = {}
+        obj = cls.__new__(cls)
+        for name in cls.fields:
+            # dict.get skips the lazy wrapping of AttributeDict: the value is converted here anyway.
+            value = dict.get(data, name)
+            if value is not None:
+                if name in cls.nested:
+                    model = cls.nested[name]
+                    if isinstance(model, list):
+                        value = [model[0].from_dict(item, memo) for item in value]
+                    else:
+                        value = model.from_dict(value, memo)
+                elif name in cls.interned:
+                    if isinstance(value, string_types):
+                        value = intern(value)
+                    else:
+                        # Many annotations have the same types: equal tuples are stored once too.
+                        value = tuple(map(intern, value))
+                        value = memo.setdefault(value, value)
+                elif isinstance(value, string_types):
+                    value = memo.setdefault(value, value)
+            setattr(obj, name, value)
+
+        extra = [key for key in data if key not in cls.fields]
+        obj.extra = AttributeDict((key, dict.__getitem__(data, key)) for key in extra) if extra else None
+        return obj
+
+    def __getstate__(self):
+        # Python 2 only pickles the slots of the classes defining __getstate__.
+        return dict((name, getattr(self, name))
+                    for cls in type(self).__mro__ for name in cls.__dict__.get('__slots__', ()))
+
+    def __setstate__(self, state):
+        for name, value in state.items():
+            setattr(self, name, value)
+
+    def __getattr__(self, name):
+        # Only called for the names that are not slots.
+        if name != 'extra' and self.extra is not None and name in self.extra:
+            return self.extra[name]
+        raise AttributeError("'{}' object has no attribute '{}'".format(type(self).__name__, name))
+
+    def __getitem__(self, name):
+        try:
+            return getattr(self, name)
+        except AttributeError:
+            raise KeyError(name)
+
+    def to_dict(self):
+        """:return: The result as plain dicts and lists, without the fields missing from the response."""
+        data = {}
+        for name in self.fields:
+            value = getattr(self, name)
+            if isinstance(value, ResultModel):
+                value = value.to_dict()
+            elif isinstance(value, (list, tuple)):
+                value = [item.to_dict() if isinstance(item, ResultModel) else item for item in value]
+            if value is not None:
+                data[name] = value
+        if self.extra is not None:
+            data.update(self.extra)
+        return data
+
+    def __eq__(self, other):
+        return type(self) is type(other) and self.to_dict() == other.to_dict()
+
+    def __ne__(self, other):
+        return not self == other
+
+    __hash__ = None
+
+    def __repr__(self):
+        return '<{} {}>'.format(type(self).__name__, ', '.join(
+            '{}={!r}'.format(name, getattr(self, name)) for name in self.fields
+            if getattr(self, name) is not None and name not in self.nested))
+
+
+class Result(ResultModel):
+    """Base of the typed results of the endpoints, carrying the metadata of the request in ``meta``."""
+
+    __slots__ = ('meta',)
+
+    def __init__(self, **kwargs):
+        self.meta = None
+        super(Result, self).__init__(**kwargs)
+
+    @classmethod
+    def from_dict(cls, data, memo=None):
+        obj = super(Result, cls).from_dict(data, memo)
+        obj.meta = None
+        return obj
+
+
+class Lod(ResultModel):
+    __slots__ = ('wikipedia', 'dbpedia')
+    fields = __slots__
+
+
+class Image(ResultModel):
+    __slots__ = ('full', 'thumbnail')
+    fields = __slots__
+
+
+class Annotation(ResultModel):
+    """An entity found in the text by ``datatxt/nex``."""
+
+    __slots__ = ('id', 'title', 'uri', 'label', 'confidence', 'spot', 'start', 'end', 'types', 'categories',
+                 'abstract', 'image', 'lod', 'alternateLabels')
+    fields = __slots__
+    nested = {'image': Image, 'lod': Lod}
+    interned = ('types', 'categories')
+
+
+class TopEntity(ResultModel):
+    __slots__ = ('id', 'uri', 'score')
+    fields = __slots__
+
+
+class EntityExtractionResult(Result):
+    __slots__ = ('timestamp', 'time', 'lang', 'langConfidence', 'text', 'url', 'annotations', 'topEntities')
+    fields = __slots__
+    nested = {'annotations': [Annotation], 'topEntities': [TopEntity]}
+    interned = ('lang',)
+
+
+class TextSimilarityResult(Result):
+    __slots__ = ('timestamp', 'time', 'lang', 'langConfidence', 'similarity')
+    fields = __slots__
+    interned = ('lang',)
+
+
+class Category(ResultModel):
+    """A category assigned by ``datatxt/cl``."""
+
+    __slots__ = ('name', 'score')
+    fields = __slots__
+    interned = ('name',)
+
+
+class TextClassificationResult(Result):
+    __slots__ = ('timestamp', 'time', 'lang', 'categories')
+    fields = __slots__
+    nested = {'categories': [Category]}
+    interned = ('lang',)
+
+
+class DetectedLanguage(ResultModel):
+    __slots__ = ('lang', 'confidence')
+    fields = __slots__
+    interned = ('lang',)
+
+
+class LanguageDetectionResult(Result):
+    __slots__ = ('timestamp', 'time', 'detectedLangs')
+    fields = __slots__
+    nested = {'detectedLangs': [DetectedLanguage]}
+
+
+class Sentiment(ResultModel):
+    __slots__ = ('score', 'type')
+    fields = __slots__
+    interned = ('type',)
+
+
+class SentimentResult(Result):
+    __slots__ = ('timestamp', 'time', 'lang', 'sentiment')
+    fields = __slots__
+    nested = {'sentiment': Sentiment}
+    interned = ('lang',)
+
+
+class WikisearchHit(ResultModel):
+    """A Wikipedia page found by ``datagraph/wikisearch``."""
+
+    __slots__ = ('id', 'title', 'uri', 'label', 'weight', 'types', 'categories', 'abstract', 'image', 'lod',
+                 'alternateLabels')
+    fields = __slots__
+    nested = {'image': Image, 'lod': Lod}
+    interned = ('types', 'categories')
+
+
+class WikisearchResult(Result):
+    __slots__ = ('timestamp', 'time', 'lang', 'entities')
+    fields = __slots__
+    nested = {'entities': [WikisearchHit]}
+    interned = ('lang',)
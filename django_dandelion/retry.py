@@ -0,0 +1,125 @@
+# -*- coding: utf-8
+
+from __future__ import unicode_literals
+
+import email.utils
+import random
+import time
+
+from .conf import SETTING, SettingAttribute
+from .connection import is_transient
+
+_now = getattr(time, 'monotonic', time.time)
+
+
+class RetryPolicy(object):
+    """
+    How a request is retried after a network error, a throttling (429) or a server error (5xx): exponential backoff
+    with full jitter, ``Retry-After`` honoured up to ``max_backoff``, and every attempt and wait kept within a total
+    deadline.
+    Non-idempotent requests, such as the creation of user-defined spots, are never retried.
+    """
+
+    max_attempts = SettingAttribute('DANDELION_RETRY_MAX_ATTEMPTS')
+    backoff = SettingAttribute('DANDELION_RETRY_BACKOFF')
+    max_backoff = SettingAttribute('DANDELION_RETRY_MAX_BACKOFF')
+    deadline = SettingAttribute('DANDELION_RETRY_DEADLINE')
+    timeout = SettingAttribute('DANDELION_TIMEOUT')
+
+    def __init__(self, max_attempts=SETTING, backoff=SETTING, max_backoff=SETTING, deadline=SETTING, timeout=SETTING):
+        """
+        Each argument not given follows its setting, DANDELION_RETRY_* or DANDELION_TIMEOUT.
+
+        :param max_attempts: The maximum number of attempts, the first one included.
+        :param backoff: The base of the exponential backoff, in seconds.
+        :param max_backoff: The maximum wait between two attempts, in seconds; when ``Retry-After`` asks for more, the
+            request is not retried.
+        :param deadline: The maximum number of seconds spent on all the attempts and waits; None for no limit.
+        :param timeout: The timeout of each attempt, in seconds; it is shortened to the time left before the deadline.
+        """
+        self.max_attempts = max_attempts
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.deadline = deadline
+        self.timeout = timeout
+
+    def start(self):
+        """:return: A :class:`RetryState` tracking the attempts of one request."""
+        return RetryState(self)
+
+    def get_delay(self, attempt, retry_after=None):
+        """
+        :param attempt: The number of attempts already made.
+        :param retry_after: The value of the ``Retry-After`` header of the last response, if any.
+        :return: The number of seconds to wait before the next attempt, or None if ``Retry-After`` asks to wait longer
+            than ``max_backoff``: the request fails rather than holding its caller that long.
+        """
+        delay = parse_retry_after(retry_after)
+        if delay is None:
+            return random.uniform(0, min(self.max_backoff, self.backoff * 2 ** (attempt - 1)))
+        if delay > self.max_backoff:
+            return None
+        return delay
+
+
+class RetryState(object):
+    def __init__(self, policy):
+        self.policy = policy
+        self.attempts = 0
+        self.started = _now()
+
+    def next_timeout(self):
+        """Record a new attempt and return its timeout."""
+        self.attempts += 1
+        remaining = self.remaining()
+        if remaining is None:
+            return self.policy.timeout
+        if self.policy.timeout is None:
+            return remaining
+        return min(self.policy.timeout, remaining)
+
+    def remaining(self):
+        if self.policy.deadline is None:
+            return None
+        return max(self.policy.deadline - (_now() - self.started), 0)
+
+    def retry_delay(self, idempotent, status_code=None, retry_after=None):
+        """
+        :param idempotent: Whether the request can be sent again safely.
+        :param status_code: The status of the last response, or None after a network error.
+        :param retry_after: The value of the ``Retry-After`` header of the last response, if any.
+        :return: The number of seconds to wait before retrying, or None if the request must not be retried.
+        """
+        if not idempotent or self.attempts >= self.policy.max_attempts:
+            return None
+        if status_code is not None and not is_transient(status_code):
+            return None
+
+        delay = self.policy.get_delay(self.attempts, retry_after)
+        if delay is None:
+            return None
+        remaining = self.remaining()
+        if remaining is not None and delay >= remaining:
+            return None
+        return delay
+
+
+def parse_retry_after(value):
+    """
+    :param value: A ``Retry-After`` header, either a number of seconds or an HTTP date.
+    :return: The number of seconds to wait, or None if ``value`` is missing or invalid.
+    """
+    if not value:
+        return None
+    try:
+        return max(float(value), 0)
+    except ValueError:
+        pass
+
+    parsed = email.utils.parsedate_tz(value)
+    if parsed is None:
+        return None
+    return max(email.utils.mktime_tz(parsed) - time.time(), 0)
+
+
+default_retry_policy = RetryPolicy()
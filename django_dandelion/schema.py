@@ -0,0 +1,122 @@
+# -*- coding: utf-8
+
+from __future__ import unicode_literals
+
+import numbers
+
+from six import string_types
+
+from .exceptions import DandelionException
+
+# The languages of the Entity Extraction and Wikisearch APIs, and the extra information they can include.
+LANGUAGES = ('de', 'en', 'es', 'fr', 'it', 'pt')
+INCLUDE = ('types', 'categories', 'abstract', 'image', 'lod', 'alternate_labels')
+
+
+class Schema(object):
+    """
+    The params accepted by an endpoint, compiled once per class: a validator for each key, and for each key the keys
+    it replaces because only one of them can be sent, so checking a param is a couple of dict lookups.
+    """
+
+    def __init__(self, *params, **kwargs):
+        """
+        :param params: Dicts mapping each key to a validator, a callable raising ValueError when a value is invalid,
+            or to None to accept any value.
+        :param unique: A list of groups of keys that cannot be used together, such as text and url.
+        """
+        self.validators = {}
+        for group in params:
+            self.validators.update(group)
+        self.replaced = {}
+        for keys in kwargs.pop('unique', ()):
+            for key in keys:
+                self.replaced[key] = frozenset(keys).difference([key])
+
+    @classmethod
+    def from_keys(cls, keys_allowed, keys_unique):
+        """Build a schema checking the names of the keys only."""
+        return cls(dict.fromkeys(keys_allowed), unique=keys_unique)
+
+    def validate(self, key, value):
+        """
+        :raise DandelionException: If ``key`` is not accepted, or if ``value`` is not valid for it; in the latter case
+            with the code the API would have answered with.
+        """
+        try:
+            validator = self.validators[key]
+        except KeyError:
+            raise DandelionException(message='Key not allowed; you can use the following keys: {}'.format(
+                ', '.join(sorted(self.validators))))
+
+        if validator is not None and value is not None:
+            try:
+                validator(value)
+            except ValueError as e:
+                raise DandelionException(message='Invalid value for {}: {}'.format(key, e),
+                                         code='error.invalidParameter', data={'parameter': key})
+
+
+class String(object):
+    def __call__(self, value):
+        if not isinstance(value, string_types):
+            raise ValueError('a string is required, not {!r}'.format(value))
+
+
+class Boolean(object):
+    """True or False, or their names in any case, as they are sent in the query string."""
+
+    _NAMES = frozenset(['true', 'false'])
+
+    def __call__(self, value):
+        if not isinstance(value, bool) and not (isinstance(value, string_types) and value.lower() in self._NAMES):
+            raise ValueError('true or false is required, not {!r}'.format(value))
+
+
+class Number(object):
+    """A number, or a string holding one, between ``minimum`` and ``maximum`` included."""
+
+    def __init__(self, minimum=None, maximum=None, integer=False):
+        self.minimum = minimum
+        self.maximum = maximum
+        self.integer = integer
+
+    def __call__(self, value):
+        kind = 'an integer' if self.integer else 'a number'
+        if isinstance(value, bool):
+            raise ValueError('{} is required, not {!r}'.format(kind, value))
+        try:
+            number = float(value) if isinstance(value, string_types) else value
+            if not isinstance(number, numbers.Real):
+                raise TypeError
+        except (TypeError, ValueError):
+            raise ValueError('{} is required, not {!r}'.format(kind, value))
+        if self.integer and number != int(number):
+            raise ValueError('{} is required, not {!r}'.format(kind, value))
+
+        too_low = self.minimum is not None and number < self.minimum
+        if too_low or (self.maximum is not None and number > self.maximum):
+            raise ValueError('{!r} is out of the range {} .. {}'.format(
+                value, '-inf' if self.minimum is None else self.minimum,
+                '+inf' if self.maximum is None else self.maximum))
+
+
+class Choice(object):
+    def __init__(self, *choices):
+        self.choices = frozenset(choices)
+
+    def __call__(self, value):
+        if not isinstance(value, string_types) or value not in self.choices:
+            raise ValueError('{!r} is not one of {}'.format(value, ', '.join(sorted(self.choices))))
+
+
+class CommaList(Choice):
+    """A comma-separated list of choices, possibly empty."""
+
+    def __call__(self, value):
+        if not isinstance(value, string_types):
+            raise ValueError('a comma-separated list is required, not {!r}'.format(value))
+        for token in value.split(','):
+            token = token.strip()
+            if token and token not in self.choices:
+                raise ValueError('{!r} is not one of {}'.format(token, ', '.join(sorted(self.choices))))
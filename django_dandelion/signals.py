@@ -0,0 +1,13 @@
+# -*- coding: utf-8
+
+from __future__ import unicode_literals
+
+from django.dispatch import Signal
+
+# Sent before a request is looked up in the cache or sent to the API.
+# Arguments: endpoint, method.
+dandelion_request_started = Signal()
+
+# Sent once the result of a request is known, whether it came from the cache or from the API, and even if it failed.
+# Arguments: endpoint, method, latency, bytes_sent, bytes_received, cache_tier, retries, status_code.
+dandelion_request_finished = Signal()
@@ -0,0 +1,139 @@
+# -*- coding: utf-8
+
+from __future__ import unicode_literals
+
+import contextlib
+import datetime
+import logging
+import threading
+
+import django
+from django.db import DatabaseError, transaction
+from django.utils import timezone
+
+from .conf import SETTING, SettingAttribute, dandelion_settings
+
+logger = logging.getLogger(__name__)
+
+_local = threading.local()
+
+
+def get_entries(keys):
+    """
+    Look cache keys up in the database store, with a single query.
+
+    :return: A dict mapping the keys found to their cache entries.
+    """
+    # Imported here: this module is imported by the request classes, possibly before the apps are loaded.
+    from .models import StoredResult
+
+    keys = list(keys)
+    if not keys:
+        return {}
+    try:
+        return {row.key: row.to_entry() for row in StoredResult.objects.filter(key__in=keys)}
+    except DatabaseError:
+        logger.warning('Failed to read %d entries from the database store', len(keys), exc_info=True)
+        return {}
+
+
+def get_entry(key):
+    """:return: The cache entry stored in the database store at ``key``, or None."""
+    return get_entries([key]).get(key)
+
+
+def save_entries(items):
+    """
+    Store cache entries in the database store with ``bulk_create``, replacing the rows of the same keys. Only the
+    successful responses are stored: errors are cached for a short time only.
+
+    :param items: An iterable of ``(key, endpoint, entry)`` tuples.
+    """
+    from .models import StoredResult
+
+    rows = {}
+    for key, endpoint, (status_code, encoding, body, fresh_until, units) in items:
+        if 200 <= status_code < 400:
+            rows[key] = StoredResult(key=key, endpoint=endpoint, status_code=status_code, encoding=encoding,
+                                     body=body, fresh_until=fresh_until, units=units)
+    if not rows:
+        return
+    try:
+        with transaction.atomic():
+            StoredResult.objects.filter(key__in=list(rows)).delete()
+            StoredResult.objects.bulk_create(rows.values(),
+                                             batch_size=dandelion_settings.DANDELION_DB_STORE_BATCH_SIZE)
+    except DatabaseError:
+        # Another process may have stored the same key meanwhile.
+        logger.warning('Failed to write %d entries to the database store', len(rows), exc_info=True)
+
+
+def save_entry(key, endpoint, entry):
+    """Store a cache entry in the database store, at once or with the batch of the :class:`WriteBuffer` in use."""
+    buffer = getattr(_local, 'buffer', None)
+    if buffer is not None:
+        buffer.add(key, endpoint, entry)
+    else:
+        save_entries([(key, endpoint, entry)])
+
+
+def prune(max_age=None, endpoint=None):
+    """
+    Delete the rows of the database store older than ``max_age`` seconds; by default DANDELION_DB_STORE_TIMEOUT.
+
+    :param endpoint: Only delete the rows of this endpoint, such as "datatxt/nex/v1".
+    :return: The number of rows deleted.
+    """
+    from .models import StoredResult
+
+    if max_age is None:
+        max_age = dandelion_settings.DANDELION_DB_STORE_TIMEOUT
+    rows = StoredResult.objects.filter(created__lt=timezone.now() - datetime.timedelta(seconds=max_age))
+    if endpoint is not None:
+        rows = rows.filter(endpoint=endpoint)
+    if django.VERSION < (1, 9):
+        # QuerySet.delete() returns the number of rows deleted since Django 1.9.
+        count = rows.count()
+        rows.delete()
+        return count
+    return rows.delete()[0]
+
+
+class WriteBuffer(object):
+    """
+    Collects the entries written by many requests, such as the ones of a batch, to store them with a few
+    ``bulk_create`` instead of one insert each.
+    """
+
+    size = SettingAttribute('DANDELION_DB_STORE_BATCH_SIZE')
+
+    def __init__(self, size=SETTING):
+        """
+        :param size: The number of entries that triggers a write; by default DANDELION_DB_STORE_BATCH_SIZE.
+        """
+        self.size = size
+        self._items = []
+        self._lock = threading.Lock()
+
+    def add(self, key, endpoint, entry):
+        with self._lock:
+            self._items.append((key, endpoint, entry))
+            if len(self._items) < self.size:
+                return
+            items, self._items = self._items, []
+        save_entries(items)
+
+    def flush(self):
+        with self._lock:
+            items, self._items = self._items, []
+        save_entries(items)
+
+    @contextlib.contextmanager
+    def use(self):
+        """Send the writes of the calling thread to this buffer, until the end of the block."""
+        previous = getattr(_local, 'buffer', None)
+        _local.buffer = self
+        try:
+            yield self
+        finally:
+            _local.buffer = previous
@@ -0,0 +1,291 @@
+# -*- coding: utf-8
+
+from __future__ import unicode_literals
+
+import hashlib
+import io
+import json
+import os
+import threading
+
+from django.core.signals import setting_changed
+from django.utils.module_loading import import_string
+from six import binary_type, string_types, text_type
+from six.moves.urllib.parse import urlencode, urlsplit
+
+from . import __version__
+from .conf import dandelion_settings
+from .connection import get_session
+from .exceptions import DandelionException
+
+_lock = threading.Lock()
+_transport = None
+
+
+class Response(object):
+    """What a transport returns for a request sent to the API."""
+
+    __slots__ = ('status_code', 'headers', 'content', 'bytes_sent')
+
+    def __init__(self, status_code, headers, content, bytes_sent=0):
+        """
+        :param status_code: The HTTP status of the response.
+        :param headers: A case-insensitive mapping of the response headers.
+        :param content: The body of the response, as bytes.
+        :param bytes_sent: The size of the body of the request.
+        """
+        self.status_code = status_code
+        self.headers = headers
+        self.content = content
+        self.bytes_sent = bytes_sent
+
+
+class BaseTransport(object):
+    """
+    Sends the requests to the API. Network failures must be raised as ``requests.ConnectionError`` or
+    ``requests.Timeout``, the errors that are retried.
+    """
+
+    def send(self, method, url, params, timeout=None):
+        """
+        :param method: The lowercase HTTP method: "get", "post", "put" or "delete".
+        :param url: The URL of the endpoint.
+        :param params: The params of the request, form-encoded in the body for "post" and "put", in the query string
+            otherwise.
+        :param timeout: The timeout of the request, in seconds; None for no limit.
+        :rtype: Response
+        """
+        raise NotImplementedError
+
+
+class RequestsTransport(BaseTransport):
+    """The default transport, using the process-wide ``requests.Session`` of :func:`connection.get_session`."""
+
+    def send(self, method, url, params, timeout=None):
+        kwargs = {
+            'data' if method in ('post', 'put') else 'params': params,
+            'url': url,
+        }
+        response = getattr(get_session(), method)(timeout=timeout, **kwargs)
+
+        # Responses built without a session, as in tests, have no prepared request attached.
+        body = response.request.body if response.request is not None else None
+        return Response(response.status_code, response.headers, response.content, len(body) if body else 0)
+
+
+class Urllib3Transport(BaseTransport):
+    """
+    A transport calling urllib3 directly, skipping the per-call overhead of ``requests`` (hooks, cookies, adapters).
+    The pool is rebuilt in forked children, like the session of the default transport.
+    """
+
+    def __init__(self, num_pools=None, maxsize=None, block=None):
+        """
+        :param num_pools: The number of hosts with a pool; by default DANDELION_POOL_CONNECTIONS.
+        :param maxsize: The number of connections kept per host; by default DANDELION_POOL_MAXSIZE.
+        :param block: Whether to wait for a free connection; by default DANDELION_POOL_BLOCK.
+        """
+        import urllib3
+
+        self._urllib3 = urllib3
+        self._options = {
+            'num_pools': dandelion_settings.DANDELION_POOL_CONNECTIONS if num_pools is None else num_pools,
+            'maxsize': dandelion_settings.DANDELION_POOL_MAXSIZE if maxsize is None else maxsize,
+            'block': dandelion_settings.DANDELION_POOL_BLOCK if block is None else block,
+        }
+        self._headers = {'User-Agent': 'django-dandelion/' + __version__}
+        if not dandelion_settings.DANDELION_KEEP_ALIVE:
+            self._headers['Connection'] = 'close'
+        self._lock = threading.Lock()
+        self._pool = None
+        self._pool_pid = None
+
+    def send(self, method, url, params, timeout=None):
+        urllib3 = self._urllib3
+        kwargs = {
+            'headers': dict(self._headers),
+            'retries': False,
+            'timeout': urllib3.Timeout(total=timeout) if timeout is not None else urllib3.Timeout.DEFAULT_TIMEOUT,
+        }
+        body = None
+        params = _encode_params(params)
+        if method in ('post', 'put'):
+            body = params.encode('utf-8')
+            kwargs['body'] = body
+            kwargs['headers']['Content-Type'] = 'application/x-www-form-urlencoded'
+        elif params:
+            url += ('&' if '?' in url else '?') + params
+
+        try:
+            response = self._get_pool().urlopen(method.upper(), url, **kwargs)
+        except urllib3.exceptions.HTTPError as e:
+            import requests
+
+            if isinstance(e, urllib3.exceptions.TimeoutError) and \
+                    not isinstance(e, urllib3.exceptions.NewConnectionError):
+                raise requests.Timeout(e)
+            # NewConnectionError is a subclass of ConnectTimeoutError, although the connection was refused.
+            raise requests.ConnectionError(e)
+        return Response(response.status, response.headers, response.data, len(body) if body else 0)
+
+    def _get_pool(self):
+        pid = os.getpid()
+        if self._pool is None or self._pool_pid != pid:
+            with self._lock:
+                if self._pool is None or self._pool_pid != pid:
+                    self._pool = self._urllib3.PoolManager(**self._options)
+                    self._pool_pid = pid
+        return self._pool
+
+
+def _encode_params(params):
+    # Encoded as requests does: None values are left out, a list repeats its key for each item, and text is UTF-8,
+    # which urlencode() of Python 2 would replace with "?" when not ASCII.
+    pairs = []
+    for key, value in params.items():
+        if value is None:
+            continue
+        for item in value if isinstance(value, (list, tuple)) else [value]:
+            pairs.append((key, item.encode('utf-8') if isinstance(item, text_type) else item))
+    return urlencode(pairs)
+
+
+class InMemoryTransport(BaseTransport):
+    """
+    A transport answering from callables instead of the network, to exercise the whole client in tests and load tests
+    without latency or quota.
+    """
+
+    def __init__(self, routes=None, default=None):
+        """
+        :param routes: A dict mapping the path of an endpoint, such as "datatxt/nex/v1", to a callable (or its dotted
+            path) called with the method and the params of the request. It returns a :class:`Response`, a
+            ``(status_code, payload)`` tuple or just a payload for a 200 response; payloads are bytes, text, or
+            anything else serializable as JSON.
+        :param default: The callable used for the endpoints not in ``routes``; they get a 404 error without one.
+        """
+        self.routes = {}
+        for endpoint, handler in (routes or {}).items():
+            self.routes[endpoint] = import_string(handler) if isinstance(handler, string_types) else handler
+        self.default = import_string(default) if isinstance(default, string_types) else default
+        self.requests = []
+
+    def send(self, method, url, params, timeout=None):
+        endpoint = urlsplit(url).path.strip('/')
+        params = {k: v for k, v in params.items() if k != 'token'}
+        self.requests.append((method, endpoint, params))
+
+        handler = self.routes.get(endpoint, self.default)
+        if handler is None:
+            return _make_response(404, {'error': True, 'code': 'error.notFound', 'message': 'No route for ' + endpoint,
+                                        'data': {}})
+
+        result = handler(method, params)
+        if isinstance(result, Response):
+            return result
+        if isinstance(result, tuple):
+            return _make_response(*result)
+        return _make_response(200, result)
+
+
+class ReplayTransport(BaseTransport):
+    """
+    A transport replaying responses stored on disk, one JSON file per distinct request, and recording them through
+    another transport. The token is never stored.
+    """
+
+    RECORD = 'record'
+    REPLAY = 'replay'
+    AUTO = 'auto'
+
+    def __init__(self, path, mode=REPLAY, transport=None):
+        """
+        :param path: The directory of the recorded responses.
+        :param mode: "replay" to only replay, failing on requests not recorded; "record" to always send the requests
+            and record the responses; "auto" to record only the requests not recorded yet.
+        :param transport: The transport recording the responses, or its dotted path; defaults to
+            :class:`RequestsTransport`.
+        """
+        if mode not in (self.RECORD, self.REPLAY, self.AUTO):
+            raise ValueError('Unknown replay mode: {}'.format(mode))
+        if isinstance(transport, string_types):
+            transport = import_string(transport)()
+        self.path = path
+        self.mode = mode
+        self.transport = transport or RequestsTransport()
+
+    def send(self, method, url, params, timeout=None):
+        endpoint = urlsplit(url).path.strip('/')
+        recorded = {k: v for k, v in params.items() if k != 'token'}
+        filename = os.path.join(self.path, self._get_name(method, endpoint, recorded))
+
+        if self.mode != self.RECORD and os.path.exists(filename):
+            from requests.structures import CaseInsensitiveDict
+
+            with io.open(filename, encoding='utf-8') as f:
+                data = json.load(f)
+            return Response(data['status_code'], CaseInsensitiveDict(data['headers']),
+                            data['content'].encode('utf-8'))
+
+        if self.mode == self.REPLAY:
+            raise DandelionException(message='No recorded response for {} {} in {}'.format(
+                method.upper(), endpoint, filename), code='error.notRecorded')
+
+        response = self.transport.send(method, url, params, timeout)
+        if not os.path.isdir(self.path):
+            os.makedirs(self.path)
+        with io.open(filename, 'w', encoding='utf-8') as f:
+            f.write(text_type(json.dumps({
+                'method': method,
+                'endpoint': endpoint,
+                'params': recorded,
+                'status_code': response.status_code,
+                'headers': dict(response.headers),
+                'content': response.content.decode('utf-8'),
+            }, indent=2, sort_keys=True)))
+        return response
+
+    @staticmethod
+    def _get_name(method, endpoint, params):
+        digest = hashlib.sha1(json.dumps([method, endpoint, params], sort_keys=True).encode('utf-8')).hexdigest()
+        return '{}_{}.json'.format(endpoint.replace('/', '_'), digest[:16])
+
+
+def _make_response(status_code, payload):
+    from requests.structures import CaseInsensitiveDict
+
+    if isinstance(payload, text_type):
+        content = payload.encode('utf-8')
+    elif isinstance(payload, binary_type):
+        content = payload
+    else:
+        content = json.dumps(payload).encode('utf-8')
+    return Response(status_code, CaseInsensitiveDict({'Content-Type': 'application/json'}), content)
+
+
+def get_transport():
+    """
+    Return the transport of ``DANDELION_TRANSPORT``, built on first use: the dotted path of a transport class,
+    instantiated with the keyword arguments of ``DANDELION_TRANSPORT_OPTIONS``, or of a transport instance.
+    """
+    global _transport
+
+    if _transport is None:
+        with _lock:
+            if _transport is None:
+                transport = import_string(dandelion_settings.DANDELION_TRANSPORT)
+                if isinstance(transport, type):
+                    transport = transport(**dandelion_settings.DANDELION_TRANSPORT_OPTIONS)
+                _transport = transport
+    return _transport
+
+
+def _reset_transport(setting, **kwargs):
+    global _transport
+
+    if setting in ('DANDELION_TRANSPORT', 'DANDELION_TRANSPORT_OPTIONS'):
+        with _lock:
+            _transport = None
+
+
+setting_changed.connect(_reset_transport, dispatch_uid='django_dandelion.transport')
@@ -0,0 +1,86 @@
+# -*- coding: utf-8
+
+from __future__ import unicode_literals
+
+import collections
+import threading
+
+UNITS_HEADER = 'X-DL-units'
+UNITS_LEFT_HEADER = 'X-DL-units-left'
+
+
+def get_units(headers, name=UNITS_HEADER):
+    """:return: The number of units read from the header ``name`` of a response, or None if missing or invalid."""
+    try:
+        return float(headers[name])
+    except (KeyError, TypeError, ValueError):
+        return None
+
+
+class ResultMeta(object):
+    """Metadata of a request, attached to its result as ``result.meta``."""
+
+    __slots__ = ('endpoint', 'elapsed', 'cache_hit', 'units', 'units_left')
+
+    def __init__(self, endpoint, elapsed, cache_hit, units, units_left):
+        """
+        :param endpoint: The path of the endpoint, such as "datatxt/nex/v1".
+        :param elapsed: The number of seconds spent to get the result.
+        :param cache_hit: Whether the result was read from the cache.
+        :param units: The units the request cost, or would have cost if it was read from the cache.
+        :param units_left: The units left in the account, as of the response of the request or, for a result read
+            from the cache, of the last response of the API.
+        """
+        self.endpoint = endpoint
+        self.elapsed = elapsed
+        self.cache_hit = cache_hit
+        self.units = units
+        self.units_left = units_left
+
+    def __repr__(self):
+        return '<ResultMeta {}: {:.3f}s, cache_hit={}, units={}, units_left={}>'.format(
+            self.endpoint, self.elapsed, self.cache_hit, self.units, self.units_left)
+
+
+class Usage(object):
+    """Process-wide counters of the calls sent to the API, of the units they cost and of the units the cache saved."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.units_spent = 0.0
+            self.units_saved = 0.0
+            self.units_left = None
+            self.calls = collections.Counter()
+            self.cache_hits = collections.Counter()
+
+    def record_call(self, endpoint, units, units_left):
+        with self._lock:
+            self.calls[endpoint] += 1
+            if units is not None:
+                self.units_spent += units
+            if units_left is not None:
+                self.units_left = units_left
+
+    def record_cache_hit(self, endpoint, units):
+        with self._lock:
+            self.cache_hits[endpoint] += 1
+            if units is not None:
+                self.units_saved += units
+
+    def snapshot(self):
+        """:return: A dict with a copy of the counters."""
+        with self._lock:
+            return {
+                'units_spent': self.units_spent,
+                'units_saved': self.units_saved,
+                'units_left': self.units_left,
+                'calls': dict(self.calls),
+                'cache_hits': dict(self.cache_hits),
+            }
+
+
+usage = Usage()
@@ -0,0 +1,100 @@
+#!/usr/bin/env python
+# -*- coding: utf-8
+
+from __future__ import unicode_literals, absolute_import
+
+import argparse
+import json
+import platform
+import sys
+
+import django
+from django.conf import settings
+
+import django_dandelion
+from benchmarks.server import FakeDandelionServer
+
+BENCHMARKS = ('sync', 'cache_hit', 'batch', 'async', 'decode', 'memory')
+
+
+def parse_args(args):
+    parser = argparse.ArgumentParser(description='Benchmark django-dandelion against a local fake Dandelion API.')
+    parser.add_argument('--requests', type=int, default=200, help='requests per benchmark (default 200)')
+    parser.add_argument('--latency', type=float, default=0, help='server latency in seconds (default 0)')
+    parser.add_argument('--payload-size', type=int, default=10,
+                        help='annotations, categories or entities per response (default 10)')
+    parser.add_argument('--workers', type=int, default=8, help='batch workers and async concurrency (default 8)')
+    parser.add_argument('--transport', default='django_dandelion.transport.RequestsTransport',
+                        help='dotted path of the transport of the sync requests (default RequestsTransport)')
+    parser.add_argument('--output', help='file to write the JSON results to (default stdout)')
+    parser.add_argument('benchmarks', nargs='*', metavar='benchmark',
+                        help='benchmarks to run: {} (default all)'.format(', '.join(BENCHMARKS)))
+    options = parser.parse_args(args)
+    for name in options.benchmarks:
+        if name not in BENCHMARKS:
+            parser.error('unknown benchmark: {}'.format(name))
+    return options
+
+
+def run_benchmarks(options, url):
+    from benchmarks import suite
+
+    count = options.requests
+    names = options.benchmarks or BENCHMARKS
+    results = {}
+    for name in names:
+        if name == 'sync':
+            results[name] = suite.bench_sync(count)
+        elif name == 'cache_hit':
+            results[name] = suite.bench_cache_hit(count)
+        elif name == 'batch':
+            results[name] = suite.bench_batch(count, options.workers)
+        elif name == 'async':
+            results[name] = suite.bench_async(count, options.workers)
+        elif name == 'decode':
+            results[name] = suite.bench_decode(url, count)
+        elif name == 'memory':
+            results[name] = suite.bench_memory(url, count)
+
+    return {
+        'version': django_dandelion.__version__,
+        'python': platform.python_version(),
+        'django': django.get_version(),
+        'options': {
+            'requests': count,
+            'latency': options.latency,
+            'payload_size': options.payload_size,
+            'workers': options.workers,
+            'transport': options.transport,
+        },
+        'results': results,
+    }
+
+
+def main(args):
+    options = parse_args(args)
+    with FakeDandelionServer(latency=options.latency, payload_size=options.payload_size) as server:
+        settings.configure(
+            INSTALLED_APPS=['django_dandelion'],
+            CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}},
+            DANDELION_HOST=server.url,
+            DANDELION_TOKEN='benchmark',
+            DANDELION_USE_CACHE=True,
+            DANDELION_POOL_MAXSIZE=options.workers,
+            DANDELION_BATCH_MAX_WORKERS=options.workers,
+            DANDELION_RETRY_MAX_ATTEMPTS=1,
+            DANDELION_TRANSPORT=options.transport,
+        )
+        django.setup()
+        report = run_benchmarks(options, server.url)
+
+    output = json.dumps(report, indent=2, sort_keys=True)
+    if options.output:
+        with open(options.output, 'w') as f:
+            f.write(output + '\n')
+    else:
+        print(output)
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
@@ -55,13 +55,21 @@ setup(
     url='https://github.com/AlessioBazzanella/django-dandelion',
     packages=[
         'django_dandelion',
+        'django_dandelion.management',
+        'django_dandelion.management.commands',
+        'django_dandelion.migrations',
     ],
     include_package_data=True,
     install_requires=[
         'Django>=1.8',
         'six>=1.10.0',
-        'requests>=2.13.0'
+        'requests>=2.13.0',
+        'futures>=3.0; python_version < "3"',
     ],
+    extras_require={
+        'async': ['httpx>=0.23'],
+        'fast': ['orjson>=3'],
+    },
     license="MIT",
     zip_safe=False,
     keywords=[
@@ -76,6 +84,7 @@ setup(
         'Framework :: Django :: 1.8',
         'Framework :: Django :: 1.9',
         'Framework :: Django :: 1.10',
+        'Framework :: Django :: 1.11',
         'Intended Audience :: Developers',
         'License :: OSI Approved :: BSD License',
         'Natural Language :: English',
@@ -85,5 +94,7 @@ setup(
         'Programming Language :: Python :: 3.3',
         'Programming Language :: Python :: 3.4',
         'Programming Language :: Python :: 3.5',
+        'Programming Language :: Python :: 3.6',
+        'Programming Language :: Python :: 3.7',
     ],
 )
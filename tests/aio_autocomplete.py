@@ -0,0 +1,65 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""The coroutine tests of test_autocomplete, which need Python 3.7."""
+
+from __future__ import unicode_literals
+
+import asyncio
+from unittest import mock
+
+from django.test import TestCase
+
+from django_dandelion.autocomplete import Autocomplete, PrefixIndex
+from django_dandelion.datagraph import Wikisearch
+from django_dandelion.results import WikisearchResult
+
+from .test_autocomplete import wikisearch
+
+
+class TestAsyncAutocomplete(TestCase):
+    def setUp(self):
+        self.calls = []
+        self.field = Autocomplete(lang='en', limit=5, debounce=0.01, index=PrefixIndex())
+
+    def run_with_fake(self, coroutine_factory, delay=0):
+        calls = self.calls
+
+        async def aanalyze(request, typed=False):
+            calls.append(request.params['text'])
+            await asyncio.sleep(delay)
+            return WikisearchResult.from_dict(wikisearch('post', request.params))
+
+        async def main():
+            with mock.patch.object(Wikisearch, 'aanalyze', aanalyze):
+                return await coroutine_factory()
+
+        return asyncio.run(main())
+
+    def test_acomplete(self):
+        hits = self.run_with_fake(lambda: self.field.acomplete('Big B'))
+        self.assertEqual([hit.title for hit in hits], ['Big Ben', 'Big Bang', 'Big Brother'])
+        hits = self.run_with_fake(lambda: self.field.acomplete('big be'))
+        self.assertEqual([hit.title for hit in hits], ['Big Ben'])
+        self.assertEqual(self.calls, ['Big B'])
+
+    def test_debounce(self):
+        async def typing():
+            return await asyncio.gather(*[self.field.acomplete(text) for text in ('b', 'bi', 'big')])
+
+        self.assertEqual([hits and len(hits) for hits in self.run_with_fake(typing)], [None, None, 5])
+        self.assertEqual(self.calls, ['big'])
+
+    def test_cancel_in_flight(self):
+        async def typing():
+            first = asyncio.ensure_future(self.field.acomplete('big'))
+            await asyncio.sleep(0.05)
+            self.assertIsNotNone(self.field._in_flight)
+            in_flight = self.field._in_flight
+            second = await self.field.acomplete('big s')
+            self.assertTrue(in_flight.cancelled())
+            return await first, second
+
+        first, second = self.run_with_fake(typing, delay=0.2)
+        self.assertIsNone(first)
+        self.assertEqual([hit.title for hit in second], ['Big Sur'])
+        self.assertEqual(self.calls, ['big', 'big s'])
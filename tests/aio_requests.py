@@ -0,0 +1,131 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""The coroutine tests of test_aio, which need Python 3.7."""
+
+from __future__ import unicode_literals
+
+import asyncio
+import json
+import unittest
+from unittest import mock
+
+try:
+    import httpx
+except ImportError:
+    httpx = None
+
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+
+from django_dandelion.caching import dump_entry, local_cache
+from django_dandelion.datatxt import EntityExtraction, SentimentAnalysis
+from django_dandelion.exceptions import DandelionException
+from django_dandelion.results import EntityExtractionResult
+
+
+def fake_client(handler):
+    return httpx.AsyncClient(transport=httpx.MockTransport(handler))
+
+
+@unittest.skipIf(httpx is None, 'httpx is not installed')
+class TestAsync(TestCase):
+    def setUp(self):
+        cache.clear()
+        local_cache.clear()
+        self.calls = []
+
+    def handler(self, request):
+        self.calls.append(request)
+        if request.url.path.endswith('/sent/v1'):
+            return httpx.Response(400, json={'code': 'error.invalidParameter', 'message': 'lang', 'data': {}})
+        return httpx.Response(200, json={'annotations': [{'uri': 'http://en.wikipedia.org/wiki/Apple_Inc.'}]})
+
+    def run_with_client(self, coroutine_factory):
+        async def main():
+            with mock.patch('django_dandelion.aio.get_async_client', return_value=fake_client(self.handler)):
+                return await coroutine_factory()
+
+        return asyncio.run(main())
+
+    def test_aanalyze(self):
+        results = self.run_with_client(lambda: EntityExtraction(text='They say Apple is better').aanalyze())
+        self.assertEqual(results.annotations[0].uri, 'http://en.wikipedia.org/wiki/Apple_Inc.')
+        self.assertEqual(self.calls[0].method, 'POST')
+
+        self.run_with_client(lambda: EntityExtraction(text='They say Apple is better').aanalyze())
+        self.assertEqual(len(self.calls), 1)
+
+    def test_aanalyze_typed(self):
+        results = self.run_with_client(lambda: EntityExtraction(text='They say Apple is better').aanalyze(typed=True))
+        self.assertIsInstance(results, EntityExtractionResult)
+        self.assertEqual(results.annotations[0].uri, 'http://en.wikipedia.org/wiki/Apple_Inc.')
+        self.assertFalse(results.meta.cache_hit)
+
+    @override_settings(DANDELION_CACHE_TIMEOUTS={'datatxt/nex/v1': 60}, DANDELION_CACHE_STALE_TIMEOUT=600)
+    def test_aanalyze_refreshed_by_another_process(self):
+        datatxt = EntityExtraction(text='They say Apple is better')
+        cache_key = datatxt._prepare_request(('datatxt', 'nex', 'v1'), 'post', datatxt.params)[2]
+        local_cache.set(cache_key, dump_entry(200, b'{"from": "stale"}', -1))
+        cache.set(cache_key, dump_entry(200, b'{"from": "other process"}', 60))
+
+        self.assertEqual(self.run_with_client(datatxt.aanalyze)['from'], 'other process')
+        self.assertEqual(self.calls, [])
+
+    def test_aanalyze_gather(self):
+        async def gather():
+            return await asyncio.gather(*[EntityExtraction(text='text %d' % i).aanalyze() for i in range(20)])
+
+        self.assertEqual(len(self.run_with_client(gather)), 20)
+        self.assertEqual(len(self.calls), 20)
+
+    def test_aanalyze_coalesce(self):
+        async def gather():
+            return await asyncio.gather(*[EntityExtraction(text='same text').aanalyze() for _ in range(20)])
+
+        self.assertEqual(len(self.run_with_client(gather)), 20)
+        self.assertEqual(len(self.calls), 1)
+
+    def test_aanalyze_cancel(self):
+        finished = []
+
+        async def handler(request):
+            await asyncio.sleep(0.2)
+            finished.append(request.content)
+            return httpx.Response(200, json={'annotations': []})
+
+        async def main():
+            with mock.patch('django_dandelion.aio.get_async_client', return_value=fake_client(handler)):
+                alone, shared, other = [asyncio.ensure_future(EntityExtraction(text=text).aanalyze())
+                                        for text in ('alone', 'shared', 'shared')]
+                await asyncio.sleep(0.05)
+                alone.cancel()
+                shared.cancel()
+                result = await other
+                await asyncio.sleep(0.3)
+                return result
+
+        # The request of a cancelled caller is cancelled too, unless another caller waits for its response.
+        self.assertEqual(asyncio.run(main()).annotations, [])
+        self.assertEqual(len(finished), 1)
+        self.assertIn(b'text=shared', finished[0])
+
+    def test_aanalyze_chunked(self):
+        def handler(request):
+            self.calls.append(request)
+            return httpx.Response(200, json={'sentiment': {'score': 0.5, 'type': 'positive'}})
+
+        self.handler = handler
+        text = 'This is a sentence. ' * 20
+        result = self.run_with_client(lambda: SentimentAnalysis(text=text).aanalyze_chunked(max_size=100))
+        self.assertEqual(result.sentiment.score, 0.5)
+        self.assertGreater(len(self.calls), 1)
+
+    def test_aanalyze_error(self):
+        with self.assertRaises(DandelionException):
+            self.run_with_client(lambda: SentimentAnalysis(text='text', lang='en').aanalyze())
+
+    def test_crud(self):
+        self.run_with_client(lambda: EntityExtraction.UserDefinedSpots().aread(id='spots-id'))
+        self.assertEqual(self.calls[0].method, 'GET')
+        self.assertEqual(self.calls[0].url.params['id'], 'spots-id')
+        self.assertIn('token', json.dumps(dict(self.calls[0].url.params)))
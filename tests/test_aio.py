@@ -0,0 +1,9 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+from __future__ import unicode_literals
+
+import sys
+
+if sys.version_info >= (3, 7):
+    from .aio_requests import TestAsync  # noqa: F401
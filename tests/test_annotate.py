@@ -0,0 +1,117 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+from __future__ import unicode_literals
+
+import json
+import os
+import shutil
+import tempfile
+
+try:
+    from unittest import mock
+except ImportError:
+    import mock
+
+import requests
+from django.contrib.sites.models import Site
+from django.core.management import call_command, CommandError
+from six import StringIO
+
+from django_dandelion.management.commands.dandelion_annotate import Command
+
+from .utils import ApiTestCase
+
+
+def li(method, params):
+    if params['text'].startswith('down'):
+        raise requests.ConnectionError('unreachable')
+    if params['text'].startswith('bad'):
+        return 400, {'code': 'error.invalidParameter', 'message': 'text', 'data': {'parameter': 'text'}}
+    return {'lang': params['text'][-1]}
+
+
+class TestAnnotateCommand(ApiTestCase):
+    def setUp(self):
+        super(TestAnnotateCommand, self).setUp()
+        self.transport = self.use_transport({'datatxt/li/v1': li})
+
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        self.checkpoint = os.path.join(directory, 'checkpoint.json')
+
+        Site.objects.all().delete()
+        self.sites = [Site.objects.create(domain='site{}.example.com'.format(i), name='') for i in range(5)]
+
+    def annotate(self, *args, **kwargs):
+        out, err = StringIO(), StringIO()
+        call_command('dandelion_annotate', 'sites.Site', 'domain', 'name', '--endpoint', 'li', '--chunk-size', '2',
+                     '--checkpoint', self.checkpoint, *args, stdout=out, stderr=err, **kwargs)
+        return out.getvalue(), err.getvalue()
+
+    def test_annotate(self):
+        out, _ = self.annotate('--param', 'clean=true')
+        self.assertEqual([json.loads(site.name) for site in Site.objects.order_by('pk')], [{'lang': 'm'}] * 5)
+        self.assertEqual(self.transport.requests[0][2]['clean'], 'true')
+        self.assertIn('5 rows (0 errors)', out)
+        self.assertIn('rows/s', out)
+        with open(self.checkpoint) as f:
+            self.assertEqual(json.load(f), {'last_pk': self.sites[-1].pk, 'failed': []})
+
+    def test_resume(self):
+        with open(self.checkpoint, 'w') as f:
+            json.dump({'last_pk': self.sites[2].pk}, f)
+        out, _ = self.annotate()
+        self.assertIn('Resuming after primary key {}'.format(self.sites[2].pk), out)
+        self.assertEqual([site.name for site in Site.objects.order_by('pk')][:3], [''] * 3)
+        self.assertEqual(len(self.transport.requests), 2)
+
+        self.annotate('--restart')
+        self.assertEqual(len(self.transport.requests), 5)
+
+    def test_errors(self):
+        Site.objects.filter(pk=self.sites[1].pk).update(domain='bad.example.com')
+        _, err = self.annotate()
+        self.assertIn('Row {}'.format(self.sites[1].pk), err)
+        self.assertEqual(Site.objects.get(pk=self.sites[1].pk).name, '')
+        self.assertNotEqual(Site.objects.get(pk=self.sites[0].pk).name, '')
+        with open(self.checkpoint) as f:
+            self.assertEqual(json.load(f), {'last_pk': self.sites[-1].pk, 'failed': [self.sites[1].pk]})
+
+    def test_network_errors(self):
+        Site.objects.filter(pk=self.sites[1].pk).update(domain='down.example.com')
+        out, err = self.annotate()
+        self.assertIn('5 rows (1 errors)', out)
+        self.assertIn('Row {}: unreachable'.format(self.sites[1].pk), err)
+        self.assertEqual(Site.objects.get(pk=self.sites[1].pk).name, '')
+
+    def test_retry_errors(self):
+        Site.objects.filter(pk=self.sites[1].pk).update(domain='bad.example.com')
+        self.annotate()
+        Site.objects.filter(pk=self.sites[1].pk).update(domain='site1.example.com')
+        Site.objects.create(domain='site5.example.com', name='')
+        out, _ = self.annotate()
+        self.assertIn('retrying 1 rows', out)
+        self.assertEqual([request[2]['text'] for request in self.transport.requests[-2:]],
+                         ['site1.example.com', 'site5.example.com'])
+        self.assertEqual(json.loads(Site.objects.get(pk=self.sites[1].pk).name), {'lang': 'm'})
+        with open(self.checkpoint) as f:
+            self.assertEqual(json.load(f)['failed'], [])
+
+    def test_old_django(self):
+        # Django < 2.0 has no iterator(chunk_size=...), Django < 2.2 no bulk_update().
+        save, model = Command.save, mock.Mock(_default_manager=mock.Mock(spec=[]))
+        with mock.patch('django.VERSION', (1, 11, 0, 'final', 0)), \
+                mock.patch.object(Command, 'save', side_effect=lambda _, rows, field: save(model, rows, field)):
+            out, _ = self.annotate()
+        self.assertIn('5 rows (0 errors)', out)
+        self.assertEqual([json.loads(site.name) for site in Site.objects.order_by('pk')], [{'lang': 'm'}] * 5)
+
+    def test_invalid_arguments(self):
+        with self.assertRaises(CommandError):
+            call_command('dandelion_annotate', 'sites.Site', 'missing', 'name')
+        with self.assertRaises(CommandError):
+            self.annotate('--param', 'lang')
+        with self.assertRaises(CommandError):
+            self.annotate('--param', 'clean=maybe')
+        self.assertEqual(self.transport.requests, [])
@@ -0,0 +1,106 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+from __future__ import unicode_literals
+
+import sys
+
+from django.test import TestCase, override_settings
+
+from django_dandelion.autocomplete import Autocomplete, PrefixIndex, normalize_query
+from django_dandelion.results import WikisearchResult
+
+from .utils import ApiTestCase
+
+TITLES = ['Big Ben', 'Big Bang', 'Bigfoot', 'Biguá', 'Big Brother', 'Bigamy', 'Bight', 'Bigelow', 'Big Sur',
+          'Bignonia', 'Bigoli', 'Bigorre', 'Élysée Palace', 'Elysian Fields']
+
+
+def wikisearch(method, params):
+    query = normalize_query(params['text'])
+    titles = [title for title in TITLES if normalize_query(title).startswith(query)]
+    return {'lang': params['lang'], 'entities': [{'title': title, 'label': title} for title in titles][
+        :int(params.get('limit', 10))]}
+
+
+class TestNormalizeQuery(TestCase):
+    def test_normalize(self):
+        self.assertEqual(normalize_query('  Élysée   Palace '), 'elysee palace')
+        self.assertEqual(normalize_query('STRASSE'), normalize_query('Straße'))
+        self.assertEqual(normalize_query(''), '')
+
+
+class TestPrefixIndex(TestCase):
+    def test_exact_and_ancestor(self):
+        index = PrefixIndex(max_entries=10)
+        hits = WikisearchResult.from_dict({'entities': [{'title': 'Big Ben'}, {'title': 'Big Bang'}]}).entities
+        self.assertIsNone(index.get('en', 'big'))
+        index.set('en', 'big', hits, complete=False)
+        self.assertEqual(index.get('en', 'big'), list(hits))
+        self.assertIsNone(index.get('en', 'big be'))
+
+        index.set('en', 'big', hits, complete=True)
+        self.assertEqual([hit.title for hit in index.get('en', 'big be')], ['Big Ben'])
+        self.assertEqual([hit.title for hit in index.get('en', 'bigx')], [])
+        self.assertIsNone(index.get('it', 'big be'))
+
+    def test_bounded(self):
+        index = PrefixIndex(max_entries=2)
+        for query in ('a', 'ab', 'abc'):
+            index.set('en', query, [], complete=False)
+        self.assertEqual(len(index), 2)
+        self.assertIsNone(index.get('en', 'a'))
+        self.assertEqual(index.get('en', 'abc'), [])
+
+        index.get('en', 'ab')
+        index.set('en', 'b', [], complete=False)
+        self.assertEqual(index.get('en', 'ab'), [])
+        self.assertIsNone(index.get('en', 'abc'))
+        self.assertNotIn('c', index._roots['en'].children['a'].children['b'].children)
+
+    @override_settings(DANDELION_AUTOCOMPLETE_MAX_ENTRIES=0)
+    def test_disabled(self):
+        index = PrefixIndex()
+        index.set('en', 'a', [], complete=True)
+        self.assertEqual(len(index), 0)
+
+
+class TestAutocomplete(ApiTestCase):
+    def setUp(self):
+        super(TestAutocomplete, self).setUp()
+        self.transport = self.use_transport({'datagraph/wikisearch/v1': wikisearch})
+        self.field = Autocomplete(lang='en', limit=5, index=PrefixIndex())
+
+    def titles(self, hits):
+        return [hit.title for hit in hits]
+
+    def test_complete(self):
+        self.assertEqual(self.titles(self.field.complete('Big B')), ['Big Ben', 'Big Bang', 'Big Brother'])
+        self.assertEqual(self.transport.requests[0][2]['query'], 'prefix')
+        self.assertEqual(self.field.complete('   '), [])
+
+        self.assertEqual(self.titles(self.field.complete('big br')), ['Big Brother'])
+        self.assertEqual(self.titles(self.field.complete('BIG BE')), ['Big Ben'])
+        self.assertEqual(len(self.transport.requests), 1)
+
+    def test_incomplete_prefix(self):
+        self.assertEqual(len(self.field.complete('big')), 5)
+        self.assertEqual(self.titles(self.field.complete('bigo')), ['Bigoli', 'Bigorre'])
+        self.assertEqual(self.titles(self.field.complete('bigor')), ['Bigorre'])
+        self.assertEqual(len(self.transport.requests), 2)
+
+    def test_accents(self):
+        self.assertEqual(self.titles(self.field.complete('ely')), ['Élysée Palace', 'Elysian Fields'])
+        self.assertEqual(self.titles(self.field.complete('Élysé')), ['Élysée Palace'])
+        self.assertEqual(self.titles(self.field.complete('bigua')), ['Biguá'])
+        self.assertEqual(len(self.transport.requests), 2)
+
+    def test_scoped_by_params(self):
+        self.field.complete('big b')
+        Autocomplete(lang='it', limit=5, index=self.field.index).complete('big b')
+        Autocomplete(lang='en', limit=3, index=self.field.index).complete('big b')
+        self.assertEqual(len(self.transport.requests), 3)
+
+
+if sys.version_info >= (3, 7):
+    from .aio_autocomplete import TestAsyncAutocomplete  # noqa: F401
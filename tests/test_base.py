@@ -3,11 +3,22 @@
 
 from __future__ import unicode_literals
 
+import threading
+
+try:
+    from unittest import mock
+except ImportError:
+    import mock
+
+import requests
 from django.test import TestCase
 
-from django_dandelion.base import AttributeDict, BaseDandelionParamsRequest
-from django_dandelion.datatxt import EntityExtraction
+from django_dandelion.base import AttributeDict, BaseDandelionParamsRequest, BaseDandelionRequest
+from django_dandelion.datatxt import EntityExtraction, TextSimilarity
 from django_dandelion.exceptions import DandelionException
+from django_dandelion.retry import RetryPolicy
+
+from .utils import ApiTestCase, fake_response
 
 
 class TestAttributeDict(TestCase):
@@ -61,3 +72,48 @@ class TestCommon(TestCase):
             {annotation.uri for annotation in results.annotations},
             {'http://en.wikipedia.org/wiki/Apple_Inc.', 'http://en.wikipedia.org/wiki/Microsoft_Windows'}
         )
+
+
+class TestBatch(ApiTestCase):
+    def setUp(self):
+        super(TestBatch, self).setUp()
+        self.lock = threading.Lock()
+        self.calls = []
+        self.mock_session().post.side_effect = self.post
+
+    def post(self, url, data, **kwargs):
+        with self.lock:
+            self.calls.append(data)
+        if data.get('text') == 'down':
+            raise requests.ConnectionError('unreachable')
+        if data.get('text') == 'bad':
+            return fake_response(400, {'code': 'error.invalidParameter', 'message': 'lang', 'data': {}})
+        return fake_response(200, {'text': data.get('text', data.get('text1'))})
+
+    def test_ordered_results(self):
+        texts = ['text %d' % i for i in range(50)]
+        results = list(EntityExtraction(lang='en').analyze_many(texts, max_workers=4))
+        self.assertEqual([result.text for result in results], texts)
+        self.assertTrue(all(data['lang'] == 'en' for data in self.calls))
+
+    def test_errors_and_dedupe(self):
+        items = [{'text': 'a'}, {'text': 'bad'}, {'text': 'a'}, {'key': 'value'}]
+        results = list(EntityExtraction().analyze_many(items, max_workers=4))
+        self.assertEqual(results[0].text, 'a')
+        self.assertIsInstance(results[1], DandelionException)
+        self.assertIs(results[2], results[0])
+        self.assertIsInstance(results[3], DandelionException)
+        self.assertEqual(len(self.calls), 2)
+
+    @mock.patch.object(BaseDandelionRequest, 'retry_policy', RetryPolicy(max_attempts=1))
+    def test_network_errors(self):
+        results = list(EntityExtraction().analyze_many(['a', 'down', 'b'], max_workers=2))
+        self.assertEqual(results[0].text, 'a')
+        self.assertIsInstance(results[1], requests.ConnectionError)
+        self.assertEqual(results[2].text, 'b')
+
+    def test_other_endpoints(self):
+        datatxt = TextSimilarity(text2='b')
+        results = list(datatxt.analyze_many([{'text1': 'a'}, {'text1': 'c'}]))
+        self.assertEqual([result.text for result in results], ['a', 'c'])
+        self.assertEqual(datatxt.params, {'text2': 'b'})
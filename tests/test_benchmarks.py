@@ -0,0 +1,53 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+from __future__ import unicode_literals
+
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+
+from benchmarks import suite
+from benchmarks.server import FakeDandelionServer
+from django_dandelion.caching import local_cache
+from django_dandelion.datagraph import Wikisearch
+
+
+class TestBenchmarks(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super(TestBenchmarks, cls).setUpClass()
+        cls.server = FakeDandelionServer(payload_size=3).start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.stop()
+        super(TestBenchmarks, cls).tearDownClass()
+
+    def setUp(self):
+        cache.clear()
+        local_cache.clear()
+        override = override_settings(DANDELION_HOST=self.server.url)
+        override.enable()
+        self.addCleanup(override.disable)
+
+    def test_server(self):
+        results = Wikisearch(text='big ben', limit=2, offset=1).analyze()
+        self.assertEqual([entity.id for entity in results.entities], [1001, 1002])
+        self.assertEqual(results.meta.units, 1)
+
+    def test_percentile(self):
+        self.assertEqual(suite.percentile([3, 1, 2, 4], 50), 2)
+        self.assertEqual(suite.percentile([3, 1, 2, 4], 99), 4)
+        self.assertIsNone(suite.percentile([], 50))
+
+    def test_suite(self):
+        sync = suite.bench_sync(2)
+        self.assertEqual(set(sync), set(suite.ENDPOINTS))
+        self.assertEqual(sync['datatxt/nex/v1']['calls'], 2)
+
+        self.assertEqual(suite.bench_cache_hit(2)['local']['calls'], 2)
+        self.assertEqual(suite.bench_batch(4, 2)['calls'], 4)
+        result = suite.bench_async(2, 2)
+        if result is not None:
+            self.assertEqual(result['calls'], 2)
+        self.assertGreater(suite.bench_decode(self.server.url, 2)['bytes'], 0)
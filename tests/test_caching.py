@@ -0,0 +1,225 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+from __future__ import unicode_literals
+
+import time
+
+try:
+    from unittest import mock
+except ImportError:
+    import mock
+
+import requests
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+
+from django_dandelion.base import BaseDandelionRequest
+from django_dandelion.caching import LocalCache, dump_entry, load_entry, is_stale, is_expired, get_cache_key, \
+    get_entry, lookup_entry, set_entry, get_timeouts, local_cache, normalize_params
+from django_dandelion.datatxt import EntityExtraction
+from django_dandelion.exceptions import DandelionException
+from django_dandelion.retry import RetryPolicy
+
+from .utils import ApiTestCase, fake_response
+
+
+class TestCacheEntry(TestCase):
+    def test_small_entry(self):
+        entry = dump_entry(200, b'{"lang": "en"}')
+        self.assertEqual(entry, (200, 0, b'{"lang": "en"}', None, None))
+        self.assertEqual(load_entry(entry), (200, b'{"lang": "en"}', None))
+
+    def test_compressed_entry(self):
+        content = b'{"annotations": [' + b'{"spot": "Apple"},' * 1000 + b'{}]}'
+        entry = dump_entry(200, content, units=1)
+        self.assertLess(len(entry[2]), len(content))
+        self.assertEqual(load_entry(entry), (200, content, 1))
+
+    def test_unknown_entry(self):
+        self.assertIsNone(load_entry(None))
+        self.assertIsNone(load_entry(object()))
+        self.assertIsNone(load_entry((200, 99, b'', None, None)))
+
+
+class TestCacheKey(TestCase):
+    url = 'https://api.dandelion.eu/datatxt/nex/v1'
+
+    def test_canonical(self):
+        self.assertEqual(
+            get_cache_key('post', self.url, {'text': 'Apple', 'lang': 'en', 'token': 'a'}),
+            get_cache_key('post', self.url, {'token': 'b', 'lang': 'en', 'text': 'Apple'})
+        )
+        self.assertNotEqual(
+            get_cache_key('post', self.url, {'text': 'Apple', 'lang': 'en'}),
+            get_cache_key('post', self.url, {'text': 'Apple', 'lang': 'it'})
+        )
+        self.assertNotEqual(
+            get_cache_key('post', self.url, {'text': 'ab'}),
+            get_cache_key('post', self.url, {'text': 'a', 'b': ''})
+        )
+
+    def test_normalize_params(self):
+        params = normalize_params({'text': ' Cafe\u0301  au\n\tlait ', 'lang': ' en '})
+        self.assertEqual(params, {'text': 'Caf\xe9 au lait', 'lang': ' en '})
+
+
+class TestLocalCache(TestCase):
+    def test_lru_eviction(self):
+        local = LocalCache(max_size=1300, timeout=None)
+        for key in 'abc':
+            local.set(key, (200, 0, b'x' * 200, None, None))
+        local.get('a')
+        local.set('d', (200, 0, b'x' * 200, None, None))
+        self.assertIsNone(local.get('b'))
+        self.assertIsNotNone(local.get('a'))
+        self.assertLessEqual(local.size, 1300)
+
+        local.set('e', (200, 0, b'x' * 2000, None, None))
+        self.assertIsNone(local.get('e'))
+
+        local.set('a', (200, 0, b'x' * 2000, None, None))
+        self.assertIsNone(local.get('a'))
+        self.assertEqual(local.size, 2 * (200 + 200))
+
+    def test_timeout(self):
+        local = LocalCache(max_size=1000, timeout=10)
+        with mock.patch('django_dandelion.caching._now', return_value=0):
+            local.set('a', (200, 0, b'', None, None))
+        with mock.patch('django_dandelion.caching._now', return_value=20):
+            self.assertIsNone(local.get('a'))
+        self.assertEqual(local.size, 0)
+
+    def test_two_tiers(self):
+        cache.clear()
+        local_cache.clear()
+        set_entry('key', (200, 0, b'{}', None, None))
+        self.assertEqual(local_cache.get('key'), (200, 0, b'{}', None, None))
+
+        local_cache.clear()
+        self.assertEqual(get_entry('key'), (200, 0, b'{}', None, None))
+        self.assertEqual(local_cache.get('key'), (200, 0, b'{}', None, None))
+
+
+@override_settings(DANDELION_CACHE_STALE_TIMEOUT=600)
+class TestStaleEntries(ApiTestCase):
+    def setUp(self):
+        super(TestStaleEntries, self).setUp()
+        self.post = self.mock_session().post
+
+        self.datatxt = EntityExtraction(text='They say Apple is better than Windows')
+        self.cache_key = self.datatxt._prepare_request(('datatxt', 'nex', 'v1'), 'post', self.datatxt.params)[2]
+        set_entry(self.cache_key, dump_entry(200, b'{"from": "cache"}', -1))
+
+    @override_settings(DANDELION_CACHE_TIMEOUTS={'datatxt/nex/v1': 60}, DANDELION_CACHE_STALE_TIMEOUT=600)
+    def test_get_timeouts(self):
+        self.assertEqual(get_timeouts('datatxt/nex/v1'), (60, 660))
+        self.assertTrue(is_stale(dump_entry(200, b'', -1)))
+        self.assertFalse(is_stale(dump_entry(200, b'', 60)))
+        self.assertFalse(is_stale(dump_entry(200, b'')))
+
+    def test_stale_while_revalidate(self):
+        self.post.return_value = fake_response(200, b'{"from": "api"}')
+
+        self.assertEqual(self.datatxt.analyze()['from'], 'cache')
+        for _ in range(100):
+            if not is_stale(get_entry(self.cache_key)):
+                break
+            time.sleep(0.01)
+        self.assertEqual(self.datatxt.analyze()['from'], 'api')
+        self.assertEqual(self.post.call_count, 1)
+
+    @override_settings(DANDELION_CACHE_STALE_WHILE_REVALIDATE=False)
+    @mock.patch.object(BaseDandelionRequest, 'retry_policy', RetryPolicy(max_attempts=1))
+    def test_stale_if_error(self):
+        self.post.side_effect = requests.ConnectionError
+        self.assertEqual(self.datatxt.analyze()['from'], 'cache')
+
+        self.post.side_effect = None
+        self.post.return_value = fake_response(503, b'{"code": "error.unavailable", "message": "", "data": {}}')
+        self.assertEqual(self.datatxt.analyze()['from'], 'cache')
+
+    @override_settings(DANDELION_CACHE_TIMEOUTS={'datatxt/nex/v1': 60})
+    def test_refreshed_by_another_process(self):
+        # The entry in the memory of this process is stale, but another one has refreshed the Django cache.
+        cache.set(self.cache_key, dump_entry(200, b'{"from": "other process"}', 60))
+        result = self.datatxt.analyze()
+        self.assertEqual(result['from'], 'other process')
+        self.assertTrue(result.meta.cache_hit)
+        self.assertFalse(self.post.called)
+        self.assertEqual(lookup_entry(self.cache_key)[1], 'local')
+
+        # Both stale: the entry of the first tier is served.
+        cache.set(self.cache_key, dump_entry(200, b'{"from": "other process"}', -1))
+        local_cache.set(self.cache_key, dump_entry(200, b'{"from": "cache"}', -1))
+        entry, tier = lookup_entry(self.cache_key)
+        self.assertEqual((load_entry(entry)[1], tier), (b'{"from": "cache"}', 'local'))
+
+    @override_settings(DANDELION_CACHE_STALE_WHILE_REVALIDATE=False, DANDELION_CACHE_LOCK_TIMEOUT=1)
+    def test_refreshed_before_lock(self):
+        def acquire_lock(key):
+            # Another process refreshed the entry and released the lock between the lookup and this call.
+            cache.set(key, dump_entry(200, b'{"from": "other process"}', 60))
+            return True
+
+        with mock.patch('django_dandelion.base.acquire_lock', acquire_lock):
+            self.assertEqual(self.datatxt.analyze()['from'], 'other process')
+        self.assertFalse(self.post.called)
+
+    def test_expired(self):
+        self.assertFalse(is_expired(dump_entry(200, b'', -1)))
+        self.assertTrue(is_expired(dump_entry(200, b'', -601)))
+        self.assertTrue(is_expired(dump_entry(400, b'', -1)))
+        self.assertFalse(is_expired(dump_entry(200, b'')))
+
+        with override_settings(DANDELION_CACHE_STALE_TIMEOUT=None):
+            self.assertTrue(is_expired(dump_entry(200, b'', -1)))
+            # Soft expiry is opt-in: the entry is a miss, though the in-process cache still holds it.
+            self.assertIsNotNone(local_cache.get(self.cache_key))
+            self.assertIsNone(get_entry(self.cache_key))
+
+            self.post.return_value = fake_response(200, b'{"from": "api"}')
+            result = self.datatxt.analyze()
+            self.assertEqual(result['from'], 'api')
+            self.assertFalse(result.meta.cache_hit)
+
+
+class TestErrorEntries(ApiTestCase):
+    def setUp(self):
+        super(TestErrorEntries, self).setUp()
+        self.post = self.mock_session().post
+
+    def respond(self, status_code):
+        self.post.return_value = fake_response(
+            status_code, b'{"code": "error.invalidParameter", "message": "lang", "data": {"parameter": "lang"}}')
+
+    def test_deterministic_error(self):
+        self.respond(400)
+        for _ in range(2):
+            with self.assertRaises(DandelionException) as context:
+                EntityExtraction(text='text', lang='en').analyze()
+            self.assertEqual(context.exception.code, 'error.invalidParameter')
+            self.assertEqual(context.exception.data, {'parameter': 'lang'})
+        self.assertEqual(self.post.call_count, 1)
+
+    @override_settings(DANDELION_CACHE_STALE_TIMEOUT=600)
+    def test_error_expired(self):
+        self.respond(400)
+        with mock.patch('django_dandelion.caching.time.time', return_value=1000):
+            with self.assertRaises(DandelionException):
+                EntityExtraction(text='text', lang='en').analyze()
+        # Past DANDELION_CACHE_ERROR_TIMEOUT, though still in the in-process cache; errors are never served stale.
+        self.post.return_value._content = b'{"code": "error.notFound", "message": "", "data": {}}'
+        with mock.patch('django_dandelion.caching.time.time', return_value=1061):
+            with self.assertRaises(DandelionException) as context:
+                EntityExtraction(text='text', lang='en').analyze()
+        self.assertEqual(context.exception.code, 'error.notFound')
+
+    @mock.patch.object(BaseDandelionRequest, 'retry_policy', RetryPolicy(max_attempts=1))
+    def test_transient_error(self):
+        for status_code in (429, 503, 401):
+            self.respond(status_code)
+            for _ in range(2):
+                with self.assertRaises(DandelionException):
+                    EntityExtraction(text='text', lang='en').analyze()
+        self.assertEqual(self.post.call_count, 6)
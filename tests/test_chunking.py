@@ -0,0 +1,161 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+from __future__ import unicode_literals
+
+import re
+from random import Random
+
+try:
+    from unittest import mock
+except ImportError:
+    import mock
+
+from django.test import TestCase
+
+from django_dandelion.base import BaseDandelionParamsRequest
+from django_dandelion.chunking import split_text, merge_entities
+from django_dandelion.datatxt import EntityExtraction, SentimentAnalysis, TextClassification, TextSimilarity
+from django_dandelion.decoding import AttributeDict
+from django_dandelion.exceptions import DandelionException
+from django_dandelion.results import EntityExtractionResult
+
+from .utils import ApiTestCase
+
+TEXT = (
+    'Apple makes phones. Apple is good. The weather is bad today.\n\n'
+    'Windows is an operating system. Apple competes with it. It rains a lot.\n\n'
+    'Apple stock is good. Nothing else happened.'
+)
+
+
+def nex(method, params):
+    return {'lang': 'en', 'time': 1, 'annotations': [
+        {'spot': 'Apple', 'start': m.start(), 'end': m.end(), 'confidence': 0.8}
+        for m in re.finditer('Apple', params['text'])]}
+
+
+def sent(method, params):
+    score = 1.0 if 'good' in params['text'] else -1.0
+    return {'lang': 'en', 'sentiment': {'score': score, 'type': 'positive' if score > 0 else 'negative'}}
+
+
+def cl(method, params):
+    categories = [{'name': 'tech', 'score': 1.0}]
+    if 'weather' in params['text']:
+        categories.append({'name': 'weather', 'score': 0.9})
+    return {'lang': 'en', 'categories': categories}
+
+
+class TestSplitText(TestCase):
+    def test_chunks(self):
+        chunks = split_text(TEXT, 80)
+        self.assertGreater(len(chunks), 1)
+        self.assertEqual(''.join(chunk for _, chunk in chunks), TEXT)
+        for offset, chunk in chunks:
+            self.assertLessEqual(len(chunk), 80)
+            self.assertEqual(TEXT[offset:offset + len(chunk)], chunk)
+            self.assertTrue(chunk.rstrip()[-1] in '.!?')
+
+    def test_long_sentence(self):
+        text = ' '.join(['word'] * 100)
+        chunks = split_text(text, 30)
+        self.assertEqual(''.join(chunk for _, chunk in chunks), text)
+        self.assertTrue(all(len(chunk) <= 30 and not chunk.startswith(' ') for _, chunk in chunks))
+
+    def test_overlap(self):
+        chunks = split_text(TEXT, 80, overlap=40)
+        for (offset, chunk), (next_offset, _) in zip(chunks, chunks[1:]):
+            self.assertLess(next_offset, offset + len(chunk))
+            self.assertGreater(next_offset, offset)
+
+    def test_overlap_max_size(self):
+        text = 'Aaaa aaaa. Bbbb bbbb bbbb bbbb bbbb. Cccc cccc cccc cccc cccc cccc. ' * 3
+        self.assertTrue(all(len(chunk) <= 40 for _, chunk in split_text(text, 40, 30)))
+
+        random = Random(42)
+        for _ in range(200):
+            text = ''.join(random.choice(['word ', 'longer words ', 'end. ', 'stop! ', '\n\n', 'x' * 30 + ' '])
+                           for _ in range(random.randint(0, 200)))
+            max_size = random.randint(10, 200)
+            overlap = random.randint(1, max_size)
+            chunks = split_text(text, max_size, overlap)
+            for offset, chunk in chunks:
+                self.assertLessEqual(len(chunk), max_size)
+                self.assertEqual(text[offset:offset + len(chunk)], chunk)
+            if text:
+                self.assertEqual(chunks[-1][0] + len(chunks[-1][1]), len(text))
+
+    def test_stable_boundaries(self):
+        text = ' '.join('Sentence number %d is here.' % i for i in range(200))
+        edited = text.replace('number 5 ', 'number five ')
+        chunks = set(chunk for _, chunk in split_text(text, 500))
+        edited_chunks = set(chunk for _, chunk in split_text(edited, 500))
+        self.assertLessEqual(len(edited_chunks - chunks), 2)
+
+    def test_empty(self):
+        self.assertEqual(split_text('', 80), [])
+
+
+class TestMerge(TestCase):
+    def test_entities_seam(self):
+        chunks = [(0, 'Apple and Windows.'), (10, 'Windows and Apple.')]
+        results = [
+            AttributeDict(annotations=[{'spot': 'Apple', 'start': 0, 'end': 5, 'confidence': 0.7},
+                                       {'spot': 'Windows', 'start': 10, 'end': 17, 'confidence': 0.6}]),
+            AttributeDict(annotations=[{'spot': 'Windows', 'start': 0, 'end': 7, 'confidence': 0.9},
+                                       {'spot': 'Apple', 'start': 12, 'end': 17, 'confidence': 0.7}]),
+        ]
+        merged = merge_entities(chunks, results, {})
+        self.assertEqual([(a.spot, a.start, a.confidence) for a in merged.annotations],
+                         [('Apple', 0, 0.7), ('Windows', 10, 0.9), ('Apple', 22, 0.7)])
+        self.assertEqual(results[1].annotations[1].start, 12)
+
+
+class TestChunkedAnalysis(ApiTestCase):
+    def setUp(self):
+        super(TestChunkedAnalysis, self).setUp()
+        self.transport = self.use_transport({'datatxt/nex/v1': nex, 'datatxt/sent/v1': sent, 'datatxt/cl/v1': cl})
+
+    def test_entities(self):
+        result = EntityExtraction(text=TEXT).analyze_chunked(max_size=80, max_workers=2)
+        self.assertEqual([a.start for a in result.annotations], [m.start() for m in re.finditer('Apple', TEXT)])
+        self.assertTrue(all(TEXT[a.start:a.end] == 'Apple' for a in result.annotations))
+        self.assertEqual(result.time, len(self.transport.requests))
+        self.assertFalse(result.meta.cache_hit)
+
+    def test_sentiment(self):
+        result = SentimentAnalysis(text=TEXT).analyze_chunked(max_size=80)
+        self.assertTrue(-1 < result.sentiment.score < 1)
+        self.assertIn(result.sentiment.type, ('positive', 'negative'))
+
+    def test_categories(self):
+        result = TextClassification(text=TEXT, model='model').analyze_chunked(max_size=80)
+        self.assertEqual(result.categories[0].name, 'tech')
+        self.assertEqual(result.categories[0].score, 1.0)
+        self.assertLess(result.categories[1].score, 0.9)
+
+    def test_chunks_cached(self):
+        EntityExtraction(text=TEXT).analyze_chunked(max_size=80)
+        sent = len(self.transport.requests)
+        result = EntityExtraction(text=TEXT.replace('rains', 'snows')).analyze_chunked(max_size=80)
+        self.assertEqual(len(self.transport.requests), sent + 1)
+        self.assertFalse(result.meta.cache_hit)
+
+    def test_automatic(self):
+        with mock.patch.object(BaseDandelionParamsRequest, 'chunk_size', 80):
+            result = EntityExtraction(text=TEXT).analyze(typed=True)
+            self.assertIsInstance(result, EntityExtractionResult)
+            self.assertEqual(len(result.annotations), 4)
+            self.assertGreater(len(self.transport.requests), 1)
+
+            EntityExtraction(text='Apple').analyze()
+            self.assertEqual(self.transport.requests[-1][2]['text'], 'Apple')
+
+    def test_not_chunked(self):
+        with self.assertRaises(DandelionException):
+            TextSimilarity(text1='one', text2='two').analyze_chunked(max_size=80)
+        with self.assertRaises(DandelionException):
+            EntityExtraction(url='http://example.com').analyze_chunked(max_size=80)
+        with self.assertRaises(DandelionException):
+            EntityExtraction(text=TEXT).analyze_chunked()
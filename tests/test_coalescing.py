@@ -0,0 +1,102 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+from __future__ import unicode_literals
+
+import threading
+import time
+
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+
+from django_dandelion.caching import dump_entry, local_cache
+from django_dandelion.coalescing import SingleFlight
+from django_dandelion.datatxt import EntityExtraction
+
+from .utils import ApiTestCase, fake_response
+
+
+class TestSingleFlight(TestCase):
+    def test_concurrent_calls(self):
+        single_flight = SingleFlight()
+        calls = []
+        started = threading.Event()
+        release = threading.Event()
+
+        def fn():
+            calls.append(1)
+            started.set()
+            release.wait()
+            return 'result'
+
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(single_flight.do('key', fn))) for _ in range(5)]
+        threads[0].start()
+        started.wait()
+        for thread in threads[1:]:
+            thread.start()
+        time.sleep(0.05)
+        release.set()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(calls, [1])
+        self.assertEqual(results, ['result'] * 5)
+
+    def test_error(self):
+        def fn():
+            raise ValueError
+
+        with self.assertRaises(ValueError):
+            SingleFlight().do('key', fn)
+
+
+class TestCacheLock(ApiTestCase):
+    def setUp(self):
+        super(TestCacheLock, self).setUp()
+        self.post = self.mock_session().post
+        self.post.return_value = fake_response(200, b'{"from": "api"}')
+
+    @override_settings(DANDELION_CACHE_LOCK_TIMEOUT=2, DANDELION_CACHE_LOCK_POLL_INTERVAL=0.01)
+    def test_wait_for_holder(self):
+        datatxt = EntityExtraction(text='They say Apple is better than Windows')
+        cache_key = datatxt._prepare_request(('datatxt', 'nex', 'v1'), 'post', datatxt.params)[2]
+        cache.add(cache_key + '_lock', 1)
+
+        def holder():
+            time.sleep(0.1)
+            cache.set(cache_key, dump_entry(200, b'{"from": "holder"}'))
+
+        thread = threading.Thread(target=holder)
+        thread.start()
+        self.assertEqual(datatxt.analyze()['from'], 'holder')
+        thread.join()
+        self.assertFalse(self.post.called)
+
+    @override_settings(DANDELION_CACHE_LOCK_TIMEOUT=2, DANDELION_CACHE_LOCK_POLL_INTERVAL=0.01,
+                       DANDELION_CACHE_STALE_TIMEOUT=600, DANDELION_CACHE_STALE_WHILE_REVALIDATE=False)
+    def test_wait_for_holder_refresh(self):
+        datatxt = EntityExtraction(text='They say Apple is better than Windows')
+        cache_key = datatxt._prepare_request(('datatxt', 'nex', 'v1'), 'post', datatxt.params)[2]
+        local_cache.set(cache_key, dump_entry(200, b'{"from": "stale"}', -1))
+        cache.add(cache_key + '_lock', 1)
+
+        def holder():
+            # Another process: the entry in the memory of this one stays stale.
+            time.sleep(0.1)
+            cache.set(cache_key, dump_entry(200, b'{"from": "holder"}', 60))
+
+        thread = threading.Thread(target=holder)
+        thread.start()
+        self.assertEqual(datatxt.analyze()['from'], 'holder')
+        thread.join()
+        self.assertFalse(self.post.called)
+
+    @override_settings(DANDELION_CACHE_LOCK_TIMEOUT=0.1, DANDELION_CACHE_LOCK_POLL_INTERVAL=0.01)
+    def test_holder_died(self):
+        datatxt = EntityExtraction(text='They say Apple is better than Windows')
+        cache_key = datatxt._prepare_request(('datatxt', 'nex', 'v1'), 'post', datatxt.params)[2]
+        cache.add(cache_key + '_lock', 1)
+
+        self.assertEqual(datatxt.analyze()['from'], 'api')
+        self.assertTrue(self.post.called)
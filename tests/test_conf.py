@@ -0,0 +1,65 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+from __future__ import unicode_literals
+
+import os
+import subprocess
+import sys
+
+from django.test import TestCase, override_settings
+
+from django_dandelion import conf
+from django_dandelion.caching import LocalCache
+from django_dandelion.conf import dandelion_settings
+from django_dandelion.retry import RetryPolicy
+
+
+class TestSettings(TestCase):
+    def test_default(self):
+        self.assertEqual(dandelion_settings.DANDELION_CHUNK_OVERLAP, 0)
+        with self.assertRaises(AttributeError):
+            dandelion_settings.DANDELION_MISSING
+
+    def test_override(self):
+        with override_settings(DANDELION_HOST='localhost:8000'):
+            self.assertEqual(dandelion_settings.DANDELION_HOST, 'localhost:8000')
+        self.assertEqual(dandelion_settings.DANDELION_HOST, 'api.dandelion.eu')
+
+    def test_module_attribute(self):
+        self.assertEqual(conf.DANDELION_USE_CACHE, True)
+        if sys.version_info >= (3, 7):
+            with override_settings(DANDELION_HOST='localhost:8000'):
+                self.assertEqual(conf.DANDELION_HOST, 'localhost:8000')
+
+    def test_setting_attribute(self):
+        policy = RetryPolicy(max_attempts=1)
+        cache = LocalCache(timeout=None)
+        with override_settings(DANDELION_RETRY_MAX_ATTEMPTS=5, DANDELION_RETRY_BACKOFF=0,
+                               DANDELION_LOCAL_CACHE_MAX_SIZE=10, DANDELION_LOCAL_CACHE_TIMEOUT=1):
+            self.assertEqual(RetryPolicy().max_attempts, 5)
+            self.assertEqual((policy.max_attempts, policy.backoff), (1, 0))
+            self.assertEqual((cache.max_size, cache.timeout), (10, None))
+        self.assertEqual(policy.backoff, 0.5)
+
+    def test_setting_attribute_without_set_name(self):
+        # Python < 3.6 does not call __set_name__; nor does assigning descriptors to an existing class.
+        class Options(object):
+            pass
+
+        Options.block = conf.SettingAttribute('DANDELION_RATE_LIMIT_BLOCK')
+        Options.chunk_size = conf.SettingAttribute('DANDELION_CHUNK_SIZE')
+        options = Options()
+        options.chunk_size = None
+        self.assertIsNone(options.chunk_size)
+        self.assertTrue(options.block)
+
+
+class TestLazyImports(TestCase):
+    def test_requests_not_imported(self):
+        code = ('import sys, django; django.setup(); import django_dandelion.datatxt, django_dandelion.datagraph; '
+                'print("requests" in sys.modules)')
+        env = dict(os.environ, DJANGO_SETTINGS_MODULE='tests.settings')
+        output = subprocess.check_output([sys.executable, '-c', code], env=env,
+                                         cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+        self.assertEqual(output.strip(), b'False')
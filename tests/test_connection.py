@@ -0,0 +1,37 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+from __future__ import unicode_literals
+
+try:
+    from unittest import mock
+except ImportError:
+    import mock
+
+from django.test import TestCase, override_settings
+
+from django_dandelion import connection
+
+
+class TestConnection(TestCase):
+    def tearDown(self):
+        connection.close_session()
+
+    def test_shared_session(self):
+        self.assertIs(connection.get_session(), connection.get_session())
+
+    def test_rebuilt_after_fork(self):
+        session = connection.get_session()
+        with mock.patch('django_dandelion.connection.os.getpid', return_value=-1):
+            self.assertIsNot(connection.get_session(), session)
+
+    def test_close_session(self):
+        session = connection.get_session()
+        connection.close_session()
+        self.assertIsNot(connection.get_session(), session)
+
+    def test_rebuilt_after_settings_change(self):
+        session = connection.get_session()
+        with override_settings(DANDELION_POOL_MAXSIZE=1):
+            self.assertIsNot(connection.get_session(), session)
+            self.assertEqual(connection.get_session().get_adapter('https://')._pool_maxsize, 1)
@@ -3,10 +3,20 @@
 
 from __future__ import unicode_literals
 
+import threading
+
+try:
+    from unittest import mock
+except ImportError:
+    import mock
+
 from django.test import TestCase
 
-from django_dandelion.exceptions import DandelionException
+from django_dandelion.exceptions import DandelionException, DandelionQueueFullException
 from django_dandelion.datagraph import Wikisearch
+from django_dandelion.results import WikisearchHit
+
+from .utils import ApiTestCase
 
 
 class TestDatagraph(TestCase):
@@ -22,3 +32,53 @@ class TestDatagraph(TestCase):
         with self.assertRaises(DandelionException):
             datagraph.params = 'lang', 'eng'
             datagraph.analyze()
+
+
+def wikisearch(method, params):
+    offset, limit = int(params['offset']), int(params['limit'])
+    return {'lang': 'en', 'entities': [{'title': 'Page %d' % i} for i in range(offset, min(offset + limit, 23))]}
+
+
+class TestWikisearchPages(ApiTestCase):
+    def setUp(self):
+        super(TestWikisearchPages, self).setUp()
+        self.fetched = threading.Event()
+
+        def handler(method, params):
+            if params['offset'] > 0:
+                self.fetched.set()
+            return wikisearch(method, params)
+
+        self.transport = self.use_transport({'datagraph/wikisearch/v1': handler})
+
+    def offsets(self):
+        return sorted(params['offset'] for _, _, params in self.transport.requests)
+
+    def test_iter_hits(self):
+        hits = list(Wikisearch(text='page', lang='en').iter_hits())
+        self.assertEqual([hit.title for hit in hits], ['Page %d' % i for i in range(23)])
+        self.assertEqual(self.offsets(), [0, 10, 20])
+
+        # Every page is cached on its own.
+        hits = list(Wikisearch(text='page', lang='en', limit=10, offset=10).iter_hits(typed=True))
+        self.assertIsInstance(hits[0], WikisearchHit)
+        self.assertEqual(len(hits), 13)
+        self.assertEqual(len(self.transport.requests), 3)
+
+    def test_max_hits(self):
+        hits = list(Wikisearch(text='page', lang='en', limit=5).iter_hits(max_hits=10))
+        self.assertEqual(len(hits), 10)
+        self.assertEqual(self.offsets(), [0, 5])
+
+    def test_prefetch(self):
+        hits = Wikisearch(text='page', lang='en').iter_hits()
+        self.assertEqual(next(hits).title, 'Page 0')
+        self.assertTrue(self.fetched.wait(5))
+        hits.close()
+        self.assertEqual(self.offsets(), [0, 10])
+
+    def test_queue_full(self):
+        with mock.patch.object(Wikisearch, 'submit', side_effect=DandelionQueueFullException(message='full')):
+            hits = list(Wikisearch(text='page', lang='en', limit=20).iter_hits())
+        self.assertEqual(len(hits), 23)
+        self.assertEqual(self.offsets(), [0, 20])
@@ -0,0 +1,101 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+from __future__ import unicode_literals
+
+import copy
+import json
+import pickle
+
+import six
+
+try:
+    from unittest import mock
+except ImportError:
+    import mock
+
+from django.test import TestCase
+
+from django_dandelion.base import BaseDandelionRequest
+from django_dandelion.decoding import AttributeDict, AttributeList, loads
+from django_dandelion.exceptions import DandelionException
+
+PAYLOAD = {
+    'lang': 'en',
+    'annotations': [
+        {'spot': 'Apple', 'types': ['Company'], 'lod': {'wikipedia': 'http://en.wikipedia.org/wiki/Apple_Inc.'}},
+        {'spot': 'Windows', 'types': [], 'lod': {'wikipedia': 'http://en.wikipedia.org/wiki/Microsoft_Windows'}},
+    ],
+    'matrix': [[{'x': 1}]],
+}
+CONTENT = json.dumps(PAYLOAD).encode('utf-8')
+
+
+class TestLoads(TestCase):
+    def test_attributes(self):
+        result = loads(CONTENT)
+        self.assertIsInstance(result, AttributeDict)
+        self.assertEqual(result.lang, 'en')
+        self.assertEqual(result.annotations[0].lod.wikipedia, 'http://en.wikipedia.org/wiki/Apple_Inc.')
+        self.assertEqual(result['annotations'][1]['spot'], 'Windows')
+        self.assertEqual(result.matrix[0][0].x, 1)
+        self.assertIs(result.annotations, result.annotations)
+        self.assertIs(result.annotations[0], result.annotations[0])
+        self.assertEqual(result.annotations[0].types, ['Company'])
+
+    def test_wrapped_lazily(self):
+        result = AttributeDict(json.loads(CONTENT.decode('utf-8')))
+        self.assertIs(type(dict.__getitem__(result, 'annotations')), list)
+        result.annotations
+        self.assertIs(type(dict.__getitem__(result, 'annotations')), AttributeList)
+        self.assertIs(type(list.__getitem__(result.annotations, 0)), dict)
+
+        result = AttributeDict(json.loads(CONTENT.decode('utf-8')))
+        self.assertTrue(all(isinstance(value, (AttributeList, six.text_type)) for value in result.values()))
+
+    def test_containers(self):
+        result = loads(CONTENT)
+        self.assertEqual([annotation.spot for annotation in result.annotations], ['Apple', 'Windows'])
+        self.assertEqual([annotation.spot for annotation in reversed(result.annotations)], ['Windows', 'Apple'])
+        self.assertEqual(result.annotations[1:][0].spot, 'Windows')
+        self.assertEqual(result.get('annotations')[0].spot, 'Apple')
+        self.assertIsNone(result.get('missing'))
+        self.assertEqual(dict(result.items())['matrix'][0][0].x, 1)
+        self.assertEqual(result.annotations.pop().spot, 'Windows')
+        self.assertEqual(result.pop('annotations')[0].spot, 'Apple')
+
+    def test_equality(self):
+        result = loads(CONTENT)
+        result.annotations[0].lod
+        self.assertEqual(result, PAYLOAD)
+        self.assertEqual(json.loads(json.dumps(result)), PAYLOAD)
+
+    def test_missing_attribute(self):
+        with self.assertRaises(KeyError):
+            loads(CONTENT).missing
+        with self.assertRaises(AttributeError):
+            loads(CONTENT).__html__
+        result = loads(CONTENT)
+        self.assertEqual(pickle.loads(pickle.dumps(result)), PAYLOAD)
+        self.assertEqual(copy.deepcopy(result).annotations[0].lod.wikipedia, 'http://en.wikipedia.org/wiki/Apple_Inc.')
+
+    def test_fallback(self):
+        self.assertNotEqual(loads(b'{"score": NaN}').score, 0)
+
+    def test_error_response(self):
+        content = b'{"code": "error.invalidParameter", "message": "lang", "data": {"parameter": "lang"}}'
+        with self.assertRaises(DandelionException) as cm:
+            BaseDandelionRequest._parse_response(400, content)
+        self.assertEqual(cm.exception.data.parameter, 'lang')
+
+
+class TestLoadsWithoutOrjson(TestLoads):
+    def setUp(self):
+        patcher = mock.patch('django_dandelion.decoding.orjson', None)
+        self.addCleanup(patcher.stop)
+        patcher.start()
+
+    def test_decoded_eagerly(self):
+        annotation = list.__getitem__(dict.__getitem__(loads(CONTENT), 'annotations'), 0)
+        self.assertIsInstance(annotation, AttributeDict)
+        self.assertIsInstance(dict.__getitem__(annotation, 'lod'), AttributeDict)
@@ -0,0 +1,85 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+from __future__ import unicode_literals
+
+import threading
+from concurrent.futures import Future
+
+try:
+    from unittest import mock
+except ImportError:
+    import mock
+
+from django.test import TestCase
+
+from django_dandelion import executor
+from django_dandelion.datatxt import SentimentAnalysis
+from django_dandelion.exceptions import DandelionException, DandelionQueueFullException
+from django_dandelion.executor import BoundedExecutor, get_executor, shutdown_executor
+from django_dandelion.results import SentimentResult
+
+from .utils import ApiTestCase
+
+
+def sent(method, params):
+    if params['text'] == 'bad':
+        return 400, {'code': 'error.invalidParameter', 'message': 'text', 'data': {'parameter': 'text'}}
+    return {'sentiment': {'score': 0.5, 'type': 'positive'}}
+
+
+class TestBoundedExecutor(TestCase):
+    def setUp(self):
+        self.release = threading.Event()
+        self.addCleanup(self.release.set)
+
+    def test_reject_when_full(self):
+        pool = BoundedExecutor(max_workers=1, max_queue=1, block=False)
+        self.addCleanup(pool.shutdown)
+        futures = [pool.submit(self.release.wait), pool.submit(self.release.wait)]
+        with self.assertRaises(DandelionQueueFullException):
+            pool.submit(self.release.wait)
+
+        self.release.set()
+        for future in futures:
+            future.result()
+        pool.submit(lambda: None).result()
+
+    def test_block_when_full(self):
+        pool = BoundedExecutor(max_workers=1, max_queue=0, block=True)
+        self.addCleanup(pool.shutdown)
+        pool.submit(self.release.wait)
+        submitted = []
+        thread = threading.Thread(target=lambda: submitted.append(pool.submit(lambda: 42)))
+        thread.start()
+        thread.join(0.1)
+        self.assertEqual(submitted, [])
+
+        self.release.set()
+        thread.join()
+        self.assertEqual(submitted[0].result(), 42)
+
+    def test_shared(self):
+        self.addCleanup(shutdown_executor)
+        parent = get_executor()
+        self.addCleanup(parent.shutdown)
+        self.assertIs(get_executor(), parent)
+        # As seen from a forked child.
+        with mock.patch.object(executor, '_executor_pid', -1):
+            self.assertIsNot(get_executor(), parent)
+
+
+class TestSubmit(ApiTestCase):
+    def setUp(self):
+        super(TestSubmit, self).setUp()
+        self.use_transport({'datatxt/sent/v1': sent})
+
+    def test_submit(self):
+        request = SentimentAnalysis(text='I love it')
+        future = request.submit(typed=True)
+        request.params = 'text', 'bad'
+        self.assertIsInstance(future, Future)
+        self.assertIsInstance(future.result(), SentimentResult)
+
+        with self.assertRaises(DandelionException):
+            request.submit().result()
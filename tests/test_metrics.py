@@ -0,0 +1,106 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+from __future__ import unicode_literals
+
+try:
+    from unittest import mock
+except ImportError:
+    import mock
+
+import requests
+from django.test import override_settings
+
+from django_dandelion.base import BaseDandelionRequest
+from django_dandelion.caching import local_cache
+from django_dandelion.datatxt import EntityExtraction
+from django_dandelion.metrics import StatsdMetrics
+from django_dandelion.retry import RetryPolicy
+from django_dandelion.signals import dandelion_request_started, dandelion_request_finished
+
+from .utils import ApiTestCase, fake_response
+
+
+class FakeStatsClient(object):
+    def __init__(self):
+        self.timings = {}
+        self.counters = {}
+
+    def timing(self, name, value):
+        self.timings[name] = value
+
+    def incr(self, name, count=1):
+        self.counters[name] = self.counters.get(name, 0) + count
+
+
+class TestSignals(ApiTestCase):
+    def setUp(self):
+        super(TestSignals, self).setUp()
+        self.post = self.mock_session().post
+        self.post.return_value = fake_response(200, {'annotations': []})
+
+        self.started = []
+        self.finished = []
+        dandelion_request_started.connect(self.on_started)
+        dandelion_request_finished.connect(self.on_finished)
+        self.addCleanup(dandelion_request_started.disconnect, self.on_started)
+        self.addCleanup(dandelion_request_finished.disconnect, self.on_finished)
+
+    def on_started(self, sender, **kwargs):
+        self.started.append(kwargs)
+
+    def on_finished(self, sender, **kwargs):
+        self.finished.append(kwargs)
+
+    def test_cache_tiers(self):
+        EntityExtraction(text='They say Apple is better than Windows').analyze()
+        EntityExtraction(text='They say Apple is better than Windows').analyze()
+        local_cache.clear()
+        EntityExtraction(text='They say Apple is better than Windows').analyze()
+
+        self.assertEqual(self.started, [{'signal': dandelion_request_started, 'endpoint': 'datatxt/nex/v1',
+                                         'method': 'post'}] * 3)
+        self.assertEqual([kwargs['cache_tier'] for kwargs in self.finished], [None, 'local', 'cache'])
+        first = self.finished[0]
+        self.assertEqual(first['status_code'], 200)
+        self.assertEqual(first['retries'], 0)
+        self.assertEqual(first['bytes_received'], len(b'{"annotations": []}'))
+        self.assertGreaterEqual(first['latency'], 0)
+
+    def test_retries(self):
+        self.post.side_effect = [fake_response(503, {'annotations': []}), fake_response(200, {'annotations': []})]
+        with mock.patch.object(BaseDandelionRequest, 'retry_policy', RetryPolicy(backoff=0)):
+            EntityExtraction(text='They say Apple is better than Windows').analyze()
+
+        self.assertEqual(self.finished[0]['retries'], 1)
+        self.assertEqual(self.finished[0]['status_code'], 200)
+        self.assertEqual(self.finished[0]['bytes_received'], 2 * len(b'{"annotations": []}'))
+
+    def test_failure(self):
+        self.post.side_effect = requests.ConnectionError
+        with mock.patch.object(BaseDandelionRequest, 'retry_policy', RetryPolicy(max_attempts=2, backoff=0)):
+            with self.assertRaises(requests.ConnectionError):
+                EntityExtraction(text='They say Apple is better than Windows').analyze()
+
+        self.assertEqual(self.finished[0]['retries'], 1)
+        self.assertIsNone(self.finished[0]['status_code'])
+
+    def test_slow_request(self):
+        with override_settings(DANDELION_SLOW_REQUEST_THRESHOLD=0):
+            # assertLogs() is Python 3 only.
+            with mock.patch('django_dandelion.metrics.logger') as logger:
+                EntityExtraction(text='They say Apple is better than Windows').analyze()
+        self.assertEqual(logger.warning.call_count, 1)
+
+    def test_statsd(self):
+        client = FakeStatsClient()
+        receiver = StatsdMetrics(client)
+        dandelion_request_finished.connect(receiver)
+        self.addCleanup(dandelion_request_finished.disconnect, receiver)
+
+        EntityExtraction(text='They say Apple is better than Windows').analyze()
+        EntityExtraction(text='They say Apple is better than Windows').analyze()
+
+        self.assertIn('dandelion.datatxt.nex.v1.latency', client.timings)
+        self.assertEqual(client.counters['dandelion.datatxt.nex.v1.api'], 1)
+        self.assertEqual(client.counters['dandelion.datatxt.nex.v1.local'], 1)
@@ -0,0 +1,69 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+from __future__ import unicode_literals
+
+try:
+    from unittest import mock
+except ImportError:
+    import mock
+
+from django.core.cache import cache
+from django.test import TestCase
+
+from django_dandelion.base import BaseDandelionRequest
+from django_dandelion.datatxt import EntityExtraction
+from django_dandelion.exceptions import DandelionRateLimitException, DandelionSettingsException
+from django_dandelion.ratelimit import RateLimiter, TokenBucket, CacheTokenBucket
+
+
+class TestRateLimit(TestCase):
+    def test_token_bucket(self):
+        bucket = TokenBucket(rate=10, burst=2)
+        with mock.patch('django_dandelion.ratelimit._now', return_value=0):
+            bucket._updated = 0
+            self.assertEqual(bucket.reserve(), 0)
+            self.assertEqual(bucket.reserve(), 0)
+            self.assertIsNone(bucket.reserve(max_wait=0))
+            self.assertAlmostEqual(bucket.reserve(), 0.1)
+            self.assertAlmostEqual(bucket.reserve(), 0.2)
+
+    def test_cache_token_bucket(self):
+        cache.clear()
+        bucket = CacheTokenBucket('test', rate=2)
+        with mock.patch('django_dandelion.ratelimit.time.time', return_value=100.5):
+            self.assertEqual(bucket.reserve(), 0)
+            self.assertEqual(bucket.reserve(), 0)
+            self.assertIsNone(bucket.reserve(max_wait=0))
+            self.assertAlmostEqual(bucket.reserve(), 0.5)
+
+    def test_cache_token_bucket_slow_rate(self):
+        cache.clear()
+        # 43200 requests a day: one every two seconds.
+        bucket = CacheTokenBucket('daily', rate=0.5)
+        with mock.patch('django_dandelion.ratelimit.time.time', return_value=101):
+            self.assertEqual(bucket.reserve(), 0)
+            self.assertIsNone(bucket.reserve(max_wait=0))
+            self.assertEqual(bucket.reserve(), 1)
+            self.assertEqual(bucket.reserve(), 3)
+
+        with self.assertRaises(DandelionSettingsException):
+            CacheTokenBucket('off', rate=0)
+
+    def test_limits(self):
+        limiter = RateLimiter(limits={'datatxt/nex/v1': 1, '*': 100}, shared=False)
+        self.assertEqual(limiter.reserve('datatxt/nex/v1', max_wait=0), 0)
+        with self.assertRaises(DandelionRateLimitException):
+            limiter.reserve('datatxt/nex/v1', max_wait=0)
+        self.assertEqual(limiter.reserve('datatxt/sent/v1', max_wait=0), 0)
+        self.assertEqual(RateLimiter(limits={}).reserve('datatxt/nex/v1', max_wait=0), 0)
+
+    def test_fail_fast(self):
+        limiter = RateLimiter(limits={'datatxt/custom-spots/v1': 1}, shared=False)
+        limiter.reserve('datatxt/custom-spots/v1')
+        with mock.patch.object(BaseDandelionRequest, 'rate_limiter', limiter), \
+                mock.patch.object(BaseDandelionRequest, 'rate_limit_block', False), \
+                mock.patch('django_dandelion.transport.get_session') as get_session:
+            with self.assertRaises(DandelionRateLimitException):
+                EntityExtraction.UserDefinedSpots().list()
+            self.assertFalse(get_session.called)
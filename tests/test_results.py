@@ -0,0 +1,100 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+from __future__ import unicode_literals
+
+import json
+import pickle
+
+from django.test import TestCase
+
+from django_dandelion.datagraph import Wikisearch
+from django_dandelion.datatxt import EntityExtraction, SentimentAnalysis
+from django_dandelion.decoding import loads
+from django_dandelion.results import Annotation, EntityExtractionResult, Lod, SentimentResult, WikisearchResult
+
+from .utils import ApiTestCase
+
+NEX = {
+    'timestamp': '2017-01-01T00:00:00',
+    'time': 2,
+    'lang': 'en',
+    'annotations': [
+        {'id': 856, 'title': 'Apple Inc.', 'uri': 'http://en.wikipedia.org/wiki/Apple_Inc.', 'label': 'Apple',
+         'confidence': 0.8, 'spot': 'Apple', 'start': 9, 'end': 14, 'types': ['http://dbpedia.org/ontology/Company'],
+         'lod': {'wikipedia': 'http://en.wikipedia.org/wiki/Apple_Inc.',
+                 'dbpedia': 'http://dbpedia.org/resource/Apple_Inc.'},
+         'rank': 1},
+        {'id': 18890, 'title': 'Microsoft Windows', 'uri': 'http://en.wikipedia.org/wiki/Microsoft_Windows',
+         'label': 'Windows', 'confidence': 0.7, 'spot': 'Windows', 'start': 30, 'end': 37,
+         'types': ['http://dbpedia.org/ontology/Company']},
+    ],
+}
+
+
+class TestResultModels(TestCase):
+    def test_from_dict(self):
+        result = EntityExtractionResult.from_dict(loads(json.dumps(NEX).encode('utf-8')))
+        self.assertEqual(result.lang, 'en')
+        apple, windows = result.annotations
+        self.assertIsInstance(apple, Annotation)
+        self.assertEqual(apple.spot, 'Apple')
+        self.assertEqual(apple['uri'], 'http://en.wikipedia.org/wiki/Apple_Inc.')
+        self.assertIsInstance(apple.lod, Lod)
+        self.assertEqual(apple.lod.dbpedia, 'http://dbpedia.org/resource/Apple_Inc.')
+        self.assertIsNone(windows.lod)
+        self.assertEqual(apple.types, ('http://dbpedia.org/ontology/Company',))
+        self.assertIs(apple.types, windows.types)
+        self.assertIs(apple.uri, apple.lod.wikipedia)
+
+    def test_extra_fields(self):
+        apple = Annotation.from_dict(NEX['annotations'][0])
+        self.assertEqual(apple.rank, 1)
+        self.assertEqual(apple.extra, {'rank': 1})
+        with self.assertRaises(AttributeError):
+            apple.missing
+        with self.assertRaises(KeyError):
+            apple['missing']
+
+    def test_to_dict(self):
+        result = EntityExtractionResult.from_dict(NEX)
+        self.assertEqual(result.to_dict(), NEX)
+        self.assertEqual(result, EntityExtractionResult.from_dict(NEX))
+        for protocol in range(pickle.HIGHEST_PROTOCOL + 1):
+            self.assertEqual(pickle.loads(pickle.dumps(result, protocol)), result)
+
+    def test_init(self):
+        sentiment = SentimentResult(lang='en', sentiment=None, rank=1)
+        self.assertEqual(sentiment.lang, 'en')
+        self.assertEqual(sentiment.rank, 1)
+        self.assertIsNone(sentiment.meta)
+
+
+class TestTypedRequests(ApiTestCase):
+    def setUp(self):
+        super(TestTypedRequests, self).setUp()
+        self.use_transport({
+            'datatxt/nex/v1': lambda method, params: NEX,
+            'datatxt/sent/v1': lambda method, params: {'lang': 'en', 'sentiment': {'score': 0.5, 'type': 'positive'}},
+            'datagraph/wikisearch/v1': lambda method, params: {'lang': 'en', 'entities': [NEX['annotations'][1]]},
+        })
+
+    def test_analyze(self):
+        result = EntityExtraction(text='They say Apple is better than Windows').analyze(typed=True)
+        self.assertIsInstance(result, EntityExtractionResult)
+        self.assertEqual(result.annotations[0].spot, 'Apple')
+        self.assertFalse(result.meta.cache_hit)
+
+        result = EntityExtraction(text='They say Apple is better than Windows').analyze(typed=True)
+        self.assertTrue(result.meta.cache_hit)
+        self.assertEqual(EntityExtraction(text='They say Apple is better than Windows').analyze(), NEX)
+
+    def test_endpoints(self):
+        self.assertEqual(SentimentAnalysis(text='text').analyze(typed=True).sentiment.type, 'positive')
+        result = Wikisearch(text='windows').analyze(typed=True)
+        self.assertIsInstance(result, WikisearchResult)
+        self.assertEqual(result.entities[0].label, 'Windows')
+
+    def test_analyze_many(self):
+        results = list(EntityExtraction().analyze_many(['one', 'two'], max_workers=2, typed=True))
+        self.assertTrue(all(isinstance(result, EntityExtractionResult) for result in results))
@@ -0,0 +1,79 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+from __future__ import unicode_literals
+
+try:
+    from unittest import mock
+except ImportError:
+    import mock
+
+import requests
+
+from django_dandelion.base import BaseDandelionRequest
+from django_dandelion.datatxt import EntityExtraction
+from django_dandelion.retry import RetryPolicy, parse_retry_after
+
+from .utils import ApiTestCase, fake_response
+
+
+@mock.patch('django_dandelion.base.time.sleep')
+class TestRetry(ApiTestCase):
+    def setUp(self):
+        super(TestRetry, self).setUp()
+        self.session = self.mock_session()
+
+    def test_retry_transient(self, sleep):
+        self.session.get.side_effect = [requests.ConnectionError, fake_response(503), fake_response(200)]
+        EntityExtraction.UserDefinedSpots().list()
+        self.assertEqual(self.session.get.call_count, 3)
+        self.assertEqual(sleep.call_count, 2)
+
+    def test_retry_after(self, sleep):
+        self.session.get.side_effect = [fake_response(429, headers={'Retry-After': '2'}), fake_response(200)]
+        EntityExtraction.UserDefinedSpots().list()
+        sleep.assert_called_once_with(2.0)
+
+    def test_not_idempotent(self, sleep):
+        self.session.post.side_effect = [fake_response(503), fake_response(200)]
+        with self.assertRaises(Exception):
+            EntityExtraction.UserDefinedSpots().create(data='{}')
+        self.assertEqual(self.session.post.call_count, 1)
+
+    def test_deterministic_error(self, sleep):
+        self.session.get.side_effect = [fake_response(400), fake_response(200)]
+        with self.assertRaises(Exception):
+            EntityExtraction.UserDefinedSpots().list()
+        self.assertFalse(sleep.called)
+
+    def test_deadline(self, sleep):
+        self.session.get.side_effect = [fake_response(429, headers={'Retry-After': '30'}), fake_response(200)]
+        with mock.patch.object(BaseDandelionRequest, 'retry_policy', RetryPolicy(deadline=5, timeout=10)):
+            with self.assertRaises(Exception):
+                EntityExtraction.UserDefinedSpots().list()
+        self.assertFalse(sleep.called)
+        self.assertLessEqual(self.session.get.call_args[1]['timeout'], 5)
+
+    def test_retry_after_too_long(self, sleep):
+        self.session.get.side_effect = [fake_response(429, headers={'Retry-After': '3600'}), fake_response(200)]
+        with mock.patch.object(BaseDandelionRequest, 'retry_policy', RetryPolicy(max_backoff=10, deadline=None)):
+            with self.assertRaises(Exception):
+                EntityExtraction.UserDefinedSpots().list()
+        self.assertFalse(sleep.called)
+        self.assertEqual(self.session.get.call_count, 1)
+
+        self.session.get.side_effect = [fake_response(429, headers={'Retry-After': '10'}), fake_response(200)]
+        with mock.patch.object(BaseDandelionRequest, 'retry_policy', RetryPolicy(max_backoff=10, deadline=None)):
+            EntityExtraction.UserDefinedSpots().list()
+        sleep.assert_called_once_with(10.0)
+
+    def test_parse_retry_after(self, sleep):
+        self.assertEqual(parse_retry_after('3'), 3)
+        self.assertEqual(parse_retry_after('Wed, 21 Oct 2015 07:28:00 GMT'), 0)
+        self.assertIsNone(parse_retry_after('soon'))
+        self.assertIsNone(parse_retry_after(None))
+
+    def test_full_jitter(self, sleep):
+        policy = RetryPolicy(backoff=1, max_backoff=4)
+        for attempt in range(1, 10):
+            self.assertLessEqual(policy.get_delay(attempt), min(4, 2 ** (attempt - 1)))
@@ -0,0 +1,107 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+from __future__ import unicode_literals
+
+try:
+    from unittest import mock
+except ImportError:
+    import mock
+
+from django.test import TestCase
+
+from django_dandelion.datagraph import Wikisearch
+from django_dandelion.datatxt import EntityExtraction, TextClassification, TextSimilarity, LanguageDetection, \
+    SentimentAnalysis
+from django_dandelion.exceptions import DandelionException
+from django_dandelion.schema import Schema, String, Boolean, Number, Choice, CommaList
+
+
+class TestValidators(TestCase):
+    def assertValid(self, validator, *values):
+        for value in values:
+            validator(value)
+
+    def assertInvalid(self, validator, *values):
+        for value in values:
+            with self.assertRaises(ValueError):
+                validator(value)
+
+    def test_string(self):
+        self.assertValid(String(), 'text', '')
+        self.assertInvalid(String(), 1, False, ['text'])
+
+    def test_boolean(self):
+        self.assertValid(Boolean(), True, False, 'true', 'False')
+        self.assertInvalid(Boolean(), 1, 'yes', None)
+
+    def test_number(self):
+        self.assertValid(Number(0, 1), 0, 0.5, 1, '0.25')
+        self.assertInvalid(Number(0, 1), -0.1, 1.5, '2', 'high', True, [0.5])
+        self.assertValid(Number(2, integer=True), 2, 10 ** 6, '3', 4.0)
+        self.assertInvalid(Number(2, integer=True), 1, 2.5, '2.5')
+
+    def test_choice(self):
+        self.assertValid(Choice('en', 'it'), 'en', 'it')
+        self.assertInvalid(Choice('en', 'it'), 'eng', 'EN', None, ['en'], {})
+
+    def test_comma_list(self):
+        self.assertValid(CommaList('types', 'lod'), '', 'types', 'types,lod', 'types, lod,')
+        self.assertInvalid(CommaList('types', 'lod'), 'types,image', ['types'])
+
+
+class TestSchema(TestCase):
+    def setUp(self):
+        self.schema = Schema({'text': String(), 'url': String()}, {'lang': Choice('en')}, unique=[['text', 'url']])
+
+    def test_validate(self):
+        self.schema.validate('lang', 'en')
+        self.schema.validate('lang', None)
+        with self.assertRaises(DandelionException) as context:
+            self.schema.validate('lang', 'eng')
+        self.assertEqual(context.exception.code, 'error.invalidParameter')
+        self.assertEqual(context.exception.data, {'parameter': 'lang'})
+
+        with self.assertRaises(DandelionException) as context:
+            self.schema.validate('language', 'en')
+        self.assertIn('lang, text, url', context.exception.message)
+
+    def test_replaced(self):
+        self.assertEqual(self.schema.replaced, {'text': frozenset(['url']), 'url': frozenset(['text'])})
+
+    def test_from_keys(self):
+        schema = Schema.from_keys(['text', 'url'], [['text', 'url']])
+        schema.validate('text', object())
+        self.assertEqual(schema.replaced['url'], frozenset(['text']))
+
+
+class TestEndpointSchemas(TestCase):
+    def test_valid(self):
+        EntityExtraction(text='text', lang='auto', top_entities=3, min_confidence='0.7', include='types,lod',
+                         country='IT', extra_types='phone', epsilon=0.1)
+        TextSimilarity(text1='a', url2='http://example.com', bow='one_empty', **{'nex.min_length': 3})
+        TextClassification(text='text', model='model-id', min_score=0.25, include='score_details')
+        LanguageDetection(html='<p>text</p>', clean='true')
+        SentimentAnalysis(text='text', lang='it')
+        Wikisearch(text='big ben', lang='en', limit=50, offset=100, query='prefix', include='image')
+
+    def test_invalid(self):
+        for factory in (
+            lambda: EntityExtraction(text='text', min_confidence=2),
+            lambda: EntityExtraction(text='text', include='types,typo'),
+            lambda: TextSimilarity(text1='a', **{'nex.country': 'XX'}),
+            lambda: TextClassification(text='text', max_annotations=0),
+            lambda: LanguageDetection(text=42),
+            lambda: SentimentAnalysis(text='text', lang='fr'),
+            lambda: Wikisearch(text='big ben', limit=51),
+        ):
+            with self.assertRaises(DandelionException) as context:
+                factory()
+            self.assertEqual(context.exception.code, 'error.invalidParameter')
+
+    def test_no_request(self):
+        datatxt = SentimentAnalysis(text='text')
+        with mock.patch('django_dandelion.transport.get_session') as get_session:
+            results = list(datatxt.analyze_many([{'lang': 'eng'}]))
+        self.assertIsInstance(results[0], DandelionException)
+        self.assertFalse(get_session.return_value.post.called)
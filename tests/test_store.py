@@ -0,0 +1,90 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+from __future__ import unicode_literals
+
+import datetime
+
+from django.core.management import call_command
+from django.db import connection
+from django.test import TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from six import StringIO
+
+from django_dandelion.datatxt import EntityExtraction
+from django_dandelion.exceptions import DandelionException
+from django_dandelion.models import StoredResult
+from django_dandelion.store import WriteBuffer, get_entries, prune, save_entry
+
+from .utils import ApiTestMixin, clear_caches
+
+
+def nex(method, params):
+    if params['text'] == 'bad':
+        return 400, {'code': 'error.invalidParameter', 'message': 'text', 'data': {'parameter': 'text'}}
+    return {'annotations': [{'spot': params['text']}]}
+
+
+@override_settings(DANDELION_DB_STORE=True)
+class TestDatabaseStore(ApiTestMixin, TransactionTestCase):
+    def setUp(self):
+        super(TestDatabaseStore, self).setUp()
+        self.transport = self.use_transport({'datatxt/nex/v1': nex})
+
+    def test_survives_cache_flush(self):
+        EntityExtraction(text='Apple').analyze()
+        self.assertEqual(StoredResult.objects.get().endpoint, 'datatxt/nex/v1')
+
+        clear_caches()
+        result = EntityExtraction(text='Apple').analyze()
+        self.assertEqual(result.annotations[0].spot, 'Apple')
+        self.assertTrue(result.meta.cache_hit)
+        self.assertEqual(len(self.transport.requests), 1)
+
+    def test_errors_not_stored(self):
+        with self.assertRaises(DandelionException):
+            EntityExtraction(text='bad').analyze()
+        self.assertFalse(StoredResult.objects.exists())
+
+    def test_analyze_many(self):
+        texts = ['text %d' % i for i in range(10)]
+        list(EntityExtraction().analyze_many(texts, max_workers=4))
+        self.assertEqual(StoredResult.objects.count(), 10)
+
+        clear_caches()
+        with CaptureQueriesContext(connection) as queries:
+            results = list(EntityExtraction().analyze_many(texts, max_workers=4))
+        self.assertEqual([result.annotations[0].spot for result in results], texts)
+        self.assertEqual(len(self.transport.requests), 10)
+        # One query per group of max_workers items.
+        self.assertEqual(len(queries), 3)
+        self.assertIn(' IN ', queries[0]['sql'])
+
+    def test_write_buffer(self):
+        entry = (200, 0, b'{}', None, None)
+        buffer = WriteBuffer(size=3)
+        with buffer.use():
+            for key in ('a', 'b'):
+                save_entry(key, 'datatxt/nex/v1', entry)
+        self.assertFalse(StoredResult.objects.exists())
+        buffer.flush()
+        self.assertEqual(set(get_entries(['a', 'b', 'c'])), {'a', 'b'})
+        self.assertEqual(get_entries(['a'])['a'], entry)
+
+        with override_settings(DANDELION_DB_STORE_BATCH_SIZE=5):
+            self.assertEqual(WriteBuffer().size, 5)
+
+    def test_prune(self):
+        StoredResult.objects.create(key='old', endpoint='datatxt/nex/v1', status_code=200, encoding=0, body=b'{}',
+                                    created=timezone.now() - datetime.timedelta(days=2))
+        StoredResult.objects.create(key='new', endpoint='datatxt/nex/v1', status_code=200, encoding=0, body=b'{}')
+        self.assertEqual(prune(3600, endpoint='datatxt/sent/v1'), 0)
+
+        out = StringIO()
+        call_command('dandelion_prune_store', max_age=3600, stdout=out)
+        self.assertIn('Deleted 1 results', out.getvalue())
+        self.assertEqual(list(StoredResult.objects.values_list('key', flat=True)), ['new'])
+
+        with override_settings(DANDELION_DB_STORE_TIMEOUT=0):
+            self.assertEqual(prune(), 1)
@@ -0,0 +1,147 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+from __future__ import unicode_literals
+
+import os
+import shutil
+import tempfile
+
+try:
+    from unittest import mock
+except ImportError:
+    import mock
+
+import requests
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+
+from benchmarks.server import FakeDandelionServer
+from django_dandelion import transport
+from django_dandelion.base import BaseDandelionRequest
+from django_dandelion.caching import local_cache
+from django_dandelion.datagraph import Wikisearch
+from django_dandelion.datatxt import EntityExtraction
+from django_dandelion.exceptions import DandelionException
+from django_dandelion.retry import RetryPolicy
+
+
+def nex(method, params):
+    return {'annotations': [{'spot': params['text']}]}
+
+
+class TransportTestCase(TestCase):
+    def setUp(self):
+        cache.clear()
+        local_cache.clear()
+
+    def use_transport(self, instance):
+        patcher = mock.patch.object(BaseDandelionRequest, 'transport', instance)
+        self.addCleanup(patcher.stop)
+        patcher.start()
+
+
+class TestInMemoryTransport(TransportTestCase):
+    def test_routes(self):
+        memory = transport.InMemoryTransport({'datatxt/nex/v1': nex})
+        self.use_transport(memory)
+
+        results = EntityExtraction(text='Apple').analyze()
+        self.assertEqual(results.annotations[0].spot, 'Apple')
+        self.assertEqual(memory.requests, [('post', 'datatxt/nex/v1', {'text': 'Apple'})])
+
+    def test_status_and_dotted_path(self):
+        self.use_transport(transport.InMemoryTransport(
+            {'datatxt/nex/v1': lambda method, params: (400, {'code': 'error.invalidParameter', 'message': 'text',
+                                                             'data': {}})},
+            default='tests.test_transport.nex'))
+
+        with self.assertRaises(DandelionException) as cm:
+            EntityExtraction(text='Apple').analyze()
+        self.assertEqual(cm.exception.code, 'error.invalidParameter')
+        self.assertEqual(Wikisearch(text='Apple').analyze().annotations[0].spot, 'Apple')
+
+    def test_not_found(self):
+        self.use_transport(transport.InMemoryTransport())
+        with self.assertRaises(DandelionException) as cm:
+            EntityExtraction(text='Apple').analyze()
+        self.assertEqual(cm.exception.code, 'error.notFound')
+
+
+class TestReplayTransport(TransportTestCase):
+    def setUp(self):
+        super(TestReplayTransport, self).setUp()
+        self.path = os.path.join(tempfile.mkdtemp(), 'cassettes')
+        self.addCleanup(shutil.rmtree, os.path.dirname(self.path))
+
+    def test_record_and_replay(self):
+        memory = transport.InMemoryTransport({'datatxt/nex/v1': nex})
+        self.use_transport(transport.ReplayTransport(self.path, transport.ReplayTransport.AUTO, memory))
+        EntityExtraction(text='Apple').analyze()
+        self.assertEqual(len(memory.requests), 1)
+
+        filename, = os.listdir(self.path)
+        with open(os.path.join(self.path, filename)) as f:
+            self.assertNotIn('token', f.read())
+
+        cache.clear()
+        local_cache.clear()
+        self.use_transport(transport.ReplayTransport(self.path))
+        self.assertEqual(EntityExtraction(text='Apple').analyze().annotations[0].spot, 'Apple')
+        self.assertEqual(len(memory.requests), 1)
+
+    def test_not_recorded(self):
+        self.use_transport(transport.ReplayTransport(self.path))
+        with self.assertRaises(DandelionException) as cm:
+            EntityExtraction(text='Apple').analyze()
+        self.assertEqual(cm.exception.code, 'error.notRecorded')
+
+
+class TestUrllib3Transport(TransportTestCase):
+    def setUp(self):
+        super(TestUrllib3Transport, self).setUp()
+        self.use_transport(transport.Urllib3Transport())
+
+    def test_requests(self):
+        with FakeDandelionServer(payload_size=3) as server:
+            with override_settings(DANDELION_HOST=server.url):
+                self.assertEqual(len(EntityExtraction(text='Apple').analyze().annotations), 3)
+                self.assertEqual(len(Wikisearch(text='Apple', limit=2).analyze().entities), 2)
+
+    def test_params(self):
+        instance = transport.Urllib3Transport()
+        params = {'text': 'caff\xe8', 'lang': None, 'include': ['types', 'lod']}
+        with mock.patch.object(instance, '_get_pool') as get_pool:
+            get_pool.return_value.urlopen.return_value = mock.Mock(status=200, headers={}, data=b'{}')
+            instance.send('post', 'https://api.dandelion.eu/datatxt/nex/v1', params)
+            instance.send('get', 'https://api.dandelion.eu/datatxt/nex/v1', params)
+
+        # As sent by requests: None values are left out, lists repeat their key.
+        post, get = get_pool.return_value.urlopen.call_args_list
+        self.assertEqual(post[1]['body'], b'text=caff%C3%A8&include=types&include=lod')
+        self.assertEqual(get[0][1].partition('?')[2], 'text=caff%C3%A8&include=types&include=lod')
+
+    def test_connection_error(self):
+        server = FakeDandelionServer()
+        url = server.url
+        server._server.server_close()
+
+        with override_settings(DANDELION_HOST=url), \
+                mock.patch.object(BaseDandelionRequest, 'retry_policy', RetryPolicy(max_attempts=1)):
+            with self.assertRaises(requests.ConnectionError):
+                EntityExtraction(text='Apple').analyze()
+
+
+class TestGetTransport(TestCase):
+    def tearDown(self):
+        transport._transport = None
+
+    def test_settings(self):
+        transport._transport = None
+        with override_settings(DANDELION_TRANSPORT='django_dandelion.transport.InMemoryTransport',
+                               DANDELION_TRANSPORT_OPTIONS={'default': nex}):
+            instance = transport.get_transport()
+            self.assertIsInstance(instance, transport.InMemoryTransport)
+            self.assertIs(instance.default, nex)
+            self.assertIs(transport.get_transport(), instance)
+        self.assertIsInstance(transport.get_transport(), transport.RequestsTransport)
@@ -0,0 +1,60 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+from __future__ import unicode_literals
+
+try:
+    from unittest import mock
+except ImportError:
+    import mock
+
+from django.test import override_settings
+
+from django_dandelion.datatxt import EntityExtraction
+from django_dandelion.usage import usage
+
+from .utils import ApiTestCase, fake_response
+
+
+class TestUsage(ApiTestCase):
+    def setUp(self):
+        super(TestUsage, self).setUp()
+        usage.reset()
+        self.mock_session().post.return_value = fake_response(
+            200, {'annotations': []}, {'X-DL-units': '1.5', 'X-DL-units-left': '998.5'})
+
+    def test_meta_and_counters(self):
+        results = EntityExtraction(text='They say Apple is better than Windows').analyze()
+        self.assertEqual(results, {'annotations': []})
+        self.assertFalse(results.meta.cache_hit)
+        self.assertEqual(results.meta.endpoint, 'datatxt/nex/v1')
+        self.assertEqual(results.meta.units, 1.5)
+        self.assertEqual(results.meta.units_left, 998.5)
+        self.assertGreaterEqual(results.meta.elapsed, 0)
+
+        results = EntityExtraction(text='They say Apple is better than Windows').analyze()
+        self.assertTrue(results.meta.cache_hit)
+        self.assertEqual(results.meta.units, 1.5)
+
+        self.assertEqual(usage.snapshot(), {
+            'units_spent': 1.5,
+            'units_saved': 1.5,
+            'units_left': 998.5,
+            'calls': {'datatxt/nex/v1': 1},
+            'cache_hits': {'datatxt/nex/v1': 1},
+        })
+
+    def test_units_left_of_own_response(self):
+        # Another thread got a later response between this request's response and its result.
+        with mock.patch.object(usage, 'record_call', side_effect=lambda *args: setattr(usage, 'units_left', 990.0)):
+            results = EntityExtraction(text='They say Apple is better than Windows').analyze()
+            self.assertEqual(results.meta.units_left, 998.5)
+            with override_settings(DANDELION_USE_CACHE=False):
+                results = EntityExtraction(text='They say Apple is better than Windows').analyze()
+            self.assertFalse(results.meta.cache_hit)
+            self.assertEqual(results.meta.units_left, 998.5)
+        self.assertEqual(usage.units_left, 990.0)
+
+        results = EntityExtraction(text='They say Apple is better than Windows').analyze()
+        self.assertTrue(results.meta.cache_hit)
+        self.assertEqual(results.meta.units_left, 990.0)
@@ -0,0 +1,76 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Helpers shared by the tests sending requests to a fake API."""
+
+from __future__ import unicode_literals
+
+import json
+
+try:
+    from unittest import mock
+except ImportError:
+    import mock
+
+import requests
+from django.core.cache import cache
+from django.test import TestCase
+
+from django_dandelion.base import BaseDandelionRequest
+from django_dandelion.caching import local_cache
+from django_dandelion.retry import RetryPolicy
+from django_dandelion.transport import InMemoryTransport
+
+
+def fake_response(status_code, content=None, headers=None):
+    """
+    :param content: The body, encoded as JSON unless it is bytes; by default an empty result, or an error for an error
+        status.
+    :return: A ``requests.Response``.
+    """
+    if content is None:
+        content = {'code': 'error', 'message': '', 'data': {}} if status_code >= 400 else {}
+    response = requests.Response()
+    response.status_code = status_code
+    response.headers.update(headers or {})
+    response._content = content if isinstance(content, bytes) else json.dumps(content).encode('utf-8')
+    return response
+
+
+def clear_caches():
+    cache.clear()
+    local_cache.clear()
+
+
+class ApiTestMixin(object):
+    """Starts every test with empty caches, and answers the requests without the network."""
+
+    def setUp(self):
+        super(ApiTestMixin, self).setUp()
+        clear_caches()
+
+    def start_patch(self, patcher):
+        """:return: The mock started by ``patcher``, stopped at the end of the test."""
+        self.addCleanup(patcher.stop)
+        return patcher.start()
+
+    def use_transport(self, routes=None, retry=False):
+        """
+        Send the requests to an :class:`~django_dandelion.transport.InMemoryTransport`.
+
+        :param routes: The callables answering each endpoint, as with InMemoryTransport.
+        :param retry: Whether to keep the default retry policy; by default a request is sent once.
+        :return: The transport, recording the requests.
+        """
+        transport = InMemoryTransport(routes)
+        self.start_patch(mock.patch.object(BaseDandelionRequest, 'transport', transport))
+        if not retry:
+            self.start_patch(mock.patch.object(BaseDandelionRequest, 'retry_policy', RetryPolicy(max_attempts=1)))
+        return transport
+
+    def mock_session(self):
+        """:return: The mock of the ``requests.Session`` of the default transport."""
+        return self.start_patch(mock.patch('django_dandelion.transport.get_session')).return_value
+
+
+class ApiTestCase(ApiTestMixin, TestCase):
+    pass